@@ -0,0 +1,254 @@
+"""
+Infomax API 비동기 수집기 (asyncio + aiohttp)
+
+InfomaxClient와 같은 메서드(get_hist / get_investor / get_stock_codes / get_expired_codes,
+복수 종목 *_batch)를 코루틴으로 제공합니다.
+- 연결 재사용: aiohttp.ClientSession 1개 (keep-alive 커넥션 풀)
+- rate limiter / 속도 조절 / 서킷 브레이커 / 사용량 집계는 InfomaxClient 클래스 속성을 그대로 공유
+  → 같은 프로세스의 동기 클라이언트와 한 예산을 나눠 씀
+- 응답 디스크 캐시 / 녹화(InfomaxClient.cache / recorder)도 공유
+- 동시 요청 수는 INFOMAX_ASYNC_CONCURRENCY 로 제한
+
+사용법:
+    async with AsyncInfomaxClient() as client:
+        by_code = await client.get_hist_batch(codes, start, end)
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+from datetime import date
+from typing import Optional
+
+import aiohttp
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+from collectors.infomax import (
+    InfomaxClient, BASE_URL, TOKEN, MAX_RETRY, RETRY_WAIT, REJECTED,
+    HIST_BATCH_SIZE, INVESTOR_BATCH_SIZE, INFO_PAGE_SIZE, chunked, _fill_snapshot_date,
+)
+from collectors.rate_limiter import parse_retry_after
+
+REQUEST_TIMEOUT = 30    # 초 (InfomaxClient와 동일)
+
+
+class AsyncInfomaxClient:
+    """Infomax REST API 비동기 클라이언트 (async with 로 사용)"""
+
+    # 동기 클라이언트와 공유하는 전역 rate limiter / 속도 조절 / 사용량 집계
+    rate_limiter    = InfomaxClient.rate_limiter
+    rate_controller = InfomaxClient.rate_controller
+    breaker         = InfomaxClient.breaker
+    usage           = InfomaxClient.usage
+    cache           = InfomaxClient.cache
+    recorder        = InfomaxClient.recorder
+
+    def __init__(self, concurrency: int = None, cache=None, recorder=None):
+        if cache is not None:
+            self.cache = cache
+        if recorder is not None:
+            self.recorder = recorder
+        self.concurrency = concurrency or settings.INFOMAX_ASYNC_CONCURRENCY
+        self.headers = {"Authorization": f"bearer {TOKEN}"}
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._batch_ok_endpoints: set[str] = {"/api/stock/hist", "/api/stock/info"}
+        self._no_batch_endpoints: set[str] = set()
+
+    async def __aenter__(self) -> "AsyncInfomaxClient":
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ssl=False)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+        self.session = None
+
+    async def _get(self, endpoint: str, params: dict) -> Optional[dict]:
+        if self.cache:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+        url = f"{BASE_URL}{endpoint}"
+        async with self._semaphore:
+            for attempt in range(1, MAX_RETRY + 1):
+                self.usage.record_wait(endpoint, await self.rate_limiter.acquire_async())
+                try:
+                    async with self.session.get(url, params=params) as r:
+                        body = await r.read()
+                        if r.status == 200:
+                            try:
+                                data = await r.json(content_type=None)
+                            except (ValueError, aiohttp.ContentTypeError):
+                                # 200 인데 JSON 이 아님 (점검 페이지 등) → 장애로 보고 재시도
+                                self.usage.record(endpoint, len(body))
+                                self.breaker.record_failure()
+                                continue
+                            self.breaker.record_success()
+                            if self.rate_controller:
+                                self.rate_controller.on_success()
+                            self.usage.record(endpoint, len(body),
+                                              rows=len(data.get("results") or []))
+                            if data.get("success"):
+                                if self.cache:
+                                    self.cache.put(endpoint, params, data)
+                                if self.recorder:
+                                    self.recorder.save(endpoint, params, data)
+                                return data
+                            # success=False 면 재시도 불필요 (파라미터 문제)
+                            return REJECTED
+                        self.usage.record(endpoint, len(body))
+                        # 429 → 전역 감속 + Retry-After 동안 전체 일시정지 후 재시도
+                        if r.status == 429:
+                            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+                            if self.rate_controller:
+                                self.rate_controller.on_throttled(retry_after or RETRY_WAIT * attempt)
+                            else:
+                                await asyncio.sleep(retry_after or RETRY_WAIT * attempt)
+                            continue
+                        if r.status >= 500:
+                            self.breaker.record_failure()
+                        elif r.status >= 400:
+                            return REJECTED
+                except asyncio.TimeoutError:
+                    if self.rate_controller:
+                        self.rate_controller.on_timeout()
+                    self.breaker.record_failure()
+                except aiohttp.ClientError:
+                    self.breaker.record_failure()
+        return None
+
+    # ── OHLCV (/api/stock/hist) ──────────────────────────────────────────
+    async def get_hist(self, code: str, start: date, end: date) -> list[dict]:
+        """InfomaxClient.get_hist 와 동일"""
+        data = await self._get("/api/stock/hist", _range_params(code, start, end))
+        if not data:
+            return []
+        return InfomaxClient._parse_hist_rows(data, code)
+
+    async def get_hist_batch(self, codes: list[str], start: date, end: date,
+                             batch_size: int = HIST_BATCH_SIZE,
+                             raw: bool = False) -> dict[str, list[dict]]:
+        """InfomaxClient.get_hist_batch 와 동일 (묶음들을 동시에 요청)"""
+        parse_rows = InfomaxClient._tag_raw_rows if raw else InfomaxClient._parse_hist_rows
+        return await self._fetch_batch("/api/stock/hist", parse_rows,
+                                       codes, start, end, batch_size)
+
+    # ── 투자자별 수급 (/api/stock/investor) ────────────────────────────────
+    async def get_investor(self, code: str, start: date, end: date) -> list[dict]:
+        """InfomaxClient.get_investor 와 동일"""
+        data = await self._get("/api/stock/investor", _range_params(code, start, end))
+        if not data:
+            return []
+        return InfomaxClient._parse_investor_rows(data, code)
+
+    async def get_investor_batch(self, codes: list[str], start: date, end: date,
+                                 batch_size: int = INVESTOR_BATCH_SIZE,
+                                 raw: bool = False) -> dict[str, list[dict]]:
+        """InfomaxClient.get_investor_batch 와 동일 (묶음들을 동시에 요청)"""
+        parse_rows = InfomaxClient._tag_raw_rows if raw else InfomaxClient._parse_investor_rows
+        return await self._fetch_batch("/api/stock/investor", parse_rows,
+                                       codes, start, end, batch_size)
+
+    # ── 종목 마스터 ────────────────────────────────────────────────────────
+    async def get_stock_codes(self) -> list[dict]:
+        """InfomaxClient.get_stock_codes 와 동일"""
+        data = await self._get("/api/stock/code", {})
+        if not data:
+            return []
+        return InfomaxClient._parse_stock_codes(data)
+
+    async def get_expired_codes(self, start_date: Optional[date] = None,
+                                end_date: Optional[date] = None) -> list[dict]:
+        """InfomaxClient.get_expired_codes 와 동일"""
+        params: dict = {}
+        if start_date:
+            params["startDate"] = start_date.strftime("%Y%m%d")
+        if end_date:
+            params["endDate"] = end_date.strftime("%Y%m%d")
+        data = await self._get("/api/stock/expired", params)
+        if not data:
+            return []
+        return InfomaxClient._parse_expired_codes(data)
+
+    # ── 단일 일자 스냅샷 (/api/stock/info) ───────────────────────────────
+    async def get_snapshot(self, codes: list[str], target_date: date,
+                           page_size: int = INFO_PAGE_SIZE,
+                           raw: bool = False) -> dict[str, list[dict]]:
+        """InfomaxClient.get_snapshot 와 동일 (페이지들을 동시에 요청)"""
+        day = target_date.strftime("%Y%m%d")
+        parse_rows = InfomaxClient._tag_raw_rows if raw else InfomaxClient._parse_info_rows
+        result = await self._fetch_batch_params("/api/stock/info", parse_rows,
+                                                codes, {"date": day}, page_size)
+        return _fill_snapshot_date(result, day if raw else target_date)
+
+    # ── 복수 종목 일괄 조회 공통 (InfomaxClient._fetch_chunk 와 같은 규칙) ───
+    async def _fetch_batch(self, endpoint: str, parse_rows, codes: list[str],
+                           start: date, end: date,
+                           batch_size: int) -> dict[str, list[dict]]:
+        params = {"startDate": start.strftime("%Y%m%d"), "endDate": end.strftime("%Y%m%d")}
+        return await self._fetch_batch_params(endpoint, parse_rows, codes, params, batch_size)
+
+    async def _fetch_batch_params(self, endpoint: str, parse_rows, codes: list[str],
+                                  params: dict, batch_size: int) -> dict[str, list[dict]]:
+        result: dict[str, list[dict]] = {code: [] for code in codes}
+        await asyncio.gather(*(
+            self._fetch_chunk(endpoint, parse_rows, chunk, params, result)
+            for chunk in chunked(codes, batch_size)
+        ))
+        return result
+
+    async def _fetch_chunk(self, endpoint: str, parse_rows, chunk: list[str],
+                           params: dict, result: dict[str, list[dict]]):
+        if len(chunk) > 1 and endpoint in self._no_batch_endpoints:
+            await self._fetch_each(endpoint, parse_rows, chunk, params, result)
+            return
+
+        data = await self._get(endpoint, {"code": ",".join(chunk), **params})
+        if not data:
+            if len(chunk) == 1:
+                return
+            if data is REJECTED and endpoint not in self._batch_ok_endpoints:
+                self._no_batch_endpoints.add(endpoint)
+                await self._fetch_each(endpoint, parse_rows, chunk, params, result)
+                return
+            mid = len(chunk) // 2
+            await asyncio.gather(
+                self._fetch_chunk(endpoint, parse_rows, chunk[:mid], params, result),
+                self._fetch_chunk(endpoint, parse_rows, chunk[mid:], params, result),
+            )
+            return
+
+        if len(chunk) > 1:
+            if any(not r.get("code") for r in data.get("results", [])):
+                self._no_batch_endpoints.add(endpoint)
+                await self._fetch_each(endpoint, parse_rows, chunk, params, result)
+                return
+            self._batch_ok_endpoints.add(endpoint)
+
+        default_code = chunk[0] if len(chunk) == 1 else None
+        for row in parse_rows(data, default_code):
+            if row["stock_code"] in result:
+                result[row["stock_code"]].append(row)
+
+    async def _fetch_each(self, endpoint, parse_rows, chunk, params, result):
+        await asyncio.gather(*(
+            self._fetch_chunk(endpoint, parse_rows, [code], params, result)
+            for code in chunk
+        ))
+
+
+def _range_params(code: str, start: date, end: date) -> dict:
+    return {
+        "code":      code,
+        "startDate": start.strftime("%Y%m%d"),
+        "endDate":   end.strftime("%Y%m%d"),
+    }
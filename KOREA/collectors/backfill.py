@@ -0,0 +1,205 @@
+"""
+백필 계획 (기간 분할 / 작업 단위 / 이어받기)
+
+/api/stock/hist·investor 는 한 요청의 startDate~endDate 가 최대 30일
+→ 임의 기간을 API가 허용하는 창(window)으로 나누고
+   (종목 묶음, 창) 작업 단위를 만들어 파일로 저장, 중단돼도 남은 단위부터 이어서 수행
+
+    plan = BackfillPlan.load_or_none(path) or BackfillPlan.create(path, start, end, units)
+    for unit in plan.pending():
+        ...수집·저장...
+        plan.mark(unit["id"], "done")       # 진행 로그(.progress)에 한 줄 추가
+
+휴장일 학습: 창 수집이 끝났는데도 어떤 종목에도 데이터가 없는 평일은 휴장일로 기록
+→ 다음 계획부터 그 날짜는 '있어야 할 거래일'에서 제외 (휴장일 때문에 매번 전 종목 재수집 방지)
+장애·지연 데이터를 휴장일로 굳히지 않도록 BACKFILL_CLOSED_MIN_AGE_DAYS 일 넘게 지난 창,
+같은 창의 다른 날에는 데이터가 있을 때만 학습 — 잘못 기록된 날짜는 backfill.py --reopen 으로 삭제
+"""
+
+import os
+import sys
+import json
+import threading
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+
+# 한 요청의 최대 조회 기간 (달력 일수)
+HIST_WINDOW_DAYS = settings.INFOMAX_HIST_WINDOW_DAYS
+
+PLAN_VERSION = 1
+
+
+def split_windows(start: date, end: date,
+                  max_days: int = HIST_WINDOW_DAYS) -> list[tuple[date, date]]:
+    """start~end 를 max_days 일 이하의 연속 구간으로 분할 (start > end 이면 [])"""
+    max_days = max(1, max_days)
+    windows = []
+    s = start
+    while s <= end:
+        e = min(end, s + timedelta(days=max_days - 1))
+        windows.append((s, e))
+        s = e + timedelta(days=1)
+    return windows
+
+
+def weekdays(start: date, end: date) -> list[date]:
+    days = []
+    d = start
+    while d <= end:
+        if d.weekday() < 5:
+            days.append(d)
+        d += timedelta(days=1)
+    return days
+
+
+def plan_dir() -> Path:
+    path = Path(settings.BACKFILL_PLAN_DIR)
+    if not path.is_absolute():
+        path = project_root / path
+    return path
+
+
+def _write_json(path: Path, obj):
+    """원자적 교체 저장 (중간에 죽어도 이전 파일 유지)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class ClosedDays:
+    """학습된 휴장일 집합 (plan_dir/closed_days.json)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.days: set[date] = set()
+        if self.path.exists():
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            self.days = {date.fromisoformat(d) for d in raw}
+
+    @classmethod
+    def from_settings(cls) -> "ClosedDays":
+        return cls(plan_dir() / "closed_days.json")
+
+    def trading_days(self, start: date, end: date) -> list[date]:
+        """start~end 평일 중 휴장일로 확인된 날을 뺀 날짜"""
+        return [d for d in weekdays(start, end) if d not in self.days]
+
+    def add(self, days):
+        new = set(days) - self.days
+        if new:
+            self.days |= new
+            self._save()
+
+    def remove(self, days) -> list[date]:
+        """휴장일 기록에서 삭제 (잘못 학습된 날짜 / 뒤늦게 데이터가 들어온 날짜) → 삭제한 날짜"""
+        gone = set(days) & self.days
+        if gone:
+            self.days -= gone
+            self._save()
+        return sorted(gone)
+
+    def _save(self):
+        _write_json(self.path, sorted(d.isoformat() for d in self.days))
+
+
+class BackfillPlan:
+    """
+    작업 단위 목록(JSON, 생성 시 한 번 저장) + 진행 로그(.progress, 한 줄씩 추가)
+    계획 파일이 수 MB가 돼도 단위가 끝날 때마다 다시 쓰지 않음 — 불러올 때 로그를 재생
+
+    unit: {"id", "table": "ohlcv"|"investor", "start", "end" (ISO 날짜),
+           "stocks": [[code, name], ...], "status": "pending"|"done"|"failed", "error"}
+    """
+
+    def __init__(self, path: Path, data: dict):
+        self.path = Path(path)
+        self.progress_path = self.path.with_suffix(".progress")
+        self.data = data
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_path(start: date, end: date) -> Path:
+        return plan_dir() / f"plan_{start:%Y%m%d}_{end:%Y%m%d}.json"
+
+    @classmethod
+    def create(cls, path: Path, start: date, end: date, units: list[dict]) -> "BackfillPlan":
+        data = {
+            "version":     PLAN_VERSION,
+            "created_at":  datetime.now().isoformat(timespec="seconds"),
+            "start":       start.isoformat(),
+            "end":         end.isoformat(),
+            "window_days": HIST_WINDOW_DAYS,
+            "units":       [{"id": i, "status": "pending", **u} for i, u in enumerate(units)],
+        }
+        plan = cls(path, data)
+        _write_json(plan.path, data)
+        plan.progress_path.unlink(missing_ok=True)
+        return plan
+
+    @classmethod
+    def load_or_none(cls, path: Path) -> Optional["BackfillPlan"]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != PLAN_VERSION:
+            return None
+        plan = cls(path, data)
+        if plan.progress_path.exists():
+            with open(plan.progress_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue    # 기록 중 중단된 마지막 줄
+                    plan._apply(entry)
+        return plan
+
+    # ── 조회 ────────────────────────────────────────────────────────────
+    @property
+    def units(self) -> list[dict]:
+        return self.data["units"]
+
+    def pending(self) -> list[dict]:
+        """아직 끝나지 않은 단위 (실패 포함 — 이어받기 시 다시 수행)"""
+        return [u for u in self.units if u["status"] != "done"]
+
+    def window_done(self, table: str, start: str) -> bool:
+        """같은 table·창의 단위가 모두 끝났는지"""
+        return all(u["status"] == "done" for u in self.units
+                   if u["table"] == table and u["start"] == start)
+
+    def stats(self) -> dict:
+        """{"units", "done", "failed", "pending", "stocks_done"}"""
+        counts = {"done": 0, "failed": 0, "pending": 0}
+        stocks_done = 0
+        for u in self.units:
+            counts[u["status"]] += 1
+            if u["status"] == "done":
+                stocks_done += len(u["stocks"])
+        return {"units": len(self.units), **counts, "stocks_done": stocks_done}
+
+    # ── 갱신 ────────────────────────────────────────────────────────────
+    def mark(self, unit_id: int, status: str, error: str = None):
+        entry = {"id": unit_id, "status": status}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            self._apply(entry)
+            with open(self.progress_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _apply(self, entry: dict):
+        unit = self.units[entry["id"]]
+        unit["status"] = entry["status"]
+        if entry.get("error"):
+            unit["error"] = entry["error"]
+        else:
+            unit.pop("error", None)
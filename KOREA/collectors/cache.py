@@ -0,0 +1,281 @@
+"""
+Infomax API 응답 디스크 캐시
+
+InfomaxClient._get 아래에서 성공 응답(JSON)을 endpoint + 정규화된 파라미터 해시로 저장합니다.
+같은 날짜를 다시 수집하거나 (--missing-only, 크래시 후 재실행) 백필을 반복할 때
+API 호출·일일 사용량을 쓰지 않고 캐시에서 응답합니다.
+
+TTL 규칙:
+    - endDate / date 가 오늘(KST) 이전인 과거 구간 → 만료 없음 (확정 데이터)
+      단, results가 비어 있으면 (휴장·지연 제공) TODAY_TTL 만 유지
+      endDate 가 최근 INFOMAX_CACHE_LATE_DAYS 일 안이거나 (연휴 직후 늦게 올라오는 데이터)
+      복수 종목 요청 중 응답에 빠진 종목이 있으면 → INFOMAX_CACHE_LATE_TTL 초
+    - 오늘 데이터를 포함한 구간                 → INFOMAX_CACHE_TODAY_TTL 초
+    - 날짜 파라미터 없음 (/api/stock/code 등)    → 당일(KST) 자정까지
+
+용량: INFOMAX_CACHE_MAX_MB 초과 시 오래 안 쓴 파일부터 삭제 (LRU, mtime 기준)
+
+사용법:
+    cache = ResponseCache.from_settings()
+    client = InfomaxClient(cache=cache)
+
+FixtureStore — 녹화 모드(INFOMAX_RECORD_DIR)에서 실제 응답을 만료 없이 저장하고
+               mock 서버(collectors/mock_infomax.py)가 같은 키로 재생
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 용량 초과 시 이 비율까지 줄임 (매 저장마다 evict 하지 않도록 여유)
+EVICT_TARGET_RATIO = 0.9
+
+
+def normalize_params(params: dict) -> dict:
+    """캐시 키용 파라미터 정규화 — 복수 종목 code는 정렬, 값은 문자열"""
+    norm = {}
+    for k, v in params.items():
+        if v is None or v == "":
+            continue
+        v = str(v)
+        if k == "code" and "," in v:
+            v = ",".join(sorted(c.strip() for c in v.split(",") if c.strip()))
+        norm[k] = v
+    return dict(sorted(norm.items()))
+
+
+def cache_key(endpoint: str, params: dict) -> str:
+    raw = json.dumps([endpoint, normalize_params(params)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    endpoint + 파라미터 → 응답 JSON 파일 캐시 (thread-safe)
+
+    파일: {cache_dir}/{key[:2]}/{key}.json
+          {"endpoint", "params", "stored_at", "expires_at"(없으면 영구), "data"}
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, today_ttl: float = 300,
+                 late_days: int = 7, late_ttl: float = 3600, clock=time.time):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.today_ttl = today_ttl
+        self.late_days = late_days
+        self.late_ttl = late_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._size = self._scan_size()
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        cache_dir = Path(settings.INFOMAX_CACHE_DIR)
+        if not cache_dir.is_absolute():
+            cache_dir = project_root / cache_dir
+        return cls(cache_dir,
+                   max_bytes=int(settings.INFOMAX_CACHE_MAX_MB * 1_000_000),
+                   today_ttl=settings.INFOMAX_CACHE_TODAY_TTL,
+                   late_days=settings.INFOMAX_CACHE_LATE_DAYS,
+                   late_ttl=settings.INFOMAX_CACHE_LATE_TTL)
+
+    # ── 조회 / 저장 ────────────────────────────────────────────────────
+    def get(self, endpoint: str, params: dict) -> Optional[dict]:
+        """유효한 캐시가 있으면 응답 dict, 없으면 None"""
+        path = self._path(cache_key(endpoint, params))
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at <= self._clock():
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)      # LRU: 최근 사용 표시
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry["data"]
+
+    def put(self, endpoint: str, params: dict, data: dict):
+        """성공 응답 저장 (TTL 규칙 적용)"""
+        expires_at = self._expires_at(params, data)
+        entry = {
+            "endpoint":   endpoint,
+            "params":     normalize_params(params),
+            "stored_at":  self._clock(),
+            "expires_at": expires_at,
+            "data":       data,
+        }
+        path = self._path(cache_key(endpoint, params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+        old_size = path.stat().st_size if path.exists() else 0
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)   # 원자적 교체 (동시 쓰기 안전)
+
+        with self._lock:
+            self.stores += 1
+            self._size += len(body) - old_size
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def _expires_at(self, params: dict, data: dict) -> Optional[float]:
+        now = self._clock()
+        today = datetime.fromtimestamp(now, KST).date()
+        end_raw = params.get("endDate") or params.get("date")
+        if not end_raw:
+            # 날짜 없는 목록성 조회 → 당일 자정(KST)까지
+            midnight = datetime.combine(today + timedelta(days=1), datetime.min.time(), KST)
+            return midnight.timestamp()
+        try:
+            end = datetime.strptime(str(end_raw), "%Y%m%d").date()
+        except ValueError:
+            return now + self.today_ttl
+        results = data.get("results")
+        if end >= today or not results:
+            return now + self.today_ttl
+        if (today - end).days <= self.late_days or not self._covers_codes(params, results):
+            return now + self.late_ttl      # 늦게 올라올 수 있는 구간 / 일부 종목만 온 묶음
+        return None     # 과거 확정 구간 → 영구
+
+    @staticmethod
+    def _covers_codes(params: dict, results: list) -> bool:
+        """요청한 종목(code)이 응답 results 에 모두 있는지 (행에 code 가 없는 응답은 검사하지 않음)"""
+        requested = {c.strip() for c in str(params.get("code") or "").split(",") if c.strip()}
+        returned = {str(row["code"]) for row in results if isinstance(row, dict) and "code" in row}
+        if not requested or not returned:
+            return True
+        return requested <= returned
+
+    # ── 용량 관리 ──────────────────────────────────────────────────────
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _files(self):
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob("*/*.json"))
+
+    def _scan_size(self) -> int:
+        total = 0
+        for f in self._files():
+            try:
+                total += f.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _remove(self, path: Path) -> int:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return 0
+        with self._lock:
+            self._size -= size
+        return size
+
+    def _evict(self):
+        """오래 안 쓴 파일부터 삭제해 max_bytes × EVICT_TARGET_RATIO 이하로"""
+        entries = []
+        for f in self._files():
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, f))
+        entries.sort()
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        for _, f in entries:
+            with self._lock:
+                if self._size <= target:
+                    break
+            if self._remove(f):
+                with self._lock:
+                    self.evictions += 1
+
+    def reset_stats(self):
+        """적중 통계 초기화 (캐시 내용은 유지)"""
+        with self._lock:
+            self.hits = self.misses = 0
+            self.stores = self.evictions = 0
+
+    def stats(self) -> dict:
+        """{"hits", "misses", "stores", "evictions", "size_bytes", "hit_rate"}"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits":       self.hits,
+                "misses":     self.misses,
+                "stores":     self.stores,
+                "evictions":  self.evictions,
+                "size_bytes": self._size,
+                "hit_rate":   self.hits / lookups if lookups else 0.0,
+            }
+
+
+class FixtureStore:
+    """
+    녹화된 API 응답 저장소 (만료·용량 제한 없음)
+
+    파일: {fixtures_dir}/{endpoint 경로 '_' 연결}/{key}.json
+          {"endpoint", "params", "data"}
+    """
+
+    def __init__(self, fixtures_dir: Path):
+        self.fixtures_dir = Path(fixtures_dir)
+
+    @classmethod
+    def from_settings(cls) -> "FixtureStore":
+        fixtures_dir = Path(settings.INFOMAX_RECORD_DIR)
+        if not fixtures_dir.is_absolute():
+            fixtures_dir = project_root / fixtures_dir
+        return cls(fixtures_dir)
+
+    def _path(self, endpoint: str, params: dict) -> Path:
+        folder = endpoint.strip("/").replace("/", "_")
+        return self.fixtures_dir / folder / f"{cache_key(endpoint, params)}.json"
+
+    def save(self, endpoint: str, params: dict, data: dict):
+        path = self._path(endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"endpoint": endpoint, "params": normalize_params(params), "data": data}
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def load(self, endpoint: str, params: dict) -> Optional[dict]:
+        try:
+            return json.loads(self._path(endpoint, params).read_text(encoding="utf-8"))["data"]
+        except (OSError, ValueError, KeyError):
+            return None
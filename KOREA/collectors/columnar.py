@@ -0,0 +1,115 @@
+"""
+Infomax 응답 컬럼 디코딩 (NumPy / pandas)
+
+InfomaxClient._parse_hist_rows / _parse_investor_rows 처럼 행마다 dict를 새로 만들지 않고
+응답 results(JSON dict 목록)를 한 번에 타입이 정해진 컬럼(DataFrame)으로 변환
+날짜 파싱·순매수 계산·시가총액 산출은 모두 배열 연산
+
+    by_code = client.get_hist_batch(codes, start, end, raw=True)   # 응답 행 그대로
+    frame = decode_hist(rows for rows in by_code.values())
+    upsert_batch(conn, OHLCV_SQL, to_records(frame, OHLCV_COLUMNS))
+"""
+
+import sys
+from itertools import chain
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from collectors.infomax import INVESTOR_MAP
+
+# DB 컬럼 → 응답 필드 (hist / info 공통, info는 market_cap 추가)
+HIST_FIELDS = {
+    "open_price":    "open_price",
+    "high_price":    "high_price",
+    "low_price":     "low_price",
+    "close_price":   "close_price",
+    "volume":        "trading_volume",
+    "trading_value": "trading_value",
+    "listed_shares": "listed_shares",
+    "market_cap":    "market_cap",
+}
+INVESTOR_FIELDS = ("bid_value", "ask_value", "bid_volume", "ask_volume")
+
+# execute_values 로 넘길 컬럼 순서 (daily_update 의 *_SQL 과 같은 순서)
+OHLCV_COLUMNS    = ("date", "stock_code", "open_price", "high_price", "low_price",
+                    "close_price", "volume", "trading_value")
+MKTCAP_COLUMNS   = ("date", "stock_code", "market_cap")
+INVESTOR_COLUMNS = ("date", "stock_code", "investor_type", "net_buy_value", "net_buy_volume")
+
+
+def parse_dates(values) -> pd.Series:
+    """YYYYMMDD (문자열·정수) → datetime64, 형식이 틀리거나 없으면 NaT (_parse_date 의 벡터판)"""
+    return pd.to_datetime(pd.Series(values, dtype="string"), format="%Y%m%d", errors="coerce")
+
+
+def _ints(values) -> pd.Series:
+    """숫자 컬럼 → nullable Int64 (숫자가 아니거나 없으면 NA)"""
+    return pd.to_numeric(pd.Series(values), errors="coerce").round().astype("Int64")
+
+
+def _records(row_groups: Iterable[list[dict]], fields) -> pd.DataFrame:
+    rows = list(chain.from_iterable(row_groups))
+    return pd.DataFrame(rows, columns=["date", "stock_code", *fields])
+
+
+def decode_hist(row_groups: Iterable[list[dict]]) -> pd.DataFrame:
+    """
+    hist / info 응답 행 묶음들 → 컬럼 DataFrame
+    컬럼: date, stock_code, open_price … listed_shares, market_cap (모두 Int64),
+          market_cap_reported (bool — 응답에 시가총액이 있었는지)
+    날짜가 없는 행은 제외, market_cap 이 없으면 close_price × listed_shares
+    """
+    raw = _records(row_groups, (*HIST_FIELDS.values(), "marketcap"))
+    raw["market_cap"] = raw["market_cap"].fillna(raw["marketcap"])
+    frame = pd.DataFrame({"date": parse_dates(raw["date"]),
+                          "stock_code": raw["stock_code"].astype("string")})
+    for col, field in HIST_FIELDS.items():
+        frame[col] = _ints(raw[field])
+    computed = frame["close_price"] * frame["listed_shares"]
+    reported = (frame["market_cap"] > 0).fillna(False).astype(bool)
+    frame["market_cap"] = frame["market_cap"].where(reported, computed)
+    frame["market_cap_reported"] = reported
+    return frame[frame["date"].notna()].reset_index(drop=True)
+
+
+def decode_investor(row_groups: Iterable[list[dict]]) -> pd.DataFrame:
+    """
+    investor 응답 행 묶음들 → 컬럼 DataFrame (INVESTOR_MAP 4종만)
+    컬럼: date, stock_code, investor_type, net_buy_value, net_buy_volume
+    순매수 = 매수 - 매도 (결측은 0)
+    """
+    raw = _records(row_groups, ("investor", *INVESTOR_FIELDS))
+    investor_type = raw["investor"].map(INVESTOR_MAP)
+    dates = parse_dates(raw["date"])
+    keep = (investor_type.notna() & dates.notna()).to_numpy()
+
+    amounts = {f: pd.to_numeric(raw[f], errors="coerce").fillna(0).to_numpy(np.int64)
+               for f in INVESTOR_FIELDS}
+    frame = pd.DataFrame({
+        "date":           dates,
+        "stock_code":     raw["stock_code"].astype("string"),
+        "investor_type":  investor_type.astype("string"),
+        "net_buy_value":  amounts["bid_value"] - amounts["ask_value"],
+        "net_buy_volume": amounts["bid_volume"] - amounts["ask_volume"],
+    })
+    return frame[keep].reset_index(drop=True)
+
+
+def to_records(frame: pd.DataFrame, columns: tuple[str, ...]) -> list[tuple]:
+    """DataFrame → execute_values 용 튜플 목록 (date는 datetime.date, 결측은 None, 정수는 int)"""
+    if frame.empty:
+        return []
+    cols = []
+    for col in columns:
+        s = frame[col]
+        if col == "date":
+            cols.append(s.dt.date.to_numpy())
+        else:
+            cols.append(s.to_numpy(dtype=object, na_value=None))
+    return list(zip(*cols))
@@ -1,12 +1,13 @@
 """
 Infomax API 수집기
 - /api/stock/hist    → ohlcv_daily, market_cap_daily
+- /api/stock/info    → ohlcv_daily, market_cap_daily (단일 일자 전 종목 스냅샷)
 - /api/stock/investor → investor_trading
 """
 
 import time
-import threading
 import sys
+import atexit
 from pathlib import Path
 from datetime import date, datetime
 from typing import Optional
@@ -20,13 +21,24 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.settings import settings
+from collectors.rate_limiter import (
+    TokenBucket, SharedTokenBucket, AdaptiveRateController, parse_retry_after,
+)
+from collectors.quota import UsageLedger
+from collectors.cache import ResponseCache, FixtureStore
+from collectors.retry import CircuitBreaker
 
 BASE_URL   = settings.INFOMAX_BASE_URL
 TOKEN      = settings.INFOMAX_API_KEY
-REQ_DELAY  = 1.05   # 초 (60회/분 Lite 플랜 기준)
 MAX_RETRY  = 3
 RETRY_WAIT = 5.0
 
+# 복수 종목 일괄 조회 (code="005930,000660,...") 시 한 요청에 묶는 종목 수
+HIST_BATCH_SIZE     = settings.INFOMAX_HIST_BATCH_SIZE
+INVESTOR_BATCH_SIZE = settings.INFOMAX_INVESTOR_BATCH_SIZE
+# /api/stock/info 스냅샷 한 페이지(요청)당 종목 수
+INFO_PAGE_SIZE      = settings.INFOMAX_INFO_PAGE_SIZE
+
 # 투자자 API 코드 → DB investor_type 매핑
 # ※ API는 '연기금' 대신 '기금공제'로 반환함 (실측 확인)
 INVESTOR_MAP = {
@@ -37,49 +49,107 @@ INVESTOR_MAP = {
 }
 
 
+class RejectedResponse(dict):
+    """요청 자체가 거부된 응답 (4xx·success=False) — 빈 dict 라 실패(None)처럼 falsy"""
+
+
+# _get 이 거부 응답에 돌려주는 값 (재시도해도 같은 결과, `is REJECTED` 로 실패와 구분)
+REJECTED = RejectedResponse()
+
+
 class InfomaxClient:
     """Infomax REST API 클라이언트 (thread-safe)"""
 
-    # 모든 인스턴스·스레드가 공유하는 rate limiter
-    _rate_lock      = threading.Lock()
-    _rate_last_call = 0.0
+    # 모든 인스턴스·스레드가 공유하는 rate limiter (플랜별 분당 한도, Settings)
+    # INFOMAX_RATE_SHARED=True 면 같은 호스트의 다른 수집 프로세스(백필 등)와도 한도 공유
+    rate_limiter = (SharedTokenBucket.from_settings() if settings.INFOMAX_RATE_SHARED
+                    else TokenBucket.from_settings())
+    # 429/timeout 기반 전역 속도 조절 (INFOMAX_RATE_ADAPTIVE=False 면 고정 속도)
+    rate_controller = (AdaptiveRateController.from_settings(rate_limiter)
+                       if settings.INFOMAX_RATE_ADAPTIVE else None)
+    # 연속 장애 시 rate limiter를 일시정지해 클라이언트 전체를 쉬게 하는 서킷 브레이커
+    breaker = CircuitBreaker.from_settings(rate_limiter)
+    # 일일 사용량(바이트) 집계 — 당일 파일로 프로세스 간 합산
+    usage = UsageLedger.from_settings()
+    # 응답 디스크 캐시 (INFOMAX_CACHE_ENABLED=False 면 None, 인스턴스별로 교체 가능)
+    cache = ResponseCache.from_settings() if settings.INFOMAX_CACHE_ENABLED else None
+    # 녹화 모드 — 성공 응답을 mock 서버 재생용 fixture로 저장 (INFOMAX_RECORD_DIR)
+    recorder = FixtureStore.from_settings() if settings.INFOMAX_RECORD_DIR else None
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None,
+                 recorder: Optional[FixtureStore] = None):
+        if cache is not None:
+            self.cache = cache
+        if recorder is not None:
+            self.recorder = recorder
         self.session = requests.Session()
         self.session.verify = False
         self.headers = {"Authorization": f"bearer {TOKEN}"}
+        # 복수 종목 요청 지원이 확인된 endpoint (hist / info는 API 문서에 명시)
+        self._batch_ok_endpoints: set[str] = {"/api/stock/hist", "/api/stock/info"}
+        # 복수 종목 요청을 받지 못하는 것으로 판명된 endpoint (이후 단일 종목 요청)
+        self._no_batch_endpoints: set[str] = set()
 
-    def _throttle(self):
-        """전역 공유 rate limiter — 멀티스레드 환경에서도 분당 60회 준수"""
-        with InfomaxClient._rate_lock:
-            elapsed = time.time() - InfomaxClient._rate_last_call
-            if elapsed < REQ_DELAY:
-                time.sleep(REQ_DELAY - elapsed)
-            InfomaxClient._rate_last_call = time.time()
+    def _throttle(self) -> float:
+        """전역 공유 rate limiter — 토큰 예약 후 lock 밖에서 대기, 대기한 초 반환"""
+        return self.rate_limiter.acquire()
 
     def _get(self, endpoint: str, params: dict) -> Optional[dict]:
+        # 캐시 적중 시 API 호출·rate limit 토큰·일일 사용량을 쓰지 않음
+        if self.cache:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
         url = f"{BASE_URL}{endpoint}"
         for attempt in range(1, MAX_RETRY + 1):
-            self._throttle()
+            self.usage.record_wait(endpoint, self._throttle())
             try:
                 r = self.session.get(url, params=params,
                                      headers=self.headers, timeout=30)
                 if r.status_code == 200:
-                    data = r.json()
+                    try:
+                        data = r.json()
+                    except ValueError:
+                        # 200 인데 JSON 이 아님 (점검 페이지 등) → 장애로 보고 재시도
+                        self.usage.record(endpoint, len(r.content))
+                        self.breaker.record_failure()
+                        continue
+                    self.breaker.record_success()
+                    if self.rate_controller:
+                        self.rate_controller.on_success()
+                    self.usage.record(endpoint, len(r.content),
+                                      rows=len(data.get("results") or []))
                     if data.get("success"):
+                        if self.cache:
+                            self.cache.put(endpoint, params, data)
+                        if self.recorder:
+                            self.recorder.save(endpoint, params, data)
                         return data
                     # success=False 면 재시도 불필요 (파라미터 문제)
-                    return None
-                # 429 Too Many Requests → 대기 후 재시도
+                    return REJECTED
+                self.usage.record(endpoint, len(r.content))
+                # 429 Too Many Requests → 전역 감속 + Retry-After 동안 전체 일시정지 후 재시도
                 if r.status_code == 429:
-                    time.sleep(RETRY_WAIT * attempt)
+                    retry_after = parse_retry_after(r.headers.get("Retry-After"))
+                    if self.rate_controller:
+                        self.rate_controller.on_throttled(retry_after or RETRY_WAIT * attempt)
+                    else:
+                        time.sleep(retry_after or RETRY_WAIT * attempt)
                     continue
+                # 5xx → 장애 누적 (서킷 브레이커가 열리면 다음 토큰까지 전체 대기)
+                if r.status_code >= 500:
+                    self.breaker.record_failure()
+                # 그 밖의 4xx → 요청 거부 (재시도 불필요)
+                elif r.status_code >= 400:
+                    return REJECTED
+            # timeout·연결 오류도 제자리에서 잠들지 않고 브레이커에 맡김
+            # (끝내 실패한 종목은 run_update 의 지연 재시도 큐가 나중에 다시 요청)
             except requests.Timeout:
-                if attempt < MAX_RETRY:
-                    time.sleep(RETRY_WAIT)
+                if self.rate_controller:
+                    self.rate_controller.on_timeout()
+                self.breaker.record_failure()
             except requests.RequestException:
-                if attempt < MAX_RETRY:
-                    time.sleep(RETRY_WAIT)
+                self.breaker.record_failure()
         return None
 
     # ── OHLCV (/api/stock/hist) ──────────────────────────────────────────
@@ -98,12 +168,121 @@ class InfomaxClient:
         data = self._get("/api/stock/hist", params)
         if not data:
             return []
+        return self._parse_hist_rows(data, code)
+
+    def get_hist_batch(self, codes: list[str], start: date, end: date,
+                       batch_size: int = HIST_BATCH_SIZE,
+                       raw: bool = False) -> dict[str, list[dict]]:
+        """
+        복수 종목 일봉 일괄 조회 (code="005930,000660,..." 한 요청에 batch_size개)
+        반환: {stock_code: [get_hist 와 동일한 row, ...], ...}
+              (모든 입력 코드가 키로 존재, 데이터 없으면 빈 리스트)
+        raw=True: 행 변환 없이 응답 행 그대로 (collectors.columnar.decode_hist 로 디코딩)
 
+        묶음 요청이 실패하면 절반씩 나눠 재요청 → 최종적으로 단일 종목 요청까지 내려감
+        """
+        return self._fetch_batch("/api/stock/hist",
+                                 self._tag_raw_rows if raw else self._parse_hist_rows,
+                                 codes, start, end, batch_size)
+
+    # ── 단일 일자 스냅샷 (/api/stock/info) ───────────────────────────────
+    def get_snapshot(self, codes: list[str], target_date: date,
+                     page_size: int = INFO_PAGE_SIZE,
+                     raw: bool = False) -> dict[str, list[dict]]:
+        """
+        target_date 하루치 전 종목 시세를 page_size개씩 묶어 조회
+        반환: {stock_code: [get_hist 와 같은 row + "market_cap"], ...}
+              (응답에 없는 종목은 빈 리스트, raw=True 는 get_hist_batch 와 같음)
+        """
+        day = target_date.strftime("%Y%m%d")
+        result = self._fetch_batch_params("/api/stock/info",
+                                          self._tag_raw_rows if raw else self._parse_info_rows,
+                                          codes, {"date": day}, page_size)
+        return _fill_snapshot_date(result, day if raw else target_date)
+
+    @staticmethod
+    def _parse_info_rows(data: dict, default_code: Optional[str]) -> list[dict]:
+        # 필드 구성이 hist와 같음 + 시가총액(있으면 그대로, 없으면 종가 × 상장주식수)
+        rows = InfomaxClient._parse_hist_rows(data, default_code)
+        for row, r in zip(rows, (r for r in data.get("results", []) if r.get("code", default_code))):
+            row["market_cap"] = r.get("market_cap") or r.get("marketcap")
+        return rows
+
+    # ── 복수 종목 일괄 조회 공통 ─────────────────────────────────────────
+    def _fetch_batch(self, endpoint: str, parse_rows, codes: list[str],
+                     start: date, end: date,
+                     batch_size: int) -> dict[str, list[dict]]:
+        """codes를 batch_size개씩 묶어 조회 후 종목코드별로 분배"""
+        return self._fetch_batch_params(endpoint, parse_rows, codes,
+                                        _range_params(start, end), batch_size)
+
+    def _fetch_batch_params(self, endpoint: str, parse_rows, codes: list[str],
+                            params: dict, batch_size: int) -> dict[str, list[dict]]:
+        """_fetch_batch 와 같되 code 외 파라미터(기간/일자)를 직접 지정"""
+        result: dict[str, list[dict]] = {code: [] for code in codes}
+        for chunk in chunked(codes, batch_size):
+            self._fetch_chunk(endpoint, parse_rows, chunk, params, result)
+        return result
+
+    def _fetch_chunk(self, endpoint: str, parse_rows, chunk: list[str],
+                     params: dict, result: dict[str, list[dict]]):
+        if len(chunk) > 1 and endpoint in self._no_batch_endpoints:
+            for code in chunk:
+                self._fetch_chunk(endpoint, parse_rows, [code], params, result)
+            return
+
+        data = self._get(endpoint, {"code": ",".join(chunk), **params})
+        if not data:
+            if len(chunk) == 1:
+                return      # 단일 종목 실패 → 포기
+            if data is REJECTED and endpoint not in self._batch_ok_endpoints:
+                # 복수 코드 지원이 확인되지 않은 endpoint 가 묶음 요청을 거부 → 단일 종목 모드로 전환
+                self._no_batch_endpoints.add(endpoint)
+                for code in chunk:
+                    self._fetch_chunk(endpoint, parse_rows, [code], params, result)
+                return
+            # 묶음 실패(timeout·5xx·브레이커 포함) → 반으로 쪼개 재시도
+            mid = len(chunk) // 2
+            self._fetch_chunk(endpoint, parse_rows, chunk[:mid], params, result)
+            self._fetch_chunk(endpoint, parse_rows, chunk[mid:], params, result)
+            return
+
+        if len(chunk) > 1:
+            if any(not r.get("code") for r in data.get("results", [])):
+                # 응답 행에 code가 없으면 종목별 분배 불가 → 단일 종목 모드로 전환
+                self._no_batch_endpoints.add(endpoint)
+                for code in chunk:
+                    self._fetch_chunk(endpoint, parse_rows, [code], params, result)
+                return
+            self._batch_ok_endpoints.add(endpoint)
+
+        default_code = chunk[0] if len(chunk) == 1 else None
+        for row in parse_rows(data, default_code):
+            if row["stock_code"] in result:
+                result[row["stock_code"]].append(row)
+
+    @staticmethod
+    def _tag_raw_rows(data: dict, default_code: Optional[str]) -> list[dict]:
+        # 컬럼 디코딩용: 행 dict를 새로 만들지 않고 응답 행에 stock_code만 붙여 그대로 반환
         rows = []
         for r in data.get("results", []):
+            code = r.get("code", default_code)
+            if not code:
+                continue
+            r["stock_code"] = str(code).strip()
+            rows.append(r)
+        return rows
+
+    @staticmethod
+    def _parse_hist_rows(data: dict, default_code: Optional[str]) -> list[dict]:
+        rows = []
+        for r in data.get("results", []):
+            code = r.get("code", default_code)
+            if not code:
+                continue
             rows.append({
-                "date":          self._parse_date(r.get("date")),
-                "stock_code":    r.get("code", code),
+                "date":          InfomaxClient._parse_date(r.get("date")),
+                "stock_code":    str(code).strip(),
                 "open_price":    r.get("open_price"),
                 "high_price":    r.get("high_price"),
                 "low_price":     r.get("low_price"),
@@ -130,13 +309,34 @@ class InfomaxClient:
         data = self._get("/api/stock/investor", params)
         if not data:
             return []
+        return self._parse_investor_rows(data, code)
+
+    def get_investor_batch(self, codes: list[str], start: date, end: date,
+                           batch_size: int = INVESTOR_BATCH_SIZE,
+                           raw: bool = False) -> dict[str, list[dict]]:
+        """
+        복수 종목 투자자별 수급 일괄 조회
+        반환: {stock_code: [get_investor 와 동일한 row, ...], ...}
+        raw=True: 응답 행 그대로 — 투자자 유형 매핑 전 (collectors.columnar.decode_investor)
 
+        복수 코드 지원이 확인되기 전에 묶음 요청이 실패하거나 응답 행에 code가 없으면
+        endpoint를 단일 종목 모드로 전환 (이후 묶음 없이 종목별 요청)
+        """
+        return self._fetch_batch("/api/stock/investor",
+                                 self._tag_raw_rows if raw else self._parse_investor_rows,
+                                 codes, start, end, batch_size)
+
+    @staticmethod
+    def _parse_investor_rows(data: dict, default_code: Optional[str]) -> list[dict]:
         rows = []
         for r in data.get("results", []):
             api_investor = r.get("investor", "")
             db_type = INVESTOR_MAP.get(api_investor)
             if db_type is None:
                 continue    # 매핑 없는 투자자 유형 스킵
+            code = r.get("code", default_code)
+            if not code:
+                continue
 
             bid_val = r.get("bid_value", 0) or 0
             ask_val = r.get("ask_value", 0) or 0
@@ -144,8 +344,8 @@ class InfomaxClient:
             ask_vol = r.get("ask_volume", 0) or 0
 
             rows.append({
-                "date":           self._parse_date(r.get("date")),
-                "stock_code":     r.get("code", code),
+                "date":           InfomaxClient._parse_date(r.get("date")),
+                "stock_code":     str(code).strip(),
                 "investor_type":  db_type,
                 "net_buy_value":  bid_val - ask_val,
                 "net_buy_volume": bid_vol - ask_vol,
@@ -163,7 +363,10 @@ class InfomaxClient:
         data = self._get("/api/stock/code", {})
         if not data:
             return []
+        return self._parse_stock_codes(data)
 
+    @staticmethod
+    def _parse_stock_codes(data: dict) -> list[dict]:
         # market 숫자코드 → DB 문자열 변환
         # API: 1=거래소(KOSPI), 2=거래소기타, 5=KRX, 7=코스닥, 8=코스닥기타
         MARKET_MAP = {"1": "KOSPI", "2": "KOSPI", "5": "KOSPI",
@@ -184,7 +387,7 @@ class InfomaxClient:
                 "code":          str(code).strip(),
                 "name":          r.get("kr_name", ""),
                 "market":        market,
-                "listing_date":  self._parse_date(r.get("listed_date")),
+                "listing_date":  InfomaxClient._parse_date(r.get("listed_date")),
                 "standard_code": r.get("isin"),
             })
         return rows
@@ -209,7 +412,10 @@ class InfomaxClient:
         data = self._get("/api/stock/expired", params)
         if not data:
             return []
+        return self._parse_expired_codes(data)
 
+    @staticmethod
+    def _parse_expired_codes(data: dict) -> list[dict]:
         rows = []
         for r in data.get("results", []):
             code = r.get("code")
@@ -218,7 +424,7 @@ class InfomaxClient:
             rows.append({
                 "code":           str(code).strip(),
                 "name":           r.get("kr_name", ""),
-                "delisting_date": self._parse_date(r.get("delisted_date")),
+                "delisting_date": InfomaxClient._parse_date(r.get("delisted_date")),
             })
         return rows
 
@@ -230,3 +436,25 @@ class InfomaxClient:
             return datetime.strptime(str(val), "%Y%m%d").date()
         except (ValueError, TypeError):
             return None
+
+
+# 프로세스 종료 시 미반영 사용량을 당일 파일에 기록
+atexit.register(InfomaxClient.usage.flush)
+
+
+def _range_params(start: date, end: date) -> dict:
+    return {"startDate": start.strftime("%Y%m%d"), "endDate": end.strftime("%Y%m%d")}
+
+
+def _fill_snapshot_date(result: dict[str, list[dict]], day) -> dict[str, list[dict]]:
+    """스냅샷 응답에 date 가 없으면 요청 일자(date 또는 raw 행이면 YYYYMMDD)로 채움"""
+    for rows in result.values():
+        for row in rows:
+            row["date"] = row.get("date") or day
+    return result
+
+
+def chunked(items: list, size: int) -> list[list]:
+    """items를 size개씩 잘라 리스트로 반환 (마지막 묶음은 size 미만일 수 있음)"""
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,358 @@
+"""
+로컬 Infomax mock 서버 (aiohttp)
+
+실제 quota를 쓰지 않고 수집 처리량·재시도 동작을 재현하기 위한 대역 서버입니다.
+- /api/stock/hist, /api/stock/investor, /api/stock/code, /api/stock/expired
+- 복수 종목 code="A,B,..." 지원 (endpoint별로 끌 수 있음 → 단일 종목 전환 동작 확인)
+- 응답 지연(latency + jitter), 분당 요청 한도(초과 시 429 + Retry-After), 임의 429 주입
+- 응답 데이터: 녹화 fixture(FixtureStore) 우선, 없으면 종목·날짜로 결정되는 합성 데이터
+
+사용법:
+    # 단독 실행 후 .env 에 INFOMAX_BASE_URL=http://127.0.0.1:8765
+    python -m collectors.mock_infomax --port 8765 --latency 0.05 --rate-per-min 120
+
+    # 코드에서 (테스트 / 벤치마크)
+    with MockInfomaxServer(latency=0.02) as server:
+        base_url = server.base_url
+"""
+
+import sys
+import random
+import asyncio
+import argparse
+import threading
+from collections import deque
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from aiohttp import web
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from collectors.cache import FixtureStore
+
+KST = ZoneInfo("Asia/Seoul")
+
+HIST     = "/api/stock/hist"
+INVESTOR = "/api/stock/investor"
+INFO     = "/api/stock/info"
+CODE     = "/api/stock/code"
+EXPIRED  = "/api/stock/expired"
+
+# /api/stock/investor 가 반환하는 투자자 구분 (실제 API와 같은 14종, '연기금' = '기금공제')
+INVESTOR_TYPES = [
+    "기관계", "금융투자", "보험", "투신", "사모", "은행", "종금저축",
+    "기금공제", "정부", "기타법인", "개인", "외국인합", "외국인", "기타외국인",
+]
+
+
+class MockInfomaxServer:
+    """
+    Infomax REST API 대역 서버 — start()/stop() 또는 with 문으로 별도 스레드에서 실행
+
+    latency / jitter:  응답 지연(초) = latency + U(0, jitter)
+    rate_per_min:      최근 60초 요청 수 한도 (0 = 제한 없음), 초과 시 429 + Retry-After
+    throttle_rate:     한도와 무관하게 429를 돌려줄 확률 (0~1)
+    batch_endpoints:   복수 종목 code를 받는 endpoint (그 외에는 success=False)
+    fixtures:          녹화 응답 저장소 (없거나 적중 실패 시 synthetic이면 합성 데이터)
+    n_stocks:          합성 종목 수 (/api/stock/code 응답 크기)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 rate_per_min: int = 0, throttle_rate: float = 0.0,
+                 retry_after: float = 1.0,
+                 batch_endpoints=(HIST, INVESTOR, INFO),
+                 fixtures: Optional[FixtureStore] = None, synthetic: bool = True,
+                 n_stocks: int = 100, seed: int = 0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_per_min = rate_per_min
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.batch_endpoints = set(batch_endpoints)
+        self.fixtures = fixtures
+        self.synthetic = synthetic
+        self.n_stocks = n_stocks
+        self.seed = seed
+
+        self._rng = random.Random(seed)
+        self._window: deque[float] = deque()   # 최근 60초 요청 시각
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats: dict[str, dict] = {}
+
+    # ── 실행 ───────────────────────────────────────────────────────────
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def codes(self) -> list[str]:
+        """합성 종목코드 목록 (/api/stock/code 와 동일)"""
+        return [synthetic_code(i) for i in range(self.n_stocks)]
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        for endpoint in (HIST, INVESTOR, INFO, CODE, EXPIRED):
+            app.router.add_get(endpoint, self._handle)
+        return app
+
+    def start(self) -> str:
+        """별도 스레드에서 서버 시작 → base_url 반환 (port=0 이면 빈 포트 자동 배정)"""
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            runner = web.AppRunner(self.make_app())
+            try:
+                self._loop.run_until_complete(runner.setup())
+                site = web.TCPSite(runner, self.host, self.port)
+                self._loop.run_until_complete(site.start())
+                self.port = runner.addresses[0][1]
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(runner.cleanup())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-infomax", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self.base_url
+
+    def stop(self):
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = self._thread = None
+
+    def __enter__(self) -> "MockInfomaxServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict[str, dict]:
+        """endpoint별 {"requests", "ok", "limited"(한도 초과 429), "injected"(주입 429), "rows"}"""
+        return {k: dict(v) for k, v in self._stats.items()}
+
+    def reset_stats(self):
+        self._stats = {}
+
+    # ── 요청 처리 (이벤트 루프 스레드 1개에서만 실행 → lock 불필요) ─────────
+    async def _handle(self, request: web.Request) -> web.Response:
+        endpoint = request.path
+        st = self._stats.setdefault(endpoint, {"requests": 0, "ok": 0, "limited": 0,
+                                               "injected": 0, "rows": 0})
+        st["requests"] += 1
+
+        now = asyncio.get_running_loop().time()
+        if self.rate_per_min:
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            if len(self._window) >= self.rate_per_min:
+                st["limited"] += 1
+                wait = max(1, int(60 - (now - self._window[0])) + 1)
+                return _too_many(wait)
+            self._window.append(now)
+        if self.throttle_rate and self._rng.random() < self.throttle_rate:
+            st["injected"] += 1
+            return _too_many(self.retry_after)
+
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        params = dict(request.query)
+        if "," in params.get("code", "") and endpoint not in self.batch_endpoints:
+            return web.json_response({"success": False, "message": "error params"})
+
+        data = self._respond(endpoint, params)
+        if data is None:
+            return web.json_response({"success": False, "message": "no data"})
+        st["ok"] += 1
+        st["rows"] += len(data.get("results") or [])
+        return web.json_response(data)
+
+    def _respond(self, endpoint: str, params: dict) -> Optional[dict]:
+        if self.fixtures:
+            data = self.fixtures.load(endpoint, params)
+            if data is None and "," in params.get("code", ""):
+                data = self._merge_fixtures(endpoint, params)
+            if data is not None:
+                return data
+        if not self.synthetic:
+            return None
+
+        if endpoint == CODE:
+            results = [synthetic_stock(i) for i in range(self.n_stocks)]
+        elif endpoint == EXPIRED:
+            results = self._expired(params)
+        else:
+            codes = [c for c in params.get("code", "").split(",") if c]
+            if not codes:
+                return None
+            if endpoint == INFO:
+                d = _parse(params.get("date")) or datetime.now(KST).date()
+                if d.weekday() >= 5:
+                    return {"success": True, "results": []}
+                return {"success": True,
+                        "results": [synthetic_info_row(code, d, self.seed) for code in codes]}
+            start, end = _date_range(params)
+            days = _weekdays(start, end)
+            if endpoint == HIST:
+                results = [synthetic_hist_row(code, d, self.seed) for d in days for code in codes]
+            else:
+                results = [row for d in days for code in codes
+                           for row in synthetic_investor_rows(code, d, self.seed)]
+        return {"success": True, "results": results}
+
+    def _merge_fixtures(self, endpoint: str, params: dict) -> Optional[dict]:
+        """단일 종목으로 녹화된 fixture를 모아 복수 종목 응답 구성 (하나라도 없으면 None)"""
+        results = []
+        for code in params["code"].split(","):
+            data = self.fixtures.load(endpoint, {**params, "code": code})
+            if data is None:
+                return None
+            for row in data.get("results") or []:
+                results.append({"code": code, **row})
+        return {"success": True, "results": results}
+
+    def _expired(self, params: dict) -> list[dict]:
+        """합성 상장폐지 종목 — 50종목당 1개, 30일 간격으로 폐지"""
+        end = _parse(params.get("endDate")) or datetime.now(KST).date()
+        start = _parse(params.get("startDate")) or end - timedelta(days=365)
+        rows = []
+        for i in range(max(1, self.n_stocks // 50)):
+            delisted = end - timedelta(days=30 * i)
+            if delisted < start:
+                break
+            code = synthetic_code(self.n_stocks + i)
+            rows.append({"isin": f"KR7{code}000", "code": code, "market_type": "1",
+                         "equity_type": "ST", "kr_name": f"폐지종목{i:04d}",
+                         "listed_date": "20100104",
+                         "delisted_date": delisted.strftime("%Y%m%d")})
+        return rows
+
+
+# ── 합성 데이터 (seed·종목·날짜가 같으면 항상 같은 값) ──────────────────────
+def synthetic_code(i: int) -> str:
+    return f"{(i + 1) * 10:06d}"
+
+
+def synthetic_stock(i: int) -> dict:
+    code = synthetic_code(i)
+    return {"code": code, "kr_name": f"모의종목{i:04d}",
+            "market": "1" if i % 2 == 0 else "7", "equity_type": "ST",
+            "isin": f"KR7{code}003", "listed_date": "20100104"}
+
+
+def synthetic_hist_row(code: str, d: date, seed: int = 0) -> dict:
+    base = random.Random(f"{seed}:{code}").randint(1_000, 200_000)
+    rng = random.Random(f"{seed}:{code}:{d.isoformat()}")
+    close = int(base * rng.uniform(0.9, 1.1))
+    open_ = int(close * rng.uniform(0.98, 1.02))
+    volume = rng.randint(1_000, 5_000_000)
+    return {
+        "date": d.strftime("%Y%m%d"), "code": code,
+        "open_price": open_, "high_price": max(open_, close) + rng.randint(0, close // 50),
+        "low_price": min(open_, close) - rng.randint(0, close // 50), "close_price": close,
+        "trading_volume": volume, "trading_value": volume * close,
+        "listed_shares": base * 1_000,
+        "base_price": open_, "change": close - open_,
+        "change_rate": round((close - open_) / open_ * 100, 2),
+    }
+
+
+def synthetic_info_row(code: str, d: date, seed: int = 0) -> dict:
+    """/api/stock/info 스냅샷 행 = hist 행 + 종목명·시장·시가총액"""
+    row = synthetic_hist_row(code, d, seed)
+    row.update({"kr_name": f"모의종목{code}", "market": "1",
+                "market_cap": row["close_price"] * row["listed_shares"]})
+    return row
+
+
+def synthetic_investor_rows(code: str, d: date, seed: int = 0) -> list[dict]:
+    rng = random.Random(f"{seed}:{code}:{d.isoformat()}:investor")
+    rows = []
+    for investor in INVESTOR_TYPES:
+        bid_vol, ask_vol = rng.randint(0, 500_000), rng.randint(0, 500_000)
+        rows.append({
+            "date": d.strftime("%Y%m%d"), "code": code, "investor": investor,
+            "bid_value": bid_vol * 50, "ask_value": ask_vol * 50,
+            "bid_volume": bid_vol, "ask_volume": ask_vol,
+        })
+    return rows
+
+
+def _too_many(retry_after: float) -> web.Response:
+    return web.json_response({"success": False, "message": "too many requests"},
+                             status=429, headers={"Retry-After": str(int(retry_after))})
+
+
+def _parse(val: Optional[str]) -> Optional[date]:
+    try:
+        return datetime.strptime(val, "%Y%m%d").date() if val else None
+    except ValueError:
+        return None
+
+
+def _date_range(params: dict) -> tuple[date, date]:
+    """API 기본값과 같게: endDate 미입력 = 오늘, startDate 미입력 = endDate - 30"""
+    end = _parse(params.get("endDate")) or datetime.now(KST).date()
+    start = _parse(params.get("startDate")) or end - timedelta(days=30)
+    return start, end
+
+
+def _weekdays(start: date, end: date) -> list[date]:
+    days = []
+    d = start
+    while d <= end:
+        if d.weekday() < 5:
+            days.append(d)
+        d += timedelta(days=1)
+    return days
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 Infomax mock 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 지연 최대값(초)")
+    parser.add_argument("--rate-per-min", type=int, default=0, help="분당 요청 한도 (0 = 없음)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="임의 429 확률 (0~1)")
+    parser.add_argument("--stocks", type=int, default=2500, help="합성 종목 수")
+    parser.add_argument("--fixtures", default="", help="녹화 fixture 폴더 (INFOMAX_RECORD_DIR)")
+    parser.add_argument("--no-synthetic", action="store_true", help="fixture에 없으면 success=False")
+    parser.add_argument("--no-investor-batch", action="store_true",
+                        help="/api/stock/investor 복수 종목 요청 거부")
+    args = parser.parse_args()
+
+    server = MockInfomaxServer(
+        host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        rate_per_min=args.rate_per_min, throttle_rate=args.throttle_rate,
+        batch_endpoints={HIST, INFO} if args.no_investor_batch else {HIST, INVESTOR, INFO},
+        fixtures=FixtureStore(args.fixtures) if args.fixtures else None,
+        synthetic=not args.no_synthetic, n_stocks=args.stocks,
+    )
+    print(f"mock Infomax 서버: http://{args.host}:{args.port}  (Ctrl+C 종료)")
+    web.run_app(server.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+인포맥스 일일 사용량(바이트) 집계 및 수집 계획
+
+- UsageLedger:  endpoint별 요청 수·응답 바이트·행 수 집계
+                당일(KST) 사용량을 파일로 저장해 여러 프로세스가 합산 (백필 + 일별 업데이트)
+- QuotaPlanner: 종목 수 × 일수 × endpoint 로 예상 사용량을 산출하고
+                남은 일일 한도(INFOMAX_PLAN)를 넘는 작업은 거부/연기
+
+    ledger = UsageLedger.from_settings()
+    ledger.record("/api/stock/hist", nbytes=len(r.content), rows=120)
+    ledger.flush()
+"""
+
+import sys
+import json
+import threading
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+try:
+    import fcntl
+except ImportError:     # Windows — 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+from utils.exceptions import QuotaExceededError
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 종목 1개 × 거래일 1일 당 응답 행 수 (investor = 투자자 구분 14종 전체 반환)
+ROWS_PER_STOCK_DAY = {
+    "/api/stock/hist":     1,
+    "/api/stock/info":     1,
+    "/api/stock/investor": 14,
+}
+# 실측 전 기본 추정치: 응답 행 1개당 바이트
+DEFAULT_BYTES_PER_ROW = {
+    "/api/stock/hist":     320,
+    "/api/stock/info":     380,
+    "/api/stock/investor": 230,
+}
+# 요청 1회당 고정 오버헤드 (JSON 외피) — 실측치가 없을 때만 더함
+REQUEST_OVERHEAD_BYTES = 600
+
+# 몇 건마다 파일에 반영할지
+FLUSH_EVERY = 50
+
+
+def today_kst() -> date:
+    return datetime.now(KST).date()
+
+
+def business_days(start: date, end: date) -> int:
+    """start~end 평일 수 (공휴일은 무시 — 추정용)"""
+    days = 0
+    d = start
+    while d <= end:
+        if d.weekday() < 5:
+            days += 1
+        d += timedelta(days=1)
+    return days
+
+
+class UsageLedger:
+    """
+    endpoint별 일일 사용량 집계 (thread-safe, 프로세스 간 파일 공유)
+
+    파일: {usage_dir}/infomax_usage_YYYYMMDD.json
+          {"endpoints": {endpoint: {"requests", "bytes", "rows"}}}
+    """
+
+    def __init__(self, usage_dir: Path, daily_limit_bytes: int):
+        self.usage_dir = Path(usage_dir)
+        self.daily_limit_bytes = daily_limit_bytes
+        self._lock = threading.Lock()
+        self._day = today_kst()
+        self._pending: dict[str, dict] = {}   # 아직 파일에 반영 안 한 증분
+        self._pending_count = 0
+        self._run: dict[str, dict] = {}       # 이 프로세스(회차) 누적
+        self._run_wait: dict[str, float] = {}  # 이 회차 endpoint별 rate limit 대기(초)
+
+    @classmethod
+    def from_settings(cls) -> "UsageLedger":
+        usage_dir = Path(settings.INFOMAX_USAGE_DIR)
+        if not usage_dir.is_absolute():
+            usage_dir = project_root / usage_dir
+        return cls(usage_dir, settings.infomax_daily_quota_bytes)
+
+    # ── 기록 ───────────────────────────────────────────────────────────
+    def record(self, endpoint: str, nbytes: int, rows: int = 0):
+        """응답 1건 기록"""
+        with self._lock:
+            if today_kst() != self._day:
+                self._flush_locked()
+                self._day = today_kst()
+            for bucket in (self._pending, self._run):
+                e = bucket.setdefault(endpoint, {"requests": 0, "bytes": 0, "rows": 0})
+                e["requests"] += 1
+                e["bytes"]    += nbytes
+                e["rows"]     += rows
+            self._pending_count += 1
+            if self._pending_count >= FLUSH_EVERY:
+                self._flush_locked()
+
+    def record_wait(self, endpoint: str, seconds: float):
+        """요청 전 rate limit 대기 기록 (회차 통계만, 파일에는 반영 안 함)"""
+        with self._lock:
+            self._run_wait[endpoint] = self._run_wait.get(endpoint, 0.0) + seconds
+
+    def flush(self):
+        """미반영 증분을 당일 파일에 합산"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        self.usage_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(self._day)
+        with open(path, "a+", encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                text = f.read()
+                data = json.loads(text) if text.strip() else {"endpoints": {}}
+                for endpoint, inc in self._pending.items():
+                    e = data["endpoints"].setdefault(endpoint, {"requests": 0, "bytes": 0, "rows": 0})
+                    for k in ("requests", "bytes", "rows"):
+                        e[k] += inc[k]
+                data["updated_at"] = datetime.now(KST).isoformat()
+                f.seek(0)
+                f.truncate()
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        self._pending.clear()
+        self._pending_count = 0
+
+    def _path(self, day: date) -> Path:
+        return self.usage_dir / f"infomax_usage_{day.strftime('%Y%m%d')}.json"
+
+    # ── 조회 ───────────────────────────────────────────────────────────
+    def _load(self, day: date) -> dict:
+        path = self._path(day)
+        if not path.exists():
+            return {}
+        with open(path, encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_SH)
+            try:
+                text = f.read()
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        return json.loads(text).get("endpoints", {}) if text.strip() else {}
+
+    def today_usage(self) -> dict[str, dict]:
+        """당일 전체 사용량 (모든 프로세스, 미반영분 포함) {endpoint: {"requests", "bytes", "rows"}}"""
+        with self._lock:
+            usage = self._load(self._day)
+            for endpoint, inc in self._pending.items():
+                e = usage.setdefault(endpoint, {"requests": 0, "bytes": 0, "rows": 0})
+                for k in ("requests", "bytes", "rows"):
+                    e[k] += inc[k]
+            return usage
+
+    def used_bytes(self) -> int:
+        return sum(e["bytes"] for e in self.today_usage().values())
+
+    def remaining_bytes(self) -> int:
+        return max(0, self.daily_limit_bytes - self.used_bytes())
+
+    def bytes_per_row(self, endpoint: str):
+        """당일 실측 행당 바이트 (실측 없으면 None)"""
+        e = self.today_usage().get(endpoint)
+        if not e or not e["rows"]:
+            return None
+        return e["bytes"] / e["rows"]
+
+    def reset_run(self):
+        with self._lock:
+            self._run = {}
+            self._run_wait = {}
+
+    def run_usage(self) -> dict[str, dict]:
+        """이 회차(프로세스) 사용량 {endpoint: {"requests", "bytes", "rows"}}"""
+        with self._lock:
+            return {k: dict(v) for k, v in self._run.items()}
+
+    def run_wait(self) -> dict[str, float]:
+        """이 회차 endpoint별 rate limit 대기 합계(초)"""
+        with self._lock:
+            return dict(self._run_wait)
+
+
+class QuotaPlanner:
+    """
+    일일 한도 대비 수집 계획 검토
+
+    planner = QuotaPlanner(ledger)
+    plan = planner.plan([
+        ("/api/stock/hist",     3800, 1, 76),    # (endpoint, 종목 수, 거래일 수, 요청 수)
+        ("/api/stock/investor", 2700, 1, 135),
+    ])
+    plan["allowed"]  → 한도 안에서 수행할 endpoint (앞에서부터 우선)
+    plan["deferred"] → 한도를 넘어 연기할 endpoint
+    """
+
+    def __init__(self, ledger: UsageLedger):
+        self.ledger = ledger
+
+    def estimate(self, endpoint: str, n_stocks: int, n_days: int,
+                 n_requests: int) -> int:
+        """endpoint 1개 작업의 예상 바이트 (당일 실측 행당 바이트 우선)"""
+        n_rows = n_stocks * n_days * ROWS_PER_STOCK_DAY.get(endpoint, 1)
+        measured = self.ledger.bytes_per_row(endpoint)
+        if measured is not None:
+            return int(n_rows * measured)
+        per_row = DEFAULT_BYTES_PER_ROW.get(endpoint, 320)
+        return int(n_rows * per_row + n_requests * REQUEST_OVERHEAD_BYTES)
+
+    def plan(self, work: list[tuple[str, int, int, int]]) -> dict:
+        """
+        work 순서(우선순위)대로 남은 한도에 들어가는 작업만 허용
+        Returns: {"remaining", "estimates": {endpoint: bytes}, "allowed": [...], "deferred": [...]}
+        """
+        remaining = self.ledger.remaining_bytes()
+        budget = remaining
+        plan = {"remaining": remaining, "estimates": {}, "allowed": [], "deferred": []}
+        for endpoint, n_stocks, n_days, n_requests in work:
+            est = self.estimate(endpoint, n_stocks, n_days, n_requests)
+            plan["estimates"][endpoint] = est
+            if est <= budget:
+                plan["allowed"].append(endpoint)
+                budget -= est
+            else:
+                plan["deferred"].append(endpoint)
+        return plan
+
+    def require(self, work: list[tuple[str, int, int, int]]) -> dict:
+        """plan()과 같되 허용되는 작업이 하나도 없으면 QuotaExceededError"""
+        plan = self.plan(work)
+        if work and not plan["allowed"]:
+            total = sum(plan["estimates"].values())
+            raise QuotaExceededError(
+                f"일일 사용량 한도 초과 예상: 필요 {format_bytes(total)} / 남음 {format_bytes(plan['remaining'])}",
+                required_bytes=total, remaining_bytes=plan["remaining"],
+            )
+        return plan
+
+
+def format_bytes(n: float) -> str:
+    """바이트 → 사람이 읽기 쉬운 문자열 (예: 12.3 MB, 요금제와 같은 10진 단위)"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1000 or unit == "GB":
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1000
@@ -0,0 +1,344 @@
+"""
+API 호출 rate limiter
+
+토큰 버킷(GCRA 방식) — 각 호출자에게 "언제 요청해도 되는지" 예약 시각을 배정하고,
+대기(sleep)는 lock 밖에서 수행하므로 한 스레드의 대기가 다른 스레드를 막지 않음.
+
+    limiter = TokenBucket(rate_per_min=57, burst=3)
+    waited = limiter.acquire()   # 필요한 만큼 대기 후 반환, 반환값 = 대기한 초
+
+SharedTokenBucket — 같은 호스트의 여러 프로세스가 예약 상태를 잠금 파일로 공유
+    (수동 백필과 예약 실행 일별 업데이트를 동시에 돌려도 합산 요청 수가 플랜 한도 이하)
+
+AdaptiveRateController — 429/timeout 응답에 따라 토큰 버킷의 속도를 전역으로 조절 (AIMD)
+    - 429/timeout: 속도 × decrease_factor (곱셈 감소), Retry-After 동안 전체 일시정지
+    - 연속 성공 increase_every회: 속도 + increase_step (덧셈 증가, max_rate까지)
+"""
+
+import sys
+import time
+import struct
+import asyncio
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:     # Windows — 프로세스 간 잠금 없이 동작 (프로세스 안 스레드만 조율)
+    fcntl = None
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+
+
+class TokenBucket:
+    """
+    thread-safe 토큰 버킷
+
+    rate_per_min: 분당 허용 요청 수 (장기 평균)
+    burst:        대기 없이 연속으로 보낼 수 있는 최대 요청 수
+    """
+
+    def __init__(self, rate_per_min: float, burst: int = 1,
+                 clock=time.monotonic, sleep=time.sleep):
+        if rate_per_min <= 0:
+            raise ValueError(f"rate_per_min must be positive: {rate_per_min}")
+        self._clock = clock
+        self._sleep = sleep
+        self._lock  = threading.Lock()
+        self._burst = max(1, int(burst))
+        self._tat   = 0.0   # theoretical arrival time (다음 토큰이 '정상' 발급되는 시각)
+        self._set_rate(rate_per_min)
+
+        # 대기 통계
+        self._calls    = 0
+        self._waited   = 0.0
+        self._max_wait = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "TokenBucket":
+        """Settings의 플랜(INFOMAX_PLAN)·버스트 설정으로 생성"""
+        return cls(settings.infomax_rate_per_min, settings.INFOMAX_RATE_BURST)
+
+    def _set_rate(self, rate_per_min: float):
+        self._rate     = float(rate_per_min)
+        self._interval = 60.0 / self._rate
+        self._tau      = (self._burst - 1) * self._interval   # 버스트 허용 폭
+
+    @property
+    def rate_per_min(self) -> float:
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        return self._burst
+
+    def set_rate(self, rate_per_min: float):
+        """분당 요청 수 변경 (이미 배정된 예약은 유지)"""
+        if rate_per_min <= 0:
+            raise ValueError(f"rate_per_min must be positive: {rate_per_min}")
+        with self._lock:
+            self._set_rate(rate_per_min)
+
+    def pause(self, seconds: float):
+        """지금부터 seconds 동안 새 토큰 발급 중지 (모든 스레드 공통)"""
+        with self._lock:
+            self._pause(self._clock(), seconds)
+
+    def _pause(self, now: float, seconds: float):
+        self._tat = max(self._tat, now + seconds + self._tau)
+
+    def reserve(self) -> float:
+        """
+        토큰 1개 예약 → 요청 가능 시각(clock 기준)을 반환
+        lock은 계산하는 동안만 잡고 대기하지 않음
+        """
+        with self._lock:
+            return self._reserve(self._clock())
+
+    def _reserve(self, now: float) -> float:
+        allowed_at = max(now, self._tat - self._tau)
+        self._tat  = max(self._tat, allowed_at) + self._interval
+        return allowed_at
+
+    def acquire(self) -> float:
+        """예약 시각까지 대기 (lock 밖에서) → 실제 대기한 초 반환"""
+        allowed_at = self.reserve()
+        wait = max(0.0, allowed_at - self._clock())
+        if wait > 0:
+            self._sleep(wait)
+        self._record_wait(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """acquire()의 asyncio 버전 — 이벤트 루프를 막지 않고 대기, 같은 예약 상태를 공유"""
+        allowed_at = self.reserve()
+        wait = max(0.0, allowed_at - self._clock())
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record_wait(wait)
+        return wait
+
+    def _record_wait(self, wait: float):
+        with self._lock:
+            self._calls   += 1
+            self._waited  += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def reset_stats(self):
+        """대기 통계 초기화 (예약 상태는 유지)"""
+        with self._lock:
+            self._calls    = 0
+            self._waited   = 0.0
+            self._max_wait = 0.0
+
+    def stats(self) -> dict:
+        """누적 대기 통계 {"calls", "total_wait", "avg_wait", "max_wait", "rate_per_min"}"""
+        with self._lock:
+            return {
+                "calls":        self._calls,
+                "total_wait":   self._waited,
+                "avg_wait":     self._waited / self._calls if self._calls else 0.0,
+                "max_wait":     self._max_wait,
+                "rate_per_min": self._rate,
+            }
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    프로세스 간 공유 토큰 버킷 (같은 호스트)
+
+    예약 상태(tat)와 속도를 잠금 파일 하나에 보관하고, 예약·일시정지·속도 변경 때마다
+    fcntl.flock 아래에서 읽고 갱신 → 따로 실행한 스크립트들이 하나의 분당 한도를 나눠 씀
+    (429 에 따른 감속·Retry-After 일시정지도 모든 프로세스에 적용)
+
+    파일: 16바이트 (tat: epoch 초, rate_per_min) — 시계는 프로세스 간 비교 가능한 time.time
+    idle_reset 초 동안 아무 프로세스도 요청하지 않았으면 파일의 속도 대신 이 프로세스의 속도 사용
+    (오래전 실행이 낮춰 둔 속도가 새 실행에 남지 않음)
+    """
+
+    STATE = struct.Struct("<dd")
+
+    def __init__(self, path: Path, rate_per_min: float, burst: int = 1,
+                 clock=time.time, sleep=time.sleep, idle_reset: float = 60.0):
+        super().__init__(rate_per_min, burst, clock, sleep)
+        self.path = Path(path)
+        self.idle_reset = idle_reset
+
+    @classmethod
+    def from_settings(cls) -> "SharedTokenBucket":
+        path = Path(settings.INFOMAX_RATE_STATE_FILE)
+        if not path.is_absolute():
+            path = project_root / path
+        return cls(path, settings.infomax_rate_per_min, settings.INFOMAX_RATE_BURST)
+
+    @contextmanager
+    def _shared(self):
+        """스레드 lock + 파일 잠금 → 파일 상태를 불러와 블록 실행 후 기록, 블록에는 현재 시각 전달"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a+b") as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    raw = f.read(self.STATE.size)
+                    now = self._clock()
+                    if len(raw) == self.STATE.size:
+                        tat, rate = self.STATE.unpack(raw)
+                        self._tat = tat
+                        if tat >= now - self.idle_reset and rate > 0:
+                            self._set_rate(rate)
+                    yield now
+                    f.seek(0)
+                    f.truncate()
+                    f.write(self.STATE.pack(self._tat, self._rate))
+                finally:
+                    if fcntl:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+
+    def set_rate(self, rate_per_min: float):
+        """분당 요청 수 변경 — 모든 프로세스에 적용"""
+        if rate_per_min <= 0:
+            raise ValueError(f"rate_per_min must be positive: {rate_per_min}")
+        with self._shared():
+            self._set_rate(rate_per_min)
+
+    def pause(self, seconds: float):
+        """지금부터 seconds 동안 모든 프로세스의 새 토큰 발급 중지"""
+        with self._shared() as now:
+            self._pause(now, seconds)
+
+    def reserve(self) -> float:
+        """
+        토큰 1개 예약 (파일 잠금은 몇 바이트 읽고 쓰는 동안만 — 대기는 잠금 밖에서)
+        """
+        with self._shared() as now:
+            return self._reserve(now)
+
+
+class AdaptiveRateController:
+    """
+    TokenBucket 속도를 AIMD 방식으로 조절하는 컨트롤러 (thread-safe)
+
+    min_rate / max_rate:  조절 범위 (분당 요청 수)
+    decrease_factor:      429/timeout 시 곱할 비율
+    increase_step:        증가 시 더할 분당 요청 수
+    increase_every:       증가에 필요한 연속 성공 횟수
+    cooldown:             감소 후 추가 감소를 무시할 시간(초) — 동시에 도착한 429 여러 건이
+                          같은 혼잡으로 인한 것이므로 한 번만 감소
+    """
+
+    def __init__(self, bucket: TokenBucket, min_rate: float, max_rate: float,
+                 decrease_factor: float = 0.5, increase_step: float = 2.0,
+                 increase_every: int = 30, cooldown: float = 5.0,
+                 clock=time.monotonic):
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.increase_every = increase_every
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._successes = 0
+        self._last_decrease = None
+
+        self._throttled = 0
+        self._timeouts  = 0
+        self._decreases = 0
+        self._increases = 0
+        self._min_seen  = bucket.rate_per_min
+
+    @classmethod
+    def from_settings(cls, bucket: TokenBucket) -> "AdaptiveRateController":
+        """설정 속도(플랜 × INFOMAX_RATE_SAFETY)를 상한, INFOMAX_RATE_MIN_PER_MIN을 하한으로 생성"""
+        return cls(bucket,
+                   min_rate=settings.INFOMAX_RATE_MIN_PER_MIN,
+                   max_rate=settings.infomax_rate_per_min)
+
+    @property
+    def effective_rate(self) -> float:
+        """현재 적용 중인 분당 요청 수"""
+        return self.bucket.rate_per_min
+
+    def on_success(self):
+        """정상 응답 — 연속 성공이 쌓이면 속도 증가"""
+        with self._lock:
+            self._successes += 1
+            if self._successes < self.increase_every:
+                return
+            self._successes = 0
+            new_rate = min(self.max_rate, self.bucket.rate_per_min + self.increase_step)
+            if new_rate > self.bucket.rate_per_min:
+                self.bucket.set_rate(new_rate)
+                self._increases += 1
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        """429 응답 — 속도 감소 + Retry-After(있으면) 동안 전체 일시정지"""
+        with self._lock:
+            self._throttled += 1
+            self._decrease()
+        if retry_after and retry_after > 0:
+            self.bucket.pause(retry_after)
+
+    def on_timeout(self):
+        """타임아웃 — 속도 감소"""
+        with self._lock:
+            self._timeouts += 1
+            self._decrease()
+
+    def _decrease(self):
+        self._successes = 0
+        now = self._clock()
+        if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        new_rate = max(self.min_rate, self.bucket.rate_per_min * self.decrease_factor)
+        if new_rate < self.bucket.rate_per_min:
+            self.bucket.set_rate(new_rate)
+            self._decreases += 1
+            self._min_seen = min(self._min_seen, new_rate)
+
+    def reset_stats(self):
+        with self._lock:
+            self._throttled = self._timeouts = 0
+            self._decreases = self._increases = 0
+            self._min_seen  = self.bucket.rate_per_min
+
+    def stats(self) -> dict:
+        """{"effective_rate", "min_rate_seen", "throttled", "timeouts", "decreases", "increases"}"""
+        with self._lock:
+            return {
+                "effective_rate": self.bucket.rate_per_min,
+                "min_rate_seen":  self._min_seen,
+                "throttled":      self._throttled,
+                "timeouts":       self._timeouts,
+                "decreases":      self._decreases,
+                "increases":      self._increases,
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP-date) → 대기 초, 해석 불가 시 None"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,215 @@
+"""
+지연 재시도 큐 / 서킷 브레이커
+
+RetryQueue — 한 패스에서 데이터를 못 받은 항목(종목)을 모아 지터를 섞은 지수 백오프 뒤
+             다음 라운드로 다시 내줌 (작업 스레드가 실패 요청 때문에 잠들지 않음)
+
+    retry = RetryQueue.from_settings()
+    gave_up = retry.defer(failed_items, attempt=1)   # 한도 초과 항목은 즉시 반환
+    items = retry.next_round()                       # 백오프만큼 기다린 뒤 재시도할 항목
+
+poll_until     — 늦게 올라오는 데이터 재조회: 완전성 확인 → 목표 미달이면 백오프 후 누락분만 다시 요청,
+                 목표 달성 또는 마감 시각까지 반복
+
+CircuitBreaker — 연속 실패(timeout·연결 오류·5xx)가 threshold회 쌓이면 공유 TokenBucket을
+                 일시정지해 클라이언트 전체(모든 스레드·코루틴)가 쉬도록 함
+                 재개 후 첫 실패에 다시 열리며(half-open), 연속으로 열릴수록 정지 시간 2배
+"""
+
+import sys
+import time
+import random
+import threading
+from pathlib import Path
+from typing import Optional
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+from collectors.rate_limiter import TokenBucket
+
+# 연속으로 열릴 때 정지 시간 상한 = cooldown × MAX_COOLDOWN_FACTOR
+MAX_COOLDOWN_FACTOR = 8
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng=random.random) -> float:
+    """attempt번째 재시도 대기(초) — base × 2^(attempt-1) (cap 이하)의 절반 + 나머지 절반은 랜덤"""
+    ceiling = min(cap, base * 2 ** max(0, attempt - 1))
+    return ceiling / 2 + rng() * ceiling / 2
+
+
+class RetryQueue:
+    """
+    패스 단위 지연 재시도 큐 (단일 스레드 — 수집 루프를 도는 메인 스레드에서 사용)
+
+    max_attempts: 항목당 재시도 횟수 한도 (0 = 재시도 안 함)
+    base_wait:    첫 재시도 대기 기준(초), 이후 2배씩
+    max_wait:     대기 상한(초)
+    """
+
+    def __init__(self, max_attempts: int, base_wait: float, max_wait: float,
+                 clock=time.monotonic, sleep=time.sleep, rng=random.random):
+        self.max_attempts = max_attempts
+        self.base_wait = base_wait
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        self._rounds: list[tuple[float, list]] = []   # (ready_at, items)
+
+        self._deferred: set = set()
+        self._gave_up = 0
+        self._lost = 0              # 재시도까지 했지만 끝내 포기한 항목 수
+        self._round_count = 0
+        self._waited = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "RetryQueue":
+        return cls(settings.INFOMAX_RETRY_PASSES,
+                   settings.INFOMAX_RETRY_BASE_WAIT,
+                   settings.INFOMAX_RETRY_MAX_WAIT)
+
+    def __len__(self) -> int:
+        return sum(len(items) for _, items in self._rounds)
+
+    def defer(self, items: list, attempt: int) -> list:
+        """
+        items를 attempt번째 재시도로 예약 → 한도를 넘어 포기한 항목 반환
+        같은 패스의 항목은 한 라운드로 묶여 다시 일괄 요청됨
+        """
+        if attempt > self.max_attempts:
+            self._gave_up += len(items)
+            self._lost += sum(1 for item in items if item in self._deferred)
+            return list(items)
+        if items:
+            delay = backoff_delay(attempt, self.base_wait, self.max_wait, self._rng)
+            self._rounds.append((self._clock() + delay, list(items)))
+            self._rounds.sort(key=lambda r: r[0])
+            self._deferred.update(items)
+        return []
+
+    def ready_in(self) -> Optional[float]:
+        """가장 이른 라운드까지 남은 시간(초, 0 이하면 준비됨), 예약된 라운드가 없으면 None"""
+        if not self._rounds:
+            return None
+        return self._rounds[0][0] - self._clock()
+
+    def next_round(self) -> list:
+        """가장 이른 라운드 시각까지 대기 후 그 시각까지 준비된 항목 모두 반환 (비었으면 [])"""
+        if not self._rounds:
+            return []
+        wait = self._rounds[0][0] - self._clock()
+        if wait > 0:
+            self._sleep(wait)
+            self._waited += wait
+        now = self._clock()
+        items = []
+        while self._rounds and self._rounds[0][0] <= now:
+            items.extend(self._rounds.pop(0)[1])
+        self._round_count += 1
+        return items
+
+    def stats(self) -> dict:
+        """{"deferred"(재시도한 고유 항목 수), "recovered", "gave_up", "rounds", "waited"}"""
+        return {
+            "deferred":  len(self._deferred),
+            "recovered": len(self._deferred) - self._lost,
+            "gave_up":   self._gave_up,
+            "rounds":    self._round_count,
+            "waited":    self._waited,
+        }
+
+
+def poll_until(probe, poll, target: float, deadline: float, base_wait: float, max_wait: float,
+               clock=time.monotonic, sleep=time.sleep, rng=random.random) -> dict:
+    """
+    probe() → (coverage 0~1, 누락 정보) — 라운드 사이 값싼 완전성 확인
+    poll(누락 정보) — 누락분만 다시 수집 (반환값 무시)
+    deadline: clock() 기준 마감 시각 — 다음 라운드 대기가 마감을 넘으면 중단
+
+    Returns: {"rounds", "coverage"(마지막 확인값), "stopped"("target" / "deadline"), "waited"}
+    """
+    rounds, waited = 0, 0.0
+    while True:
+        coverage, missing = probe()
+        if coverage >= target:
+            stopped = "target"
+            break
+        wait = backoff_delay(rounds + 1, base_wait, max_wait, rng)
+        if clock() + wait > deadline:
+            stopped = "deadline"
+            break
+        sleep(wait)
+        waited += wait
+        rounds += 1
+        poll(missing)
+    return {"rounds": rounds, "coverage": coverage, "stopped": stopped, "waited": waited}
+
+
+class CircuitBreaker:
+    """
+    연속 실패 기반 서킷 브레이커 (thread-safe)
+
+    threshold: 열림 판단 연속 실패 횟수
+    cooldown:  처음 열릴 때 TokenBucket 일시정지 시간(초), 연속으로 열릴수록 2배
+    """
+
+    def __init__(self, bucket: TokenBucket, threshold: int = 5, cooldown: float = 30.0,
+                 clock=time.monotonic):
+        self.bucket = bucket
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = cooldown * MAX_COOLDOWN_FACTOR
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._streak = 0            # 성공 없이 연속으로 열린 횟수
+        self._open_until = 0.0
+
+        self._trips = 0
+        self._paused = 0.0
+
+    @classmethod
+    def from_settings(cls, bucket: TokenBucket) -> "CircuitBreaker":
+        return cls(bucket, settings.INFOMAX_BREAKER_THRESHOLD, settings.INFOMAX_BREAKER_COOLDOWN)
+
+    @property
+    def is_open(self) -> bool:
+        return self._clock() < self._open_until
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._streak = 0
+
+    def record_failure(self):
+        """timeout·연결 오류·5xx — 열려 있는 동안 도착한 실패는 같은 장애로 보고 무시"""
+        with self._lock:
+            now = self._clock()
+            if now < self._open_until:
+                return
+            self._failures += 1
+            if self._failures < self.threshold:
+                return
+            pause = min(self.max_cooldown, self.cooldown * 2 ** self._streak)
+            self._streak += 1
+            self._trips += 1
+            self._paused += pause
+            self._open_until = now + pause
+            self._failures = self.threshold - 1     # half-open: 재개 후 첫 실패에 다시 열림
+        self.bucket.pause(pause)
+
+    def reset_stats(self):
+        with self._lock:
+            self._trips = 0
+            self._paused = 0.0
+
+    def stats(self) -> dict:
+        """{"trips", "paused_seconds", "open"}"""
+        with self._lock:
+            return {
+                "trips":          self._trips,
+                "paused_seconds": self._paused,
+                "open":           self._clock() < self._open_until,
+            }
@@ -0,0 +1,219 @@
+"""
+수집 작업 스케줄러 (여러 endpoint 작업을 한 풀에서 섞어 실행)
+
+OHLCV(hist/info)와 수급(investor)을 단계별로 따로 돌리면 단계마다 시작·꼬리 구간이 생겨
+마지막 몇 묶음을 기다리는 동안 API 한도가 놀게 됨
+→ endpoint별 작업 흐름(WorkStream)을 하나의 스케줄러가 공유 rate limiter 아래에서 번갈아 제출
+
+    hist     = WorkStream("ohlcv", _fetch_hist_batch, chunks, windows, 50, retry, weight=2)
+    investor = WorkStream("investor", _fetch_investor_batch, chunks2, windows, 20, retry2)
+    for name, (start, end), chunk_result in WorkScheduler([hist, investor]).run(executor, 8):
+        ...
+
+- priority: 큰 쪽 작업이 남아 있으면 먼저 제출 (같은 priority끼리는 weight 비율로 섞음)
+- weight:   같은 priority 안에서 제출 비율 (smooth weighted round-robin)
+- 재시도:   흐름별 RetryQueue — 한 흐름이 백오프로 쉬는 동안 다른 흐름이 한도를 씀
+- executor: submit(fetch_fn, chunk, start, end) → concurrent.futures.Future 를 주는 객체
+            (daily_update 의 스레드 / async 엔진 어댑터)
+"""
+
+import sys
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from collectors.infomax import chunked
+from collectors.retry import RetryQueue
+
+
+def parse_stream_map(text: str) -> dict[str, float]:
+    """"ohlcv=2,investor=1" → {"ohlcv": 2.0, "investor": 1.0} (빈 값·형식 오류 항목은 무시)"""
+    result = {}
+    for part in (text or "").split(","):
+        name, _, value = part.partition("=")
+        try:
+            result[name.strip()] = float(value)
+        except ValueError:
+            continue
+    return result
+
+
+def apply_schedule(streams: list["WorkStream"], priority: str = "", weights: str = ""):
+    """
+    설정 문자열로 흐름별 priority / weight 지정
+    weight 를 지정하지 않은 흐름은 남은 단위 수에 비례 → 모든 흐름이 비슷한 시점에 끝남
+    """
+    prio, weight = parse_stream_map(priority), parse_stream_map(weights)
+    for s in streams:
+        s.priority = int(prio.get(s.name, s.priority))
+        s.weight = weight.get(s.name) or max(1, len(s.units))
+
+
+class WorkStream:
+    """
+    endpoint 하나의 작업 흐름: (종목 묶음 × 기간 창) 단위 공급 + 실패 종목 지연 재시도
+
+    결과 [(code, name, rows), ...] 중 rows 가 빈 종목은 바로 내보내지 않고 패스가 끝나면 retry 에 예약,
+    한도를 넘으면 빈 rows 로 내보냄 → 모든 (종목, 창)이 정확히 한 번씩 나감
+    """
+
+    def __init__(self, name: str, fetch_fn: Callable, chunks: list, windows: list[tuple[date, date]],
+                 batch_size: int, retry: RetryQueue, priority: int = 0, weight: float = 1.0,
+                 skip: set = None):
+        """skip: 이미 저장된 (code, 창 시작일) — 창마다 빼고 다시 묶음 (이어받기)"""
+        self.name = name
+        self.fetch_fn = fetch_fn
+        self.batch_size = batch_size
+        self.retry = retry
+        self.priority = priority
+        self.weight = weight
+        self.units = deque()
+        self.total = 0
+        self.skipped = 0
+        for s, e in windows:
+            window_chunks = chunks
+            if skip:
+                stocks = [st for chunk in chunks for st in chunk if (st[0], s) not in skip]
+                self.skipped += sum(len(chunk) for chunk in chunks) - len(stocks)
+                window_chunks = chunked(stocks, batch_size)
+            self.units.extend((chunk, s, e) for chunk in window_chunks)
+            self.total += sum(len(chunk) for chunk in window_chunks)
+        self.inflight = 0
+        self.done = 0
+        self.credit = 0.0
+        self._failed: list[tuple] = []      # 이번 패스에서 못 받은 (code, name, start, end)
+        self._attempt = 0
+        self.deferred = 0
+
+    # ── 상태 ───────────────────────────────────────────────────────────
+    def ready(self) -> bool:
+        """지금 제출할 단위가 있는지 (재시도 라운드는 백오프가 끝났을 때만)"""
+        if self.units:
+            return True
+        if self.inflight or self._failed:
+            return False
+        wait_s = self.retry.ready_in()
+        return wait_s is not None and wait_s <= 0
+
+    def retry_wait(self) -> Optional[float]:
+        """재시도 라운드만 남았을 때 그 라운드까지 남은 시간 (아니면 None)"""
+        if self.units or self.inflight:
+            return None
+        return self.retry.ready_in()
+
+    # ── 제출 / 완료 ────────────────────────────────────────────────────
+    def take(self) -> tuple[list, date, date]:
+        if not self.units:
+            self._load_retry_round()
+        self.inflight += 1
+        return self.units.popleft()
+
+    def _load_retry_round(self):
+        """백오프가 끝난 재시도 항목 → 창별로 batch_size 묶음 (준비 전이면 대기)"""
+        by_window = defaultdict(list)
+        for code, name, s, e in self.retry.next_round():
+            by_window[(s, e)].append((code, name))
+        for (s, e), stocks in by_window.items():
+            self.units.extend((chunk, s, e) for chunk in chunked(stocks, self.batch_size))
+
+    def complete(self, chunk_result: list, start: date, end: date) -> list[tuple[tuple, list]]:
+        """
+        단위 하나의 결과 → 내보낼 ((start, end), 결과 묶음) 목록
+        (성공 종목, 패스가 끝났으면 포기 종목 — 포기 종목은 창별로 나눠 빈 rows)
+        """
+        self.inflight -= 1
+        out = []
+        ok = [(code, name, rows) for code, name, rows in chunk_result if rows]
+        self._failed.extend((code, name, start, end) for code, name, rows in chunk_result if not rows)
+        if ok:
+            self.done += len(ok)
+            out.append(((start, end), ok))
+        if not self.units and not self.inflight and self._failed:
+            self._attempt += 1
+            failed, self._failed = self._failed, []
+            gave_up = self.retry.defer(failed, self._attempt)
+            if gave_up:
+                self.done += len(gave_up)
+                by_window = defaultdict(list)
+                for code, name, s, e in gave_up:
+                    by_window[(s, e)].append((code, name, []))
+                out.extend(by_window.items())
+            else:
+                self.deferred = len(failed)
+        return out
+
+    def progress(self) -> dict:
+        """attempt: 지금까지 끝난 패스 중 실패가 있던 횟수, deferred: 마지막으로 재시도 예약한 종목 수"""
+        return {"done": self.done, "total": self.total, "inflight": self.inflight,
+                "retrying": len(self.retry) + len(self._failed),
+                "attempt": self._attempt, "deferred": self.deferred}
+
+
+class WorkScheduler:
+    """
+    여러 WorkStream 단위를 한 executor 에 섞어 제출 (동시 제출은 run(max_inflight) 개까지)
+    결과를 소비하는 쪽(DB writer 큐)이 막히면 run() 소비가 멈추고 새 제출도 멈춤
+    """
+
+    def __init__(self, streams: list[WorkStream]):
+        self.streams = streams
+
+    def _pick(self) -> Optional[WorkStream]:
+        ready = [s for s in self.streams if s.ready()]
+        if not ready:
+            return None
+        top = max(s.priority for s in ready)
+        candidates = [s for s in ready if s.priority == top]
+        total = sum(s.weight for s in candidates)
+        for s in candidates:
+            s.credit += s.weight
+        best = max(candidates, key=lambda s: s.credit)
+        best.credit -= total
+        return best
+
+    def run(self, executor, max_inflight: int) -> Iterator[tuple[str, tuple, list]]:
+        """(흐름 이름, (start, end), [(code, name, rows), ...]) 를 완료 순서대로 yield"""
+        futures = {}
+        while True:
+            while len(futures) < max(1, max_inflight):
+                stream = self._pick()
+                if stream is None:
+                    break
+                chunk, start, end = stream.take()
+                futures[executor.submit(stream.fetch_fn, chunk, start, end)] = (stream, start, end)
+
+            waits = [w for w in (s.retry_wait() for s in self.streams) if w is not None]
+            if not futures:
+                if not waits:
+                    return
+                # 진행 중인 요청 없이 재시도 백오프만 남음 → 가장 이른 라운드를 기다려 제출
+                stream = min((s for s in self.streams if s.retry_wait() is not None),
+                             key=lambda s: s.retry_wait())
+                chunk, start, end = stream.take()
+                futures[executor.submit(stream.fetch_fn, chunk, start, end)] = (stream, start, end)
+                continue
+
+            timeout = max(0.0, min(waits)) if waits else None
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                stream, start, end = futures.pop(future)
+                for window, chunk_result in stream.complete(future.result(), start, end):
+                    yield stream.name, window, chunk_result
+
+    def progress(self) -> dict[str, dict]:
+        """흐름별 {"done", "total", "inflight", "retrying", "attempt", "deferred"}"""
+        return {s.name: s.progress() for s in self.streams}
+
+    def progress_line(self) -> str:
+        parts = []
+        for name, p in self.progress().items():
+            part = f"{name} {p['done']:,}/{p['total']:,}"
+            if p["retrying"]:
+                part += f" (재시도 {p['retrying']})"
+            parts.append(part)
+        return " | ".join(parts)
@@ -8,6 +8,21 @@ from pydantic_settings import BaseSettings
 from pydantic import Field
 
 
+# 인포맥스 플랜별 분당 요청 한도 (docs/인포맥스_API_정리.md 요금제 표)
+INFOMAX_PLAN_RATE_LIMITS = {
+    "LITE":     60,
+    "STANDARD": 120,
+    "PRO":      180,
+}
+
+# 인포맥스 플랜별 일 사용량 한도 (GB)
+INFOMAX_PLAN_DAILY_GB = {
+    "LITE":     0.2,
+    "STANDARD": 0.5,
+    "PRO":      1.0,
+}
+
+
 class Settings(BaseSettings):
     """애플리케이션 설정"""
 
@@ -22,10 +37,51 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = Field(default=5, description="연결 풀 크기")
     DB_MAX_OVERFLOW: int = Field(default=10, description="최대 오버플로우")
 
+    # DB Writer (수집과 저장을 겹치는 전용 쓰기 스레드)
+    DB_WRITER_QUEUE_SIZE: int = Field(default=64, description="writer 큐에 쌓아 둘 수 있는 묶음 수 (가득 차면 수집 대기)")
+    DB_WRITER_MIN_BATCH: int = Field(default=500, description="writer 한 번에 쓰는 최소 행 수")
+    DB_WRITER_MAX_BATCH: int = Field(default=50000, description="writer 한 번에 쓰는 최대 행 수")
+    DB_WRITER_TARGET_SECONDS: float = Field(default=1.0, description="writer 쓰기 1회 목표 시간(초), 실측 속도로 묶음 크기 조정")
+    DB_COPY_THRESHOLD: int = Field(default=5000, description="이 행 수 이상이면 COPY + staging 테이블 병합으로 UPSERT (0 = 사용 안 함)")
+
     # API Keys
     INFOMAX_API_KEY: str = Field(default="", description="인포맥스 API 키")
     INFOMAX_API_SECRET: str = Field(default="", description="인포맥스 API 시크릿")
     INFOMAX_BASE_URL: str = Field(default="https://api.infomax.co.kr", description="인포맥스 API URL")
+    INFOMAX_HIST_BATCH_SIZE: int = Field(default=50, description="hist API 복수 종목 일괄 조회 시 요청당 종목 수")
+    INFOMAX_INVESTOR_BATCH_SIZE: int = Field(default=20, description="investor API 복수 종목 일괄 조회 시 요청당 종목 수")
+    INFOMAX_INFO_PAGE_SIZE: int = Field(default=300, description="/api/stock/info 스냅샷 한 요청당 종목 수")
+    INFOMAX_SNAPSHOT_ENABLED: bool = Field(default=True, description="단일 일자 업데이트 시 /api/stock/info 스냅샷으로 OHLCV 수집")
+    INFOMAX_HIST_WINDOW_DAYS: int = Field(default=30, description="hist/investor 한 요청의 최대 조회 기간(일) — 긴 기간은 이 크기로 분할")
+    INFOMAX_PLAN: str = Field(default="LITE", description="인포맥스 요금제 (LITE/STANDARD/PRO)")
+    INFOMAX_RATE_PER_MIN: float = Field(default=0, description="분당 요청 수 직접 지정 (0 = 플랜 한도 × INFOMAX_RATE_SAFETY)")
+    INFOMAX_RATE_SAFETY: float = Field(default=0.95, description="플랜 한도 대비 사용 비율 (여유분 확보)")
+    INFOMAX_RATE_BURST: int = Field(default=3, description="대기 없이 연속 전송 가능한 최대 요청 수")
+    INFOMAX_RATE_ADAPTIVE: bool = Field(default=True, description="429/timeout 기반 자동 속도 조절 (AIMD)")
+    INFOMAX_RATE_MIN_PER_MIN: float = Field(default=10, description="자동 속도 조절 하한 (분당 요청 수)")
+    INFOMAX_RATE_SHARED: bool = Field(default=True, description="같은 호스트의 수집 프로세스들이 분당 한도를 공유 (잠금 파일)")
+    INFOMAX_RATE_STATE_FILE: str = Field(default="logs/infomax_rate.state", description="공유 rate limiter 상태 파일")
+    INFOMAX_ENGINE: str = Field(default="thread", description="수집 엔진 (thread = ThreadPoolExecutor / async = asyncio)")
+    INFOMAX_ASYNC_CONCURRENCY: int = Field(default=32, description="async 엔진 동시 요청 수 (커넥션 풀 크기)")
+    INFOMAX_SCHEDULE_PRIORITY: str = Field(default="", description="수집 흐름별 우선순위 (예: ohlcv=1,investor=0 — 큰 쪽 먼저, 빈 값 = 모두 같음)")
+    INFOMAX_SCHEDULE_WEIGHTS: str = Field(default="", description="같은 우선순위 안 제출 비율 (예: ohlcv=2,investor=1 — 빈 값 = 남은 묶음 수 비례)")
+    INFOMAX_RETRY_PASSES: int = Field(default=2, description="데이터를 못 받은 종목의 지연 재시도 라운드 수 (0 = 안 함)")
+    INFOMAX_RETRY_BASE_WAIT: float = Field(default=10.0, description="첫 재시도 라운드 대기 기준(초), 이후 2배씩")
+    INFOMAX_RETRY_MAX_WAIT: float = Field(default=120.0, description="재시도 라운드 대기 상한(초)")
+    INFOMAX_BREAKER_THRESHOLD: int = Field(default=5, description="연속 실패(timeout·연결 오류·5xx) 몇 회에 전체 일시정지할지")
+    INFOMAX_BREAKER_COOLDOWN: float = Field(default=30.0, description="서킷 브레이커 일시정지 시간(초), 연속으로 열릴수록 2배")
+    INFOMAX_DAILY_QUOTA_GB: float = Field(default=0, description="일 사용량 한도 직접 지정 (0 = 플랜 한도)")
+    INFOMAX_USAGE_DIR: str = Field(default="logs/infomax_usage", description="일별 API 사용량 기록 폴더")
+    INFOMAX_CACHE_ENABLED: bool = Field(default=False, description="API 응답 디스크 캐시 사용 여부")
+    INFOMAX_CACHE_DIR: str = Field(default="data/cache/infomax", description="API 응답 캐시 폴더")
+    INFOMAX_CACHE_MAX_MB: float = Field(default=500, description="응답 캐시 최대 용량(MB) — 초과 시 오래 안 쓴 것부터 삭제")
+    INFOMAX_CACHE_TODAY_TTL: int = Field(default=300, description="오늘 데이터가 포함된 응답의 캐시 유효 시간(초)")
+    INFOMAX_CACHE_LATE_DAYS: int = Field(default=7, description="과거 구간이라도 endDate 가 최근 N일 안이면 영구 캐시하지 않음 (늦은 데이터)")
+    INFOMAX_CACHE_LATE_TTL: int = Field(default=3600, description="최근 구간 / 일부 종목만 온 묶음 응답의 캐시 유효 시간(초)")
+    INFOMAX_RECORD_DIR: str = Field(default="", description="응답 녹화 폴더 (mock 서버 재생용, 빈 값 = 녹화 안 함)")
+    STOCK_MASTER_EXPIRED_OVERLAP_DAYS: int = Field(default=7, description="상장폐지 목록 조회 시 지난 동기화일보다 며칠 앞부터 다시 조회할지")
+    BACKFILL_PLAN_DIR: str = Field(default="data/backfill", description="백필 계획·진행 로그·휴장일 기록 폴더")
+    BACKFILL_CLOSED_MIN_AGE_DAYS: int = Field(default=7, description="종료일이 N일 넘게 지난 창에서만 휴장일 학습 (지연 데이터를 휴장일로 오인 방지)")
 
     HTS_API_KEY: str = Field(default="", description="HTS API 키")
     HTS_API_SECRET: str = Field(default="", description="HTS API 시크릿")
@@ -43,6 +99,12 @@ class Settings(BaseSettings):
     COLLECTION_RETRY_COUNT: int = Field(default=3, description="수집 재시도 횟수")
     COLLECTION_TIMEOUT_SECONDS: int = Field(default=300, description="수집 타임아웃 (초)")
     BATCH_SIZE: int = Field(default=100, description="배치 크기")
+    DAILY_SHARD_WORKERS: int = Field(default=1, description="daily_update 종목 샤드 프로세스 수 (1 = 단일 프로세스, 대량 백필 시 2 이상)")
+    DAILY_REPOLL_ENABLED: bool = Field(default=False, description="본 수집 뒤 누락 종목 재조회 (연휴 직후 늦게 올라오는 데이터)")
+    DAILY_REPOLL_TARGET: float = Field(default=0.995, description="재조회 종료 수집률 (누락 행렬 기준, 0~1)")
+    DAILY_REPOLL_MAX_MINUTES: int = Field(default=120, description="재조회 마감 (본 수집 종료 후 분)")
+    DAILY_REPOLL_BASE_WAIT: float = Field(default=300.0, description="첫 재조회 대기 기준(초), 이후 2배씩")
+    DAILY_REPOLL_MAX_WAIT: float = Field(default=1800.0, description="재조회 대기 상한(초)")
 
     # Monitoring & Alerting
     SLACK_WEBHOOK_URL: str = Field(default="", description="Slack 웹훅 URL")
@@ -75,6 +137,24 @@ class Settings(BaseSettings):
         password = f":{self.DB_PASSWORD}" if self.DB_PASSWORD else ""
         return f"postgresql://{self.DB_USER}{password}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def infomax_rate_per_min(self) -> float:
+        """rate limiter에 적용할 분당 요청 수"""
+        if self.INFOMAX_RATE_PER_MIN > 0:
+            return self.INFOMAX_RATE_PER_MIN
+        return self.infomax_plan_rate_limit * self.INFOMAX_RATE_SAFETY
+
+    @property
+    def infomax_plan_rate_limit(self) -> float:
+        """요금제 분당 요청 한도"""
+        return INFOMAX_PLAN_RATE_LIMITS.get(self.INFOMAX_PLAN.upper(), INFOMAX_PLAN_RATE_LIMITS["LITE"])
+
+    @property
+    def infomax_daily_quota_bytes(self) -> int:
+        """일 사용량 한도 (바이트, GB = 10^9)"""
+        gb = self.INFOMAX_DAILY_QUOTA_GB or INFOMAX_PLAN_DAILY_GB.get(self.INFOMAX_PLAN.upper(), INFOMAX_PLAN_DAILY_GB["LITE"])
+        return int(gb * 1_000_000_000)
+
     @property
     def is_production(self) -> bool:
         """프로덕션 환경 여부"""
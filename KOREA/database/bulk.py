@@ -0,0 +1,92 @@
+"""
+COPY 기반 대량 UPSERT
+
+execute_values(page_size=500)는 500행마다 INSERT 문을 만들어 보내므로 수십만 행 이상에서는 병목
+→ 행을 COPY FROM STDIN(CSV)으로 임시 staging 테이블에 흘려 넣고,
+   기존 UPSERT SQL의 VALUES %s 자리를 staging SELECT 로 바꿔 한 번에 병합
+
+    changed, total = copy_upsert(conn, OHLCV_SQL, rows)
+
+- staging 테이블: 세션 임시 테이블(WAL 기록 없음, ON COMMIT DELETE ROWS) — 연결마다 한 번 생성 후 재사용
+- 변경 건수: 병합 INSERT … ON CONFLICT … WHERE IS DISTINCT FROM 의 rowcount (execute_values 경로와 같은 의미)
+- 같은 키가 여러 번 들어오면 마지막 행만 병합 (한 문장에서 같은 행을 두 번 갱신할 수 없음)
+"""
+
+import re
+import csv
+import io
+from datetime import date, datetime
+from typing import Iterable, NamedTuple
+
+_INSERT_RE   = re.compile(r"INSERT\s+INTO\s+(\w+)\s*\(([^)]*)\)", re.IGNORECASE)
+_CONFLICT_RE = re.compile(r"ON\s+CONFLICT\s*\(([^)]*)\)", re.IGNORECASE)
+
+
+class StagingPlan(NamedTuple):
+    table:   str
+    columns: tuple[str, ...]
+    keys:    tuple[str, ...]
+    stage:   str
+
+
+def _names(text: str) -> tuple[str, ...]:
+    return tuple(c.strip() for c in text.split(",") if c.strip())
+
+
+def staging_plan(sql: str) -> StagingPlan:
+    """UPSERT SQL(INSERT INTO t (cols) VALUES %s ON CONFLICT (keys) …) → 대상 테이블·컬럼·키"""
+    insert, conflict = _INSERT_RE.search(sql), _CONFLICT_RE.search(sql)
+    if not insert or not conflict or "VALUES %s" not in sql:
+        raise ValueError("COPY 경로를 쓸 수 없는 SQL (INSERT INTO t (...) VALUES %s ON CONFLICT (...) 형식 필요)")
+    table = insert.group(1)
+    return StagingPlan(table, _names(insert.group(2)), _names(conflict.group(1)), f"_stage_{table}")
+
+
+def merge_sql(sql: str, plan: StagingPlan) -> str:
+    """UPSERT SQL의 VALUES %s → staging 에서 키별 마지막 행 SELECT"""
+    cols = ", ".join(plan.columns)
+    keys = ", ".join(plan.keys)
+    select = (f"SELECT DISTINCT ON ({keys}) {cols} FROM {plan.stage} "
+              f"ORDER BY {keys}, _seq DESC")
+    return sql.replace("VALUES %s", select, 1)
+
+
+def _csv_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def to_csv(rows: Iterable[tuple]) -> io.StringIO:
+    """행 → COPY CSV (None 은 따옴표 없는 빈 칸 = NULL, 마지막 열은 입력 순서 _seq)"""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    for seq, row in enumerate(rows):
+        writer.writerow([*map(_csv_value, row), seq])
+    buf.seek(0)
+    return buf
+
+
+def copy_upsert(conn, sql: str, rows: list[tuple]) -> tuple[int, int]:
+    """
+    COPY → staging → INSERT … SELECT … ON CONFLICT 병합 후 커밋
+    Returns: (changed_rows, total_rows) — upsert_batch 와 같음
+    """
+    if not rows:
+        return 0, 0
+    plan = staging_plan(sql)
+    cols = ", ".join(plan.columns)
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {plan.stage}
+            ON COMMIT DELETE ROWS AS
+            SELECT {cols}, 0::bigint AS _seq FROM {plan.table} WITH NO DATA
+        """)
+        cur.copy_expert(f"COPY {plan.stage} ({cols}, _seq) FROM STDIN WITH (FORMAT csv)",
+                        to_csv(rows))
+        cur.execute(merge_sql(sql, plan))
+        changed = cur.rowcount
+    conn.commit()
+    return changed, len(rows)
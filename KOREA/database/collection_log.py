@@ -0,0 +1,111 @@
+"""
+수집 단계별 실행 로그 (data_collection_logs)
+
+run_update 한 번에 단계마다 한 행 — 종목 마스터 / OHLCV / 시가총액 / 수급 / 특이사항 / 품질 체크
+행마다 처리 건수, 시작·완료 시각, API 호출 수·바이트, rate limit 대기, DB 쓰기 시간, 오류 요약
+
+    log = CollectionLog(run_id, end_date)
+    with log.step("MASTER_SYNC") as step:
+        step["records_count"] = len(changes)
+    log.add("OHLCV", started, completed, records_count=rows, api_calls=calls, ...)
+    log.save(conn)
+
+소요 시간 추이 / 회귀 확인:
+
+    SELECT collection_date, data_type, completed_at - started_at AS took,
+           api_calls, throttle_wait_seconds, db_write_seconds
+    FROM data_collection_logs
+    WHERE data_type = 'OHLCV' AND run_id IS NOT NULL
+    ORDER BY collection_date DESC;
+
+테이블은 database/schema/init_schema_v2.sql (기존 DB: database/schema/alter_collection_tables.sql)
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import psycopg2.extras
+
+KST = ZoneInfo("Asia/Seoul")
+SOURCE = "INFOMAX"
+
+# 오류 요약 최대 길이 (실패 종목 목록 등)
+MAX_ERROR_CHARS = 2000
+
+COLUMNS = ("run_id", "data_type", "collection_date", "source", "status", "records_count",
+           "error_message", "started_at", "completed_at", "api_calls", "api_bytes",
+           "throttle_wait_seconds", "db_write_seconds")
+
+INSERT_SQL = f"INSERT INTO data_collection_logs ({', '.join(COLUMNS)}) VALUES %s"
+
+
+def now_kst() -> datetime:
+    """TIMESTAMP(시간대 없음) 컬럼용 KST 현재 시각"""
+    return datetime.now(KST).replace(tzinfo=None)
+
+
+def _naive(ts: Optional[datetime]) -> Optional[datetime]:
+    if ts is not None and ts.tzinfo is not None:
+        return ts.astimezone(KST).replace(tzinfo=None)
+    return ts
+
+
+class CollectionLog:
+    """실행 1회의 단계별 로그 행 (save 전까지 메모리에 모음)"""
+
+    def __init__(self, run_id: Optional[int], collection_date: date, source: str = SOURCE):
+        self.run_id = run_id
+        self.collection_date = collection_date
+        self.source = source
+        self.rows: list[dict] = []
+
+    def add(self, data_type: str, started_at: datetime, completed_at: datetime,
+            status: str = "SUCCESS", records_count: int = None, error_message: str = None,
+            api_calls: int = None, api_bytes: int = None, throttle_wait: float = None,
+            db_write_seconds: float = None) -> dict:
+        """단계 1개 기록 — status: SUCCESS / PARTIAL / FAILED"""
+        row = {
+            "run_id":                self.run_id,
+            "data_type":             data_type,
+            "collection_date":       self.collection_date,
+            "source":                self.source,
+            "status":                status,
+            "records_count":         records_count,
+            "error_message":         error_message[:MAX_ERROR_CHARS] if error_message else None,
+            "started_at":            _naive(started_at),
+            "completed_at":          _naive(completed_at),
+            "api_calls":             api_calls,
+            "api_bytes":             api_bytes,
+            "throttle_wait_seconds": throttle_wait,
+            "db_write_seconds":      db_write_seconds,
+        }
+        self.rows.append(row)
+        return row
+
+    @contextmanager
+    def step(self, data_type: str):
+        """
+        블록 실행 시간을 기록하는 단계 — 블록에 넘긴 dict 에 add() 인자(records_count 등)를 채움
+        예외 시 FAILED + 오류 메시지로 기록하고 예외는 그대로 전파
+        """
+        fields = {}
+        started = now_kst()
+        try:
+            yield fields
+        except Exception as e:
+            self.add(data_type, started, now_kst(), **{**fields, "status": "FAILED",
+                                                       "error_message": f"{type(e).__name__}: {e}"})
+            raise
+        self.add(data_type, started, now_kst(), **fields)
+
+    def save(self, conn) -> int:
+        """모은 행을 한 번에 INSERT → 저장 행 수, 저장한 행은 비움"""
+        if not self.rows:
+            return 0
+        with conn.cursor() as cur:
+            psycopg2.extras.execute_values(cur, INSERT_SQL, [tuple(r[c] for c in COLUMNS) for r in self.rows])
+        conn.commit()
+        saved, self.rows = len(self.rows), []
+        return saved
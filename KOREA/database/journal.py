@@ -0,0 +1,86 @@
+"""
+daily_update 실행 journal (중단 후 이어받기)
+
+collection_runs      — 실행 1회 (업데이트 기간, 상태 RUNNING / PARTIAL / SUCCESS / FAILED)
+collection_run_units — 그 실행에서 커밋까지 끝난 (endpoint, 종목, 기간 창)
+
+journal 행은 DbWriter 에 after_data=True 로 넣어, 해당 데이터 행이 커밋된 뒤에만 기록됨
+→ 프로세스가 어느 시점에 죽어도 journal 에 있는 단위는 DB에 저장돼 있음
+
+    journal = RunJournal.resume(conn) or RunJournal.begin(conn, start, end)
+    done = journal.done_units()                 # {(endpoint, code, 창 시작일)}
+    writer.put("journal", UNITS_SQL, journal.entries("ohlcv", window, chunk_result), after_data=True)
+    journal.finish("SUCCESS")
+
+테이블은 database/schema/init_schema_v2.sql (기존 DB: database/schema/alter_collection_tables.sql)
+"""
+
+from datetime import date
+from typing import Optional
+
+UNITS_SQL = """
+INSERT INTO collection_run_units (run_id, endpoint, stock_code, start_date, end_date, rows_count)
+VALUES %s
+ON CONFLICT (run_id, endpoint, stock_code, start_date) DO NOTHING
+"""
+
+
+class RunJournal:
+    """collection_runs 한 행 + 그 실행의 완료 단위"""
+
+    def __init__(self, conn, run_id: int, start: date, end: date):
+        self.conn = conn
+        self.run_id = run_id
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def begin(cls, conn, start: date, end: date) -> "RunJournal":
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO collection_runs (start_date, end_date, status)
+                VALUES (%s, %s, 'RUNNING') RETURNING id
+            """, (start, end))
+            run_id = cur.fetchone()[0]
+        conn.commit()
+        return cls(conn, run_id, start, end)
+
+    @classmethod
+    def resume(cls, conn, target_date: date = None) -> Optional["RunJournal"]:
+        """
+        가장 최근 실행이 끝나지 않았으면(RUNNING / PARTIAL / FAILED) 그 실행을 반환, 아니면 None
+        target_date 를 주면 그 날짜 하루치 실행 중에서만 찾음
+        """
+        where, params = "", ()
+        if target_date:
+            where, params = "WHERE start_date = %s AND end_date = %s", (target_date, target_date)
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT id, start_date, end_date, status FROM collection_runs
+                {where} ORDER BY id DESC LIMIT 1
+            """, params)
+            row = cur.fetchone()
+        if not row or row[3] == "SUCCESS":
+            return None
+        return cls(conn, row[0], row[1], row[2])
+
+    def done_units(self) -> set[tuple[str, str, date]]:
+        """이 실행에서 저장이 끝난 {(endpoint, code, 창 시작일)}"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT endpoint, stock_code, start_date FROM collection_run_units WHERE run_id = %s
+            """, (self.run_id,))
+            return set(cur.fetchall())
+
+    def entries(self, endpoint: str, window: tuple[date, date], chunk_result: list) -> list[tuple]:
+        """수집 결과 묶음 → UNITS_SQL 행 (데이터를 받은 종목만 — 실패 종목은 이어받기 때 다시 수집)"""
+        start, end = window
+        return [(self.run_id, endpoint, code, start, end, len(rows))
+                for code, _, rows in chunk_result if rows]
+
+    def finish(self, status: str):
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE collection_runs SET status = %s, finished_at = NOW() WHERE id = %s
+            """, (status, self.run_id))
+        self.conn.commit()
@@ -0,0 +1,112 @@
+"""
+종목별 최근 종가 캐시 (latest_close) + 기준일 직전 종가 조회
+
+ohlcv_daily 전체에 DISTINCT ON (stock_code) ... WHERE time < D 를 돌리면 수년치 chunk 를 모두 훑음
+→ 종목마다 최근 2개 거래일 종가만 따로 유지하고 기준일 직전 종가는 이 작은 테이블에서 답함
+
+    refresh_latest_close(conn, codes)        # ohlcv 저장 후 해당 종목만 갱신 (종목당 인덱스 LIMIT 2)
+    prev = prev_close_as_of(conn, date(2026, 2, 20))   # {code: 2/20 직전 종가} (활성 종목)
+
+- 최근 2개를 두므로 "오늘 재수집(D = 최신일)" / "다음 날 수집(D > 최신일)" 모두 캐시로 답함
+- 그보다 과거 D 이거나 캐시에 없는 종목만 ohlcv_daily 를 종목별 인덱스(LIMIT 1)로 조회
+"""
+
+from datetime import date
+from typing import Iterable
+
+DDL = """
+CREATE TABLE IF NOT EXISTS latest_close (
+    stock_code  VARCHAR(10) PRIMARY KEY,
+    time        DATE NOT NULL,          -- 최근 거래일
+    close_price INTEGER,
+    prev_time   DATE,                   -- 그 직전 거래일 (없으면 NULL)
+    prev_close  INTEGER,
+    updated_at  TIMESTAMP DEFAULT NOW()
+);
+"""
+
+# 종목별 최근 2개 (time, close_price) → 캐시 행 (idx_ohlcv_stock 인덱스로 종목당 2행만 읽음)
+REFRESH_SQL = """
+INSERT INTO latest_close (stock_code, time, close_price, prev_time, prev_close, updated_at)
+SELECT c.stock_code, r.times[1], r.closes[1], r.times[2], r.closes[2], NOW()
+FROM unnest(%s::varchar[]) AS c(stock_code)
+CROSS JOIN LATERAL (
+    SELECT array_agg(t.time ORDER BY t.time DESC)        AS times,
+           array_agg(t.close_price ORDER BY t.time DESC) AS closes
+    FROM (SELECT o.time, o.close_price FROM ohlcv_daily o
+          WHERE o.stock_code = c.stock_code
+          ORDER BY o.time DESC LIMIT 2) t
+) r
+WHERE r.times IS NOT NULL
+ON CONFLICT (stock_code) DO UPDATE SET
+    time        = EXCLUDED.time,
+    close_price = EXCLUDED.close_price,
+    prev_time   = EXCLUDED.prev_time,
+    prev_close  = EXCLUDED.prev_close,
+    updated_at  = EXCLUDED.updated_at
+WHERE (latest_close.time, latest_close.close_price, latest_close.prev_time, latest_close.prev_close)
+   IS DISTINCT FROM
+      (EXCLUDED.time, EXCLUDED.close_price, EXCLUDED.prev_time, EXCLUDED.prev_close)
+"""
+
+# 기준일 직전 종가 — miss: 캐시로 판단 불가 (캐시 없음 / 두 거래일 모두 기준일 이후)
+AS_OF_SQL = """
+SELECT c.stock_code,
+       CASE WHEN l.time < %(as_of)s      THEN l.close_price
+            WHEN l.prev_time < %(as_of)s THEN l.prev_close END AS close_price,
+       l.stock_code IS NULL OR COALESCE(l.prev_time >= %(as_of)s, FALSE) AS miss
+FROM {codes} AS c(stock_code)
+LEFT JOIN latest_close l ON l.stock_code = c.stock_code
+"""
+
+ACTIVE_CODES = "(SELECT stock_code FROM stocks WHERE is_active = TRUE)"
+
+FALLBACK_SQL = """
+SELECT c.stock_code, o.close_price
+FROM unnest(%s::varchar[]) AS c(stock_code)
+CROSS JOIN LATERAL (
+    SELECT close_price FROM ohlcv_daily
+    WHERE stock_code = c.stock_code AND time < %s
+    ORDER BY time DESC LIMIT 1
+) o
+"""
+
+
+def ensure_table(conn):
+    with conn.cursor() as cur:
+        cur.execute(DDL)
+    conn.commit()
+
+
+def refresh_latest_close(conn, codes: Iterable[str]) -> int:
+    """codes 종목의 캐시를 ohlcv_daily 최근 2개 거래일로 다시 맞춤 → 바뀐 종목 수"""
+    codes = sorted(set(codes))
+    if not codes:
+        return 0
+    ensure_table(conn)
+    with conn.cursor() as cur:
+        cur.execute(REFRESH_SQL, (codes,))
+        changed = cur.rowcount
+    conn.commit()
+    return changed
+
+
+def prev_close_as_of(conn, as_of: date, codes: Iterable[str] = None) -> dict[str, float]:
+    """
+    as_of 직전 거래일 종가 {code: close} (codes 미지정 시 활성 종목 전체)
+    as_of 이전 데이터가 없는 종목은 결과에 없음
+    """
+    ensure_table(conn)
+    code_list = None if codes is None else sorted(set(codes))
+    source = ACTIVE_CODES if code_list is None else "unnest(%(codes)s::varchar[])"
+    with conn.cursor() as cur:
+        cur.execute(AS_OF_SQL.format(codes=source), {"as_of": as_of, "codes": code_list})
+        rows = cur.fetchall()
+
+    result = {code: close for code, close, miss in rows if not miss and close is not None}
+    misses = [code for code, _, miss in rows if miss]
+    if misses:
+        with conn.cursor() as cur:
+            cur.execute(FALLBACK_SQL, (misses, as_of))
+            result.update((code, close) for code, close in cur.fetchall() if close is not None)
+    return result
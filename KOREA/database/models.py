@@ -6,7 +6,7 @@ SQLAlchemy ORM 모델 정의
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Date, Boolean, TIMESTAMP, BigInteger, Numeric, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Date, Boolean, TIMESTAMP, BigInteger, Numeric, Float, Text, ForeignKey
 from sqlalchemy.orm import declarative_base, relationship
 
 # Base 클래스 생성 (모든 모델의 부모 클래스)
@@ -679,6 +679,36 @@ class DataCollectionLogs(Base):
         comment="생성일시"
     )
 
+    run_id = Column(
+        Integer,
+        nullable=True,
+        comment="daily_update 실행 ID (collection_runs.id)"
+    )
+
+    api_calls = Column(
+        Integer,
+        nullable=True,
+        comment="API 호출 수"
+    )
+
+    api_bytes = Column(
+        BigInteger,
+        nullable=True,
+        comment="API 응답 바이트"
+    )
+
+    throttle_wait_seconds = Column(
+        Float,
+        nullable=True,
+        comment="rate limit 대기 합계(초)"
+    )
+
+    db_write_seconds = Column(
+        Float,
+        nullable=True,
+        comment="DB 쓰기 시간(초)"
+    )
+
     def __repr__(self):
         return f"<DataCollectionLogs({self.data_type}, {self.collection_date}, {self.status}, {self.records_count}건)>"
 
@@ -0,0 +1,35 @@
+-- 기존 DB 마이그레이션: daily_update 실행 journal / 단계별 수집 로그 지표 컬럼
+-- 2026-10-17
+-- init_schema_v2.sql 로 새로 만든 DB는 실행 불필요 (같은 정의 포함, 여러 번 실행해도 안전)
+
+-- 1. 실행 journal (--resume 이어받기, database/journal.py)
+CREATE TABLE IF NOT EXISTS collection_runs (
+    id SERIAL PRIMARY KEY,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,  -- RUNNING, PARTIAL, SUCCESS, FAILED
+    started_at TIMESTAMP DEFAULT NOW(),
+    finished_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS collection_run_units (
+    run_id INTEGER NOT NULL REFERENCES collection_runs(id) ON DELETE CASCADE,
+    endpoint VARCHAR(20) NOT NULL,  -- ohlcv, investor
+    stock_code VARCHAR(10) NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    rows_count INTEGER NOT NULL DEFAULT 0,
+    committed_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (run_id, endpoint, stock_code, start_date)
+);
+
+-- 2. 단계별 수집 로그 실행 단위 지표 (database/collection_log.py)
+ALTER TABLE data_collection_logs
+    ADD COLUMN IF NOT EXISTS run_id                INTEGER,
+    ADD COLUMN IF NOT EXISTS api_calls             INTEGER,
+    ADD COLUMN IF NOT EXISTS api_bytes             BIGINT,
+    ADD COLUMN IF NOT EXISTS throttle_wait_seconds REAL,
+    ADD COLUMN IF NOT EXISTS db_write_seconds      REAL;
+
+CREATE INDEX IF NOT EXISTS idx_collection_logs_type_date
+    ON data_collection_logs(data_type, collection_date DESC);
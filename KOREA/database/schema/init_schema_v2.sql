@@ -114,6 +114,16 @@ SELECT create_hypertable('ohlcv_daily', 'time',
 
 CREATE INDEX IF NOT EXISTS idx_ohlcv_stock ON ohlcv_daily(stock_code, time DESC);
 
+-- 종목별 최근 2개 거래일 종가 캐시 (database/latest_close.py — 수집 후 갱신, 기준일 직전 종가 조회)
+CREATE TABLE IF NOT EXISTS latest_close (
+    stock_code VARCHAR(10) PRIMARY KEY,
+    time DATE NOT NULL,
+    close_price INTEGER,
+    prev_time DATE,
+    prev_close INTEGER,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
 -- 투자자별 수급
 CREATE TABLE IF NOT EXISTS investor_trading (
     time DATE NOT NULL,
@@ -139,10 +149,11 @@ CREATE INDEX IF NOT EXISTS idx_investor_trading_stock ON investor_trading(stock_
 -- 모니터링 테이블
 -- ==========================================
 
--- 데이터 수집 로그
+-- 데이터 수집 로그 (daily_update 단계별 1행, database/collection_log.py)
+-- 기존 DB (run_id ~ db_write_seconds 컬럼 추가): database/schema/alter_collection_tables.sql
 CREATE TABLE IF NOT EXISTS data_collection_logs (
     id SERIAL PRIMARY KEY,
-    data_type VARCHAR(50) NOT NULL,
+    data_type VARCHAR(50) NOT NULL,  -- MASTER_SYNC, OHLCV, MARKET_CAP, INVESTOR, ANOMALY, QUALITY_CHECK
     collection_date DATE NOT NULL,
     source VARCHAR(50),
     status VARCHAR(20) NOT NULL,  -- SUCCESS, FAILED, PARTIAL
@@ -150,10 +161,45 @@ CREATE TABLE IF NOT EXISTS data_collection_logs (
     error_message TEXT,
     started_at TIMESTAMP,
     completed_at TIMESTAMP,
-    created_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP DEFAULT NOW(),
+    run_id INTEGER,                -- collection_runs.id
+    api_calls INTEGER,
+    api_bytes BIGINT,
+    throttle_wait_seconds REAL,    -- rate limit 대기 합계
+    db_write_seconds REAL
 );
 
 CREATE INDEX IF NOT EXISTS idx_collection_logs_date ON data_collection_logs(collection_date DESC);
+CREATE INDEX IF NOT EXISTS idx_collection_logs_type_date ON data_collection_logs(data_type, collection_date DESC);
+
+-- 증분 동기화 기준일 (database/stock_master.py — 상장폐지 목록 조회 시작점)
+CREATE TABLE IF NOT EXISTS sync_watermarks (
+    name VARCHAR(50) PRIMARY KEY,
+    value DATE NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- daily_update 실행 journal (--resume 이어받기, database/journal.py)
+-- 기존 DB: database/schema/alter_collection_tables.sql
+CREATE TABLE IF NOT EXISTS collection_runs (
+    id SERIAL PRIMARY KEY,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,  -- RUNNING, PARTIAL, SUCCESS, FAILED
+    started_at TIMESTAMP DEFAULT NOW(),
+    finished_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS collection_run_units (
+    run_id INTEGER NOT NULL REFERENCES collection_runs(id) ON DELETE CASCADE,
+    endpoint VARCHAR(20) NOT NULL,  -- ohlcv, investor
+    stock_code VARCHAR(10) NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    rows_count INTEGER NOT NULL DEFAULT 0,
+    committed_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (run_id, endpoint, stock_code, start_date)
+);
 
 -- 데이터 품질 체크
 CREATE TABLE IF NOT EXISTS data_quality_checks (
@@ -0,0 +1,170 @@
+"""
+종목 마스터 동기화 (API 종목 목록 ↔ stocks 집합 비교, 한 트랜잭션)
+
+API 상장 종목 / 상장폐지 목록을 임시 테이블에 올린 뒤 SQL 몇 개로 차이를 한 번에 반영
+(종목마다 INSERT·UPDATE + commit 하지 않음)
+
+    신규 상장   stocks 에 없는 코드 INSERT
+    정보 변경   종목명 / 시장 / ISIN 이 달라진 종목 UPDATE (renamed / market_changed / isin_changed)
+    상장폐지    활성 종목 중 폐지 목록에 있는 코드 is_active=FALSE
+
+상장폐지 조회 기간은 high-water mark(sync_watermarks)부터 — 매일 최초 상장일부터 다시 조회하지 않음
+(늦게 올라오는 폐지 공시를 위해 STOCK_MASTER_EXPIRED_OVERLAP_DAYS 만큼 겹쳐 조회)
+
+    start = expired_window_start(conn)
+    result = sync_master(conn, client.get_stock_codes(), client.get_expired_codes(start), today)
+"""
+
+from datetime import date, timedelta
+from typing import Optional
+
+import psycopg2.extras
+
+WATERMARK = "stock_expired"
+
+DDL = """
+CREATE TABLE IF NOT EXISTS sync_watermarks (
+    name       VARCHAR(50) PRIMARY KEY,
+    value      DATE NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+"""
+
+STAGE_SQL = """
+CREATE TEMP TABLE _api_stocks (
+    stock_code VARCHAR(10) PRIMARY KEY, stock_name VARCHAR(100), market VARCHAR(10),
+    standard_code VARCHAR(12), listing_date DATE
+) ON COMMIT DROP;
+CREATE TEMP TABLE _api_expired (
+    stock_code VARCHAR(10) PRIMARY KEY, delisting_date DATE
+) ON COMMIT DROP;
+"""
+
+INSERT_NEW_SQL = """
+INSERT INTO stocks (stock_code, stock_name, market, standard_code, listing_date, is_active)
+SELECT a.stock_code, a.stock_name, a.market, a.standard_code, a.listing_date, TRUE
+FROM _api_stocks a
+WHERE NOT EXISTS (SELECT 1 FROM stocks s WHERE s.stock_code = a.stock_code)
+ORDER BY a.stock_code
+ON CONFLICT DO NOTHING
+RETURNING stock_code
+"""
+
+# 빈 값(API 누락)은 기존 값 유지
+UPDATE_CHANGED_SQL = """
+WITH diff AS (
+    SELECT s.stock_code,
+           s.stock_name    IS DISTINCT FROM n.stock_name    AS renamed,
+           s.market        IS DISTINCT FROM n.market        AS market_changed,
+           s.standard_code IS DISTINCT FROM n.standard_code AS isin_changed,
+           n.stock_name, n.market, n.standard_code
+    FROM stocks s
+    JOIN (SELECT stock_code,
+                 NULLIF(stock_name, '')    AS stock_name,
+                 NULLIF(market, '')        AS market,
+                 NULLIF(standard_code, '') AS standard_code
+          FROM _api_stocks) a USING (stock_code)
+    CROSS JOIN LATERAL (SELECT COALESCE(a.stock_name, s.stock_name) AS stock_name,
+                               COALESCE(a.market, s.market)         AS market,
+                               -- 다른 종목이 쓰는 ISIN 이면 기존 값 유지 (UNIQUE 위반으로 전체 롤백 방지)
+                               CASE WHEN a.standard_code IS NULL OR EXISTS (
+                                        SELECT 1 FROM stocks o
+                                        WHERE o.standard_code = a.standard_code AND o.stock_code <> s.stock_code)
+                                    THEN s.standard_code ELSE a.standard_code END AS standard_code) n
+    WHERE (s.stock_name, s.market, s.standard_code)
+          IS DISTINCT FROM (n.stock_name, n.market, n.standard_code)
+), updated AS (
+    UPDATE stocks s
+    SET stock_name    = d.stock_name,
+        market        = d.market,
+        standard_code = d.standard_code,
+        updated_at    = NOW()
+    FROM diff d
+    WHERE s.stock_code = d.stock_code
+    RETURNING s.stock_code
+)
+SELECT stock_code, renamed, market_changed, isin_changed FROM diff ORDER BY stock_code
+"""
+
+DELIST_SQL = """
+UPDATE stocks s
+SET is_active      = FALSE,
+    delisting_date = e.delisting_date,
+    updated_at     = NOW()
+FROM _api_expired e
+WHERE s.stock_code = e.stock_code AND s.is_active = TRUE
+RETURNING s.stock_code
+"""
+
+WATERMARK_SQL = """
+INSERT INTO sync_watermarks (name, value, updated_at) VALUES (%s, %s, NOW())
+ON CONFLICT (name) DO UPDATE SET value = GREATEST(sync_watermarks.value, EXCLUDED.value),
+                                 updated_at = NOW()
+"""
+
+
+def get_watermark(conn, name: str = WATERMARK) -> Optional[date]:
+    with conn.cursor() as cur:
+        cur.execute(DDL)
+        cur.execute("SELECT value FROM sync_watermarks WHERE name = %s", (name,))
+        row = cur.fetchone()
+    conn.commit()
+    return row[0] if row else None
+
+
+def expired_window_start(conn, overlap_days: int = 7) -> date:
+    """
+    상장폐지 조회 시작일: 지난 동기화일 - overlap_days
+    처음이면 활성 종목 중 가장 오래된 상장일 (API 기본값 today-365 보다 넓게 → 누락 방지)
+    """
+    mark = get_watermark(conn)
+    if mark:
+        return mark - timedelta(days=overlap_days)
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT MIN(listing_date) FROM stocks
+            WHERE is_active = TRUE AND listing_date IS NOT NULL
+        """)
+        oldest_listing = cur.fetchone()[0]
+    return oldest_listing or date(2000, 1, 1)
+
+
+def sync_master(conn, api_stocks: Optional[list[dict]], expired: Optional[list[dict]],
+                today: date) -> dict:
+    """
+    api_stocks: get_stock_codes() 결과 (None = 조회 실패 → 신규/변경 건너뜀)
+    expired:    get_expired_codes() 결과 (None = 조회 실패 → 폐지 처리·high-water mark 건너뜀)
+
+    Returns: {"new_listed", "delisted", "renamed", "market_changed", "isin_changed"} (종목 코드 목록)
+    실패 시 전체 롤백 후 예외 전파
+    """
+    result = {"new_listed": [], "delisted": [], "renamed": [], "market_changed": [], "isin_changed": []}
+    try:
+        with conn.cursor() as cur:
+            cur.execute(STAGE_SQL)
+            if api_stocks is not None:
+                rows = {s["code"]: (s["code"], s["name"], s["market"], s["standard_code"], s["listing_date"])
+                        for s in api_stocks if s.get("code")}
+                psycopg2.extras.execute_values(
+                    cur, "INSERT INTO _api_stocks VALUES %s", list(rows.values()), page_size=1000)
+                cur.execute(INSERT_NEW_SQL)
+                result["new_listed"] = [r[0] for r in cur.fetchall()]
+                cur.execute(UPDATE_CHANGED_SQL)
+                for code, renamed, market_changed, isin_changed in cur.fetchall():
+                    for key, hit in (("renamed", renamed), ("market_changed", market_changed),
+                                     ("isin_changed", isin_changed)):
+                        if hit:
+                            result[key].append(code)
+            if expired is not None:
+                rows = {s["code"]: (s["code"], s["delisting_date"]) for s in expired if s.get("code")}
+                psycopg2.extras.execute_values(
+                    cur, "INSERT INTO _api_expired VALUES %s", list(rows.values()), page_size=1000)
+                cur.execute(DELIST_SQL)
+                result["delisted"] = sorted(r[0] for r in cur.fetchall())
+                cur.execute(DDL)
+                cur.execute(WATERMARK_SQL, (WATERMARK, today))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return result
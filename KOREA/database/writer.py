@@ -0,0 +1,248 @@
+"""
+DB 쓰기 전용 스레드 (생산자/소비자)
+
+수집 루프는 put()으로 행을 넘기고 바로 다음 묶음을 처리, writer 스레드가 자체 연결로 UPSERT·커밋
+- 큐가 가득 차면 put()이 대기 → 수집 쪽 감속 (DB가 느릴 때)
+- 큐가 비면 writer가 대기 (수집이 느릴 때), 쌓인 만큼은 같은 SQL끼리 합쳐 한 번에 씀
+- 한 번에 쓰는 행 수는 직전 쓰기 속도로 조정 (target_seconds 안에 끝나는 크기)
+
+    with DbWriter(get_conn, upsert_batch) as writer:
+        writer.put("ohlcv", OHLCV_SQL, rows)
+        ...
+    # 블록을 나오면 남은 행을 모두 쓰고 종료 (writer 오류는 여기서 다시 발생)
+    writer.stats()["tables"]["ohlcv"] → {"rows", "changed", "skipped"}
+"""
+
+import sys
+import time
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+
+_FLUSH = object()
+_CLOSE = object()
+
+
+class DbWriter:
+    """
+    connect:        새 DB 연결을 만드는 함수 (writer 스레드 전용 연결)
+    write:          write(conn, sql, rows) → (changed, total), 커밋 포함
+    max_queue:      큐에 쌓아 둘 수 있는 put 건수 (넘으면 put 대기)
+    min_batch / max_batch: 한 번에 쓰는 행 수 범위
+    target_seconds: 쓰기 1회 목표 시간 — 실측 속도 × target_seconds 로 다음 묶음 크기 결정
+    """
+
+    def __init__(self, connect: Callable, write: Callable,
+                 max_queue: int = 64, min_batch: int = 500, max_batch: int = 50_000,
+                 target_seconds: float = 1.0, clock=time.monotonic):
+        self._connect = connect
+        self._write = write
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self.min_batch = min_batch
+        self.max_batch = max(min_batch, max_batch)
+        self.target_seconds = target_seconds
+        self.batch_rows = min_batch
+        self._clock = clock
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._buffers: dict[str, tuple[str, list]] = {}    # key → (sql, 쌓인 행)
+        self._after_data: set[str] = set()
+
+        self._tables: dict[str, dict] = {}
+        self._key_seconds: dict[str, float] = {}            # key → 쓰기 시간 합계(초)
+        self._puts = 0
+        self._depth_sum = 0
+        self._max_depth = 0
+        self._producer_wait = 0.0
+        self._writer_idle = 0.0
+        self._write_seconds = 0.0
+        self._batches = 0
+
+    @classmethod
+    def from_settings(cls, connect: Callable, write: Callable) -> "DbWriter":
+        return cls(connect, write,
+                   max_queue=settings.DB_WRITER_QUEUE_SIZE,
+                   min_batch=settings.DB_WRITER_MIN_BATCH,
+                   max_batch=settings.DB_WRITER_MAX_BATCH,
+                   target_seconds=settings.DB_WRITER_TARGET_SECONDS)
+
+    # ── 생산자 쪽 (수집 루프) ──────────────────────────────────────────
+    def start(self) -> "DbWriter":
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def put(self, key: str, sql: str, rows: list[tuple], after_data: bool = False):
+        """
+        rows 를 key(결과 집계 이름) 로 쓰기 예약 — 큐가 가득 차면 자리가 날 때까지 대기
+        after_data=True: 앞서 put 한 데이터 행이 모두 커밋된 뒤에만 씀 (실행 journal 등)
+        """
+        self._raise_if_failed()
+        if not rows:
+            return
+        if after_data:
+            self._after_data.add(key)
+        self._enqueue((key, sql, rows))
+        with self._lock:
+            depth = self._queue.qsize()
+            self._puts += 1
+            self._depth_sum += depth
+            self._max_depth = max(self._max_depth, depth)
+
+    def flush(self):
+        """지금까지 put 한 행을 모두 쓸 때까지 대기"""
+        done = threading.Event()
+        self._enqueue((_FLUSH, done, None))
+        while not done.wait(0.5):
+            self._raise_if_failed()
+        self._raise_if_failed()
+
+    def __enter__(self) -> "DbWriter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return False
+        # 수집 쪽 예외가 이미 있으면 writer 오류로 덮어쓰지 않음 (넣어 둔 행은 쓰고 종료)
+        try:
+            self.close()
+        except RuntimeError:
+            pass
+        return False
+
+    def queue_depth(self) -> int:
+        """현재 큐에 대기 중인 묶음 수"""
+        return self._queue.qsize()
+
+    def close(self):
+        """남은 행을 모두 쓰고 스레드·연결 종료"""
+        if self._thread is None:
+            return
+        if self._thread.is_alive():
+            self._enqueue((_CLOSE, None, None))
+            self._thread.join()
+        self._thread = None
+        self._raise_if_failed()
+
+    def _enqueue(self, item):
+        started = self._clock()
+        while True:
+            try:
+                self._queue.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                self._raise_if_failed()     # writer가 죽었으면 영원히 기다리지 않음
+        with self._lock:
+            self._producer_wait += self._clock() - started
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise RuntimeError(f"DB writer 스레드 오류: {self._error}") from self._error
+
+    # ── 소비자 쪽 (writer 스레드) ──────────────────────────────────────
+    def _run(self):
+        conn = None
+        try:
+            conn = self._connect()
+            while True:
+                started = self._clock()
+                item = self._queue.get()
+                self._writer_idle += self._clock() - started
+                # 이미 쌓여 있는 항목은 기다리지 않고 모아서 묶음 크기를 키움
+                items = [item]
+                while item[0] not in (_FLUSH, _CLOSE):
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    items.append(item)
+
+                for key, sql, rows in items:
+                    if key is _FLUSH or key is _CLOSE:
+                        self._write_all(conn)
+                        if key is _FLUSH:
+                            sql.set()
+                        else:
+                            return
+                        continue
+                    self._buffer(conn, key, sql, rows)
+                # 큐가 비었으면 쌓인 행을 바로 씀 (수집이 느릴 때 지연 없이)
+                if self._queue.empty():
+                    self._write_all(conn)
+        except BaseException as e:
+            self._error = e
+            # 대기 중인 flush 가 깨어나도록 큐를 비움
+            while True:
+                try:
+                    key, sql, _ = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if key is _FLUSH:
+                    sql.set()
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _buffer(self, conn, key: str, sql: str, rows: list[tuple]):
+        _, buf = self._buffers.setdefault(key, (sql, []))
+        buf.extend(rows)
+        if key in self._after_data:
+            if len(buf) >= self.max_batch:
+                self._write_all(conn)
+        elif len(buf) >= self.batch_rows:
+            self._write_key(conn, key)
+
+    def _write_all(self, conn):
+        # after_data 키는 마지막 — 그 행보다 먼저 들어온 데이터 행은 이 시점에 모두 버퍼에 있음
+        for key in sorted(self._buffers, key=lambda k: k in self._after_data):
+            self._write_key(conn, key)
+
+    def _write_key(self, conn, key: str):
+        sql, rows = self._buffers.pop(key, (None, []))
+        if not rows:
+            return
+        started = self._clock()
+        changed, total = self._write(conn, sql, rows)
+        elapsed = self._clock() - started
+        with self._lock:
+            st = self._tables.setdefault(key, {"rows": 0, "changed": 0, "skipped": 0})
+            st["rows"]    += total
+            st["changed"] += changed
+            st["skipped"] += total - changed
+            self._key_seconds[key] = self._key_seconds.get(key, 0.0) + elapsed
+            self._write_seconds += elapsed
+            self._batches += 1
+        # 다음 묶음 크기 = 실측 처리 속도 × 목표 시간 (min~max)
+        if elapsed > 0:
+            rate = len(rows) / elapsed
+            self.batch_rows = int(min(self.max_batch, max(self.min_batch, rate * self.target_seconds)))
+
+    # ── 통계 ───────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """
+        {"tables": {key: {"rows", "changed", "skipped"}}, "key_seconds": {key: 쓰기 시간},
+         "batches", "batch_rows", "avg_queue_depth", "max_queue_depth",
+         "producer_wait", "writer_idle", "write_seconds"}
+        producer_wait: 큐가 가득 차 수집 쪽이 기다린 시간 (DB가 병목)
+        writer_idle:   큐가 비어 writer가 기다린 시간 (수집이 병목)
+        """
+        with self._lock:
+            return {
+                "tables":          {k: dict(v) for k, v in self._tables.items()},
+                "key_seconds":     dict(self._key_seconds),
+                "batches":         self._batches,
+                "batch_rows":      self.batch_rows,
+                "avg_queue_depth": self._depth_sum / self._puts if self._puts else 0.0,
+                "max_queue_depth": self._max_depth,
+                "producer_wait":   self._producer_wait,
+                "writer_idle":     self._writer_idle,
+                "write_seconds":   self._write_seconds,
+            }
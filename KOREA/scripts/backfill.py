@@ -0,0 +1,242 @@
+"""
+기간 백필 스크립트 (30일 창 분할 + 누락 종목만 + 이어받기)
+
+start~end 를 INFOMAX_HIST_WINDOW_DAYS(30일) 이하 창으로 나누고, 창마다 ohlcv_daily / investor_trading 에
+이미 거래일이 다 채워진 종목은 빼고 (종목 묶음, 창) 작업 단위를 만들어 BACKFILL_PLAN_DIR 에 저장
+작업 단위는 daily_update 와 같은 엔진(스레드/async)으로 공유 rate limiter 아래 병렬 수행되며,
+끝날 때마다 진행 로그에 기록 → 중단(Ctrl+C·오류·일일 사용량 한도) 후 같은 명령으로 이어서 수행
+
+사용법:
+    python scripts/backfill.py 20250101 20250630             # 계획 생성(또는 이어받기) 후 수행
+    python scripts/backfill.py 20250101 20250630 --plan-only # 계획만 생성·출력
+    python scripts/backfill.py 20250101 20250630 --replan    # 기존 계획 버리고 DB 기준으로 다시 계획
+    python scripts/backfill.py 20250101 20250630 --tables ohlcv --async
+    python scripts/backfill.py 20250101 20250630 --reopen 20250128,20250129  # 잘못 기록된 휴장일 삭제 후 재계획
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+from collectors.infomax import InfomaxClient, HIST_BATCH_SIZE, INVESTOR_BATCH_SIZE, chunked
+from collectors.backfill import BackfillPlan, ClosedDays, split_windows
+from collectors.columnar import (
+    decode_hist, decode_investor, to_records, OHLCV_COLUMNS, MKTCAP_COLUMNS, INVESTOR_COLUMNS,
+)
+from collectors.quota import QuotaPlanner, format_bytes
+from database.latest_close import refresh_latest_close
+from validators.completeness import missing_matrix, present_days
+from scripts.daily_update import (
+    get_conn, iter_fetch_units, upsert_batch, _fetch_hist_batch, _fetch_investor_batch,
+    _engine_label, OHLCV_SQL, MKTCAP_SQL, INVESTOR_SQL,
+)
+
+KST = ZoneInfo("Asia/Seoul")
+
+# table → (DB 테이블, endpoint, 수집 함수, 묶음 크기)
+TABLES = {
+    "ohlcv":    ("ohlcv_daily",      "/api/stock/hist",     _fetch_hist_batch,     HIST_BATCH_SIZE),
+    "investor": ("investor_trading", "/api/stock/investor", _fetch_investor_batch, INVESTOR_BATCH_SIZE),
+}
+
+
+# ── 계획 ──────────────────────────────────────────────────────────────────
+def build_units(conn, start: date, end: date, tables: list[str],
+                closed: ClosedDays) -> list[dict]:
+    """
+    (table, 창, 종목 묶음) 작업 단위 목록
+    있어야 할 거래일 = 창 안의 평일 - 학습된 휴장일 (휴장일인지 모르는 평일은 전 종목 수집 대상)
+    종목별로는 상장일 이후 ~ 폐지일 이전 거래일만 (누락 행렬 — 기간 안에 폐지된 종목 포함)
+    """
+    units = []
+    for w_start, w_end in split_windows(start, end):
+        days = closed.trading_days(w_start, w_end)
+        for table in tables:
+            batch_size = TABLES[table][3]
+            missing = missing_matrix(conn, table, w_start, w_end, days=days).missing_stocks()
+            for chunk in chunked(missing, batch_size):
+                units.append({"table": table, "start": w_start.isoformat(),
+                              "end": w_end.isoformat(), "stocks": chunk})
+    return units
+
+
+def learn_closed_days(conn, closed: ClosedDays, w_start: date, w_end: date,
+                      today: date = None) -> list[date]:
+    """
+    창 수집이 끝난 뒤에도 ohlcv_daily 에 어떤 종목 데이터도 없는 평일 → 휴장일로 기록
+    종료일이 BACKFILL_CLOSED_MIN_AGE_DAYS 일 넘게 지났고 같은 창의 다른 날에 데이터가 있을 때만
+    (API 장애·지연 데이터로 비어 있는 거래일을 휴장일로 굳히지 않음)
+    이미 휴장일로 기록됐는데 데이터가 있는 날짜는 기록에서 삭제
+    """
+    today = today or datetime.now(KST).date()
+    days = set(present_days(conn, "ohlcv", w_start, w_end))
+    closed.remove(d for d in list(closed.days) if d in days)
+    if not days or (today - w_end).days <= settings.BACKFILL_CLOSED_MIN_AGE_DAYS:
+        return []
+    new = [d for d in closed.trading_days(w_start, w_end) if d not in days]
+    closed.add(new)
+    return new
+
+
+def quota_limit(units: list[dict], client: InfomaxClient, closed: ClosedDays) -> int:
+    """오늘 남은 사용량 안에서 수행 가능한 앞쪽 단위 수 (나머지는 다음 실행으로 이월)"""
+    planner = QuotaPlanner(client.usage)
+    budget = client.usage.remaining_bytes()
+    for i, unit in enumerate(units):
+        _, endpoint, _, batch_size = TABLES[unit["table"]]
+        n_days = len(closed.trading_days(date.fromisoformat(unit["start"]),
+                                         date.fromisoformat(unit["end"])))
+        n_requests = -(-len(unit["stocks"]) // batch_size)
+        budget -= planner.estimate(endpoint, len(unit["stocks"]), max(1, n_days), n_requests)
+        if budget < 0:
+            return i
+    return len(units)
+
+
+# ── 저장 ──────────────────────────────────────────────────────────────────
+def store_unit(conn, table: str, chunk_result: list) -> dict:
+    """수집 결과 한 단위 → UPSERT, {"rows", "changed", "empty"} 반환"""
+    groups = [rows for _, _, rows in chunk_result]
+    stats = {"rows": 0, "changed": 0,
+             "empty": sum(1 for _, _, rows in chunk_result if not rows)}
+    if table == "ohlcv":
+        frame = decode_hist(groups)
+        ch, tot = upsert_batch(conn, OHLCV_SQL, to_records(frame, OHLCV_COLUMNS))
+        upsert_batch(conn, MKTCAP_SQL,
+                     to_records(frame[(frame["market_cap"] > 0).fillna(False)], MKTCAP_COLUMNS))
+    else:
+        frame = decode_investor(groups)
+        ch, tot = upsert_batch(conn, INVESTOR_SQL, to_records(frame, INVESTOR_COLUMNS))
+    stats["rows"], stats["changed"] = tot, ch
+    return stats
+
+
+# ── 실행 ──────────────────────────────────────────────────────────────────
+def run_backfill(start: date, end: date, tables: list[str], engine: str = None,
+                 replan: bool = False, plan_only: bool = False, reopen: list[date] = ()) -> dict:
+    """reopen: 휴장일 기록에서 지울 날짜 (지우면 그 날짜를 다시 수집하도록 재계획)"""
+    engine = engine or settings.INFOMAX_ENGINE
+    conn = get_conn()
+    client = InfomaxClient()
+    closed = ClosedDays.from_settings()
+    if reopen:
+        removed = closed.remove(reopen)
+        print(f"  휴장일 기록 삭제: {', '.join(d.isoformat() for d in removed) or '없음'}")
+        replan = replan or bool(removed)
+
+    path = BackfillPlan.default_path(start, end)
+    plan = None if replan else BackfillPlan.load_or_none(path)
+    if plan and plan.pending():
+        print(f"  이어받기: {path.name} ({plan.stats()['done']}/{len(plan.units)} 단위 완료)")
+    else:
+        print("  계획 생성 중 (창별 기존 데이터 확인)...")
+        plan = BackfillPlan.create(path, start, end, build_units(conn, start, end, tables, closed))
+
+    pending = [u for u in plan.pending() if u["table"] in tables]
+    n_windows = len(split_windows(start, end))
+    print(f"  기간 {start} ~ {end} → {n_windows}개 창, 작업 단위 {len(plan.units)}개 "
+          f"(남음 {len(pending)}개) | 계획: {path}")
+    if plan_only or not pending:
+        conn.close()
+        return plan.stats()
+
+    allowed = quota_limit(pending, client, closed)
+    if allowed < len(pending):
+        print(f"  ⚠️  일일 사용량 한도: 오늘은 {allowed}/{len(pending)} 단위만 수행 "
+              f"(남음 {format_bytes(client.usage.remaining_bytes())}, 나머지는 다음 실행에서 이어받기)")
+        pending = pending[:allowed]
+
+    # table 별로 전 창의 단위를 한꺼번에 병렬 수행 (속도는 공유 rate limiter가 조절)
+    # ohlcv 창 하나의 단위가 모두 끝나면 그 창의 휴장일 학습
+    fetchers = {t: TABLES[t][2] for t in tables}
+    totals = {"rows": 0, "changed": 0, "empty": 0, "units": 0}
+    touched = set()     # ohlcv 를 저장한 종목 → 끝날 때 latest_close 갱신
+    started = time.perf_counter()
+    print(f"  수집 시작 ({_engine_label(engine)})")
+    try:
+        for table in tables:
+            todo = [u for u in pending if u["table"] == table]
+            work = [(u["stocks"], date.fromisoformat(u["start"]), date.fromisoformat(u["end"]))
+                    for u in todo]
+            for i, chunk_result in iter_fetch_units(engine, fetchers[table], client, work):
+                unit = todo[i]
+                try:
+                    st = store_unit(conn, table, chunk_result)
+                except Exception as e:
+                    conn.rollback()
+                    plan.mark(unit["id"], "failed", str(e))
+                    print(f"  ❌ 단위 {unit['id']} 저장 실패: {e}")
+                    continue
+                if chunk_result and not st["rows"]:
+                    # 전 종목 빈 응답 → 장애·서킷 브레이커·지연 데이터일 수 있음, 완료로 치지 않음
+                    # (완료 처리하면 그 창의 빈 거래일이 휴장일로 학습됨) → 이어받기 때 다시 수행
+                    plan.mark(unit["id"], "failed", "전 종목 데이터 없음")
+                    totals["empty"] += st["empty"]
+                    continue
+                plan.mark(unit["id"], "done")
+                if table == "ohlcv":
+                    touched.update(code for code, _, rows in chunk_result if rows)
+                for k in ("rows", "changed", "empty"):
+                    totals[k] += st[k]
+                totals["units"] += 1
+                if table == "ohlcv" and plan.window_done("ohlcv", unit["start"]):
+                    learned = learn_closed_days(conn, closed, date.fromisoformat(unit["start"]),
+                                                date.fromisoformat(unit["end"]))
+                    if learned:
+                        print(f"  휴장일 기록: {', '.join(d.isoformat() for d in learned)}")
+                if totals["units"] % 20 == 0:
+                    print(f"  [{totals['units']}/{len(pending)}] {totals['rows']:,}행 저장 "
+                          f"({time.perf_counter() - started:.0f}초)")
+    except KeyboardInterrupt:
+        print("\n  중단됨 — 같은 명령으로 다시 실행하면 남은 단위부터 이어서 수행")
+    finally:
+        client.usage.flush()
+        if touched:
+            refresh_latest_close(conn, touched)
+        conn.close()
+
+    stats = plan.stats()
+    print(f"\n  ✅ {totals['units']}개 단위 / {totals['rows']:,}행 저장 (변경 {totals['changed']:,}) "
+          f"| 데이터 없음 {totals['empty']:,}개 종목·창 | {time.perf_counter() - started:.0f}초")
+    print(f"  계획 진행: 완료 {stats['done']} / 실패 {stats['failed']} / 남음 {stats['pending']}")
+    return stats
+
+
+def _parse_date(val: str) -> date:
+    return datetime.strptime(val, "%Y%m%d").date()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기간 백필 (30일 창 분할, 누락 종목만, 이어받기)")
+    parser.add_argument("start", type=_parse_date, help="시작일 YYYYMMDD")
+    parser.add_argument("end", type=_parse_date, nargs="?",
+                        default=datetime.now(KST).date() - timedelta(days=1),
+                        help="종료일 YYYYMMDD (기본: 어제)")
+    parser.add_argument("--tables", default="ohlcv,investor", help="ohlcv,investor 중 선택")
+    parser.add_argument("--async", dest="engine", action="store_const", const="async",
+                        help="asyncio 엔진 (기본: INFOMAX_ENGINE)")
+    parser.add_argument("--replan", action="store_true", help="기존 계획을 버리고 다시 계획")
+    parser.add_argument("--plan-only", action="store_true", help="계획만 생성")
+    parser.add_argument("--reopen", default="",
+                        help="휴장일 기록에서 지울 날짜 YYYYMMDD[,YYYYMMDD...] (잘못 학습된 거래일)")
+    args = parser.parse_args()
+
+    tables = [t.strip() for t in args.tables.split(",") if t.strip()]
+    unknown = set(tables) - set(TABLES)
+    if unknown or args.start > args.end:
+        parser.error(f"잘못된 인자: tables={sorted(unknown)} 또는 start > end")
+
+    reopen = [_parse_date(d.strip()) for d in args.reopen.split(",") if d.strip()]
+    run_backfill(args.start, args.end, tables, engine=args.engine,
+                 replan=args.replan, plan_only=args.plan_only, reopen=reopen)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Infomax 수집 처리량 벤치마크 (로컬 mock 서버 사용, 실제 quota 미사용)
+
+collectors/mock_infomax.py 서버를 띄우고 InfomaxClient / AsyncInfomaxClient 를 그쪽으로 돌려
+daily_update 의 수집 단계(iter_fetch_scheduled: hist·investor 동시)를 그대로 실행합니다.
+--run-update 를 주면 DB 저장까지 포함한 run_update 전체를 실행합니다 (DB 필요).
+
+사용법:
+    python scripts/benchmark_infomax.py                              # 2500종목, 스레드 엔진
+    python scripts/benchmark_infomax.py --engine both --latency 0.1
+    python scripts/benchmark_infomax.py --server-rate 120 --throttle-rate 0.02   # 429 재시도 동작
+    python scripts/benchmark_infomax.py --fixtures data/fixtures/infomax --no-synthetic
+    python scripts/benchmark_infomax.py --run-update 20260220        # run_update 전체 (DB 필요)
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import settings
+import collectors.infomax as infomax
+import collectors.async_infomax as async_infomax
+from collectors.infomax import (
+    InfomaxClient, HIST_BATCH_SIZE, INVESTOR_BATCH_SIZE, INFO_PAGE_SIZE, chunked,
+)
+from collectors.async_infomax import AsyncInfomaxClient
+from collectors.cache import FixtureStore
+from collectors.mock_infomax import MockInfomaxServer, HIST, INVESTOR, INFO, KST
+from collectors.quota import UsageLedger, format_bytes
+from collectors.retry import RetryQueue
+from collectors.scheduler import WorkScheduler, WorkStream, apply_schedule
+from scripts.daily_update import (
+    iter_fetch_scheduled, run_update, _fetch_hist_batch, _fetch_investor_batch,
+    _fetch_snapshot_batch, _engine_label,
+)
+
+
+def point_clients_at(base_url: str, usage_dir: Path, rate_per_min: float):
+    """동기·비동기 클라이언트를 mock 서버로 전환 (사용량은 임시 폴더, 캐시·녹화 끔)"""
+    infomax.BASE_URL = async_infomax.BASE_URL = base_url
+    ledger = UsageLedger(usage_dir, daily_limit_bytes=10**15)
+    for cls in (InfomaxClient, AsyncInfomaxClient):
+        cls.usage = ledger
+        cls.cache = None
+        cls.recorder = None
+
+    limiter = InfomaxClient.rate_limiter
+    limiter.set_rate(rate_per_min)
+    if InfomaxClient.rate_controller:
+        InfomaxClient.rate_controller.max_rate = rate_per_min
+
+
+def reset_client_stats():
+    InfomaxClient.rate_limiter.reset_stats()
+    if InfomaxClient.rate_controller:
+        InfomaxClient.rate_controller.reset_stats()
+    InfomaxClient.usage.reset_run()
+    InfomaxClient.breaker.reset_stats()
+
+
+def bench_fetch(engine: str, stocks: list[tuple[str, str]], start: date, end: date) -> dict:
+    """수집 단계만 실행 (DB 미사용, 지연 재시도 포함) → {"elapsed", "stocks", "rows", "retry"}"""
+    client = InfomaxClient()
+    # run_update 와 같게 하루치면 /api/stock/info 스냅샷
+    if settings.INFOMAX_SNAPSHOT_ENABLED and start == end:
+        ohlcv = (INFO, _fetch_snapshot_batch, INFO_PAGE_SIZE)
+    else:
+        ohlcv = (HIST, _fetch_hist_batch, HIST_BATCH_SIZE)
+    endpoints = {"ohlcv": ohlcv, "investor": (INVESTOR, _fetch_investor_batch, INVESTOR_BATCH_SIZE)}
+    retry = {endpoint: RetryQueue.from_settings() for endpoint, _, _ in endpoints.values()}
+    streams = [WorkStream(name, fetch_fn, chunked(stocks, batch_size), [(start, end)], batch_size,
+                          retry[endpoint])
+               for name, (endpoint, fetch_fn, batch_size) in endpoints.items()]
+    apply_schedule(streams, settings.INFOMAX_SCHEDULE_PRIORITY, settings.INFOMAX_SCHEDULE_WEIGHTS)
+    rows = {endpoint: 0 for endpoint in retry}
+    started = time.perf_counter()
+    # run_update 와 같게 hist(info)·investor 를 한 스케줄러에서 섞어 수집
+    for name, _, chunk_result in iter_fetch_scheduled(engine, client, WorkScheduler(streams)):
+        rows[endpoints[name][0]] += sum(len(r) for _, _, r in chunk_result)
+    return {"elapsed": time.perf_counter() - started, "stocks": len(stocks), "rows": rows,
+            "retry": {endpoint: q.stats() for endpoint, q in retry.items()}}
+
+
+def print_result(engine: str, result: dict, server: MockInfomaxServer):
+    elapsed = result["elapsed"]
+    throttle = InfomaxClient.rate_limiter.stats()
+    print(f"\n── {_engine_label(engine)} ──")
+    print(f"  소요 시간 : {elapsed:.2f}초  ({result['stocks'] / elapsed:,.0f} 종목/초)")
+    for endpoint, st in sorted(server.stats().items()):
+        print(f"  {endpoint:<22} 요청 {st['requests']:>6,}회 ({st['requests'] / elapsed:,.1f}회/초)  "
+              f"행 {st['rows']:>9,}  429 한도 {st['limited']:,} / 주입 {st['injected']:,}")
+    run_bytes = sum(e["bytes"] for e in InfomaxClient.usage.run_usage().values())
+    print(f"  응답 크기 : {format_bytes(run_bytes)}")
+    print(f"  대기      : 합계 {throttle['total_wait']:.1f}초 / 최대 {throttle['max_wait']:.2f}초, "
+          f"종료 시 {throttle['rate_per_min']:.0f}회/분")
+    for endpoint, st in sorted(result.get("retry", {}).items()):
+        if st["deferred"]:
+            print(f"  재시도    : {endpoint} {st['deferred']:,}개 → {st['recovered']:,}개 복구 "
+                  f"({st['rounds']}라운드, 대기 {st['waited']:.0f}초)")
+    breaker = InfomaxClient.breaker.stats()
+    if breaker["trips"]:
+        print(f"  장애 정지 : {breaker['trips']}회 (합계 {breaker['paused_seconds']:.0f}초)")
+    if InfomaxClient.rate_controller:
+        adaptive = InfomaxClient.rate_controller.stats()
+        print(f"  속도 조절 : 429 {adaptive['throttled']}회 / timeout {adaptive['timeouts']}회, "
+              f"감속 {adaptive['decreases']}회 (최저 {adaptive['min_rate_seen']:.0f}회/분) / "
+              f"가속 {adaptive['increases']}회")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Infomax 수집 처리량 벤치마크 (mock 서버)")
+    parser.add_argument("--engine", choices=["thread", "async", "both"], default="thread")
+    parser.add_argument("--stocks", type=int, default=2500, help="합성 종목 수")
+    parser.add_argument("--days", type=int, default=1, help="수집 구간 (평일 수 아님, 달력 일수)")
+    parser.add_argument("--end", default="", help="구간 종료일 YYYYMMDD (기본: 어제)")
+    parser.add_argument("--latency", type=float, default=0.05, help="서버 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="서버 추가 지연 최대값(초)")
+    parser.add_argument("--server-rate", type=int, default=0, help="서버 분당 한도 (0 = 없음)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="서버 임의 429 확률")
+    parser.add_argument("--client-rate", type=float, default=0,
+                        help="클라이언트 분당 요청 수 (기본: 서버 한도 × 0.95, 한도 없으면 6000)")
+    parser.add_argument("--no-investor-batch", action="store_true")
+    parser.add_argument("--fixtures", default="", help="녹화 fixture 폴더")
+    parser.add_argument("--no-synthetic", action="store_true")
+    parser.add_argument("--run-update", metavar="YYYYMMDD", default="",
+                        help="수집 단계 대신 run_update 전체 실행 (DB 필요)")
+    args = parser.parse_args()
+
+    end = (datetime.strptime(args.end, "%Y%m%d").date() if args.end
+           else datetime.now(KST).date() - timedelta(days=1))
+    start = end - timedelta(days=max(1, args.days) - 1)
+    client_rate = args.client_rate or (args.server_rate * 0.95 if args.server_rate else 6000)
+
+    server = MockInfomaxServer(
+        latency=args.latency, jitter=args.jitter,
+        rate_per_min=args.server_rate, throttle_rate=args.throttle_rate,
+        batch_endpoints={HIST, INFO} if args.no_investor_batch else {HIST, INVESTOR, INFO},
+        fixtures=FixtureStore(args.fixtures) if args.fixtures else None,
+        synthetic=not args.no_synthetic, n_stocks=args.stocks,
+    )
+    engines = ["thread", "async"] if args.engine == "both" else [args.engine]
+
+    with server, tempfile.TemporaryDirectory() as usage_dir:
+        point_clients_at(server.base_url, Path(usage_dir), client_rate)
+        print(f"mock 서버 {server.base_url}  종목 {args.stocks:,}개  구간 {start} ~ {end}  "
+              f"클라이언트 {client_rate:.0f}회/분")
+
+        for engine in engines:
+            server.reset_stats()
+            reset_client_stats()
+            if args.run_update:
+                target = datetime.strptime(args.run_update, "%Y%m%d").date()
+                started = time.perf_counter()
+                result = run_update(target, engine=engine)
+                ohlcv = result["ohlcv"]
+                summary = {"elapsed": time.perf_counter() - started,
+                           "stocks": ohlcv["success"] + ohlcv["fail"]}
+            else:
+                stocks = [(code, f"모의종목{i:04d}") for i, code in enumerate(server.codes)]
+                summary = bench_fetch(engine, stocks, start, end)
+            print_result(engine, summary, server)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.settings import settings
+from validators.completeness import missing_matrix
 
 KST = ZoneInfo("Asia/Seoul")
 
@@ -143,6 +144,11 @@ def fetch_expected_counts(conn) -> dict:
     return {"ohlcv": total, "investor": kk}
 
 
+def _covered_pct(day_coverage: tuple[int, int]) -> float:
+    expected, missing = day_coverage
+    return (expected - missing) / expected * 100 if expected else 0
+
+
 # ── 출력 ──────────────────────────────────────────────────────────────────────
 def print_status(n_days: int = 10):
     conn = get_conn()
@@ -156,6 +162,11 @@ def print_status(n_days: int = 10):
     counts   = fetch_daily_counts(conn, oldest)
     stats    = fetch_db_stats(conn)
     expected = fetch_expected_counts(conn)
+    # 날짜별 (그날 상장돼 있던 종목 수, 누락 종목 수) — 누락 행렬
+    coverage = {
+        table: missing_matrix(conn, table, oldest, today, days=weekdays).coverage()
+        for table in ("ohlcv", "investor")
+    }
     conn.close()
 
     W = 72
@@ -241,9 +252,9 @@ def print_status(n_days: int = 10):
                 status = "⚠️  미수집"
                 row = f"  {str(d):<12} {dow:^3}  {'미수집':>6}  {'':>8}  {'':>6}  {'':>8}  {status}"
         else:
-            # OHLCV 비율
-            ohlcv_pct = ohlcv_cnt / exp_ohlcv * 100 if exp_ohlcv else 0
-            inv_pct   = inv_cnt / exp_investor * 100 if (inv_cnt and exp_investor) else 0
+            # 수집률 = 그날 상장돼 있던 종목 중 데이터가 있는 비율 (상장 전·폐지 후 종목 제외)
+            ohlcv_pct = _covered_pct(coverage["ohlcv"][d])
+            inv_pct   = _covered_pct(coverage["investor"][d]) if inv_cnt else 0
 
             ohlcv_str  = f"{ohlcv_cnt:,}"
             mktcap_str = f"{mktcap_cnt:,}" if mktcap_cnt else "─"
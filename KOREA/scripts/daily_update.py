@@ -6,17 +6,30 @@
 사용법:
     python scripts/daily_update.py           # 자동 날짜 감지
     python scripts/daily_update.py 20260220  # 특정 날짜 지정
+    python scripts/daily_update.py --async   # asyncio 엔진 (기본: 스레드 풀, INFOMAX_ENGINE)
+    python scripts/daily_update.py --resume  # 중단된 최근 실행을 이어서 (저장 완료 단위는 건너뜀)
+    python scripts/daily_update.py --repoll  # 누락 종목 재조회 (연휴 직후 늦게 올라오는 데이터)
+    python scripts/daily_update.py --resume --workers=4  # 대량 백필: 종목 샤드 4개를 프로세스 풀로 수집
+    python scripts/daily_update.py --workers=4 --no-throttle  # 녹화 재생(mock 서버) 시 rate limit 없이
 """
 
 import sys
 import time
+import asyncio
+import threading
 import traceback
+import multiprocessing
 from pathlib import Path
 from datetime import date, datetime, timedelta
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from queue import Empty
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional
 from zoneinfo import ZoneInfo
 
+import pandas as pd
 import psycopg2
 import psycopg2.extras
 
@@ -24,7 +37,25 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.settings import settings
-from collectors.infomax import InfomaxClient
+from collectors.infomax import (
+    InfomaxClient, HIST_BATCH_SIZE, INVESTOR_BATCH_SIZE, INFO_PAGE_SIZE, chunked,
+)
+from collectors.backfill import ClosedDays, split_windows
+from collectors.columnar import (
+    decode_hist, decode_investor, to_records, OHLCV_COLUMNS, MKTCAP_COLUMNS, INVESTOR_COLUMNS,
+)
+from collectors.quota import QuotaPlanner, business_days, format_bytes
+from collectors.rate_limiter import TokenBucket, SharedTokenBucket
+from collectors.retry import RetryQueue, poll_until
+from collectors.scheduler import WorkScheduler, WorkStream, apply_schedule
+from database.bulk import copy_upsert
+from database.collection_log import CollectionLog, now_kst
+from database.journal import RunJournal, UNITS_SQL
+from database.latest_close import prev_close_as_of, refresh_latest_close
+from database.stock_master import expired_window_start, sync_master
+from database.writer import DbWriter
+from validators.anomalies import TYPE_ORDER, AnomalyAccumulator, detect_anomalies
+from validators.completeness import missing_matrix, present_days
 from validators.quality_checks import run_quality_checks
 
 KST = ZoneInfo("Asia/Seoul")
@@ -32,14 +63,22 @@ REPORTS_DIR = project_root / "reports"
 REPORTS_DIR.mkdir(exist_ok=True)
 
 # 병렬 처리 설정
-# 공유 rate limiter(60회/분)를 N개 스레드가 나눠 쓰므로 rate limit 초과 없음.
-# 네트워크 latency(~0.1초)와 throttle 대기를 오버랩해 처리율 향상.
+# 공유 토큰 버킷(플랜별 분당 한도, INFOMAX_PLAN)을 N개 스레드가 나눠 쓰므로 rate limit 초과 없음.
+# 대기는 lock 밖에서 하므로 네트워크 latency와 throttle 대기가 스레드 간에 오버랩됨.
 MAX_WORKERS = 4
 
-# 특이사항 임계값
-THRESHOLD_PRICE_CHANGE  = 0.295   # 가격 변동 29.5% 이상 (상한/하한가 근접)
-THRESHOLD_VOLUME_ZERO   = True    # 거래량 0 = 거래정지
-THRESHOLD_LARGE_NET_BUY = 5e10    # 순매수 500억 이상 (거액 유입/이탈)
+# 진행 상황 출력 간격 (종목 수)
+PROGRESS_EVERY = 500
+
+
+# 종목 마스터 변경 유형 (sync_stock_master 결과 키 → 출력 이름)
+MASTER_CHANGES = [
+    ("new_listed",     "신규 상장"),
+    ("delisted",       "상장폐지"),
+    ("renamed",        "종목명 변경"),
+    ("market_changed", "시장 변경"),
+    ("isin_changed",   "ISIN 변경"),
+]
 
 
 # ── DB 연결 ───────────────────────────────────────────────────────────────
@@ -94,45 +133,153 @@ def get_stocks(conn, include_etf: bool = True) -> list[tuple[str, str]]:
 
 
 def get_missing_ohlcv_stocks(conn, target_date: date) -> list[tuple[str, str]]:
-    """target_date에 ohlcv_daily 데이터가 없는 활성 종목 목록"""
-    with conn.cursor() as cur:
-        cur.execute("""
-            SELECT s.stock_code, s.stock_name
-            FROM stocks s
-            WHERE s.is_active = TRUE
-              AND s.stock_code NOT IN (
-                  SELECT stock_code FROM ohlcv_daily WHERE time = %s
-              )
-            ORDER BY s.stock_code
-        """, (target_date,))
-        return cur.fetchall()
+    """target_date에 ohlcv_daily 데이터가 없는 종목 (그날 상장돼 있던 종목 기준, 누락 행렬)"""
+    return missing_matrix(conn, "ohlcv", target_date, target_date, days=[target_date]).missing_stocks()
 
 
 def get_missing_investor_stocks(conn, target_date: date) -> list[tuple[str, str]]:
-    """target_date에 investor_trading 데이터가 없는 KOSPI/KOSDAQ 종목 목록"""
-    with conn.cursor() as cur:
-        cur.execute("""
-            SELECT s.stock_code, s.stock_name
-            FROM stocks s
-            WHERE s.is_active = TRUE
-              AND s.market IN ('KOSPI', 'KOSDAQ')
-              AND s.stock_code NOT IN (
-                  SELECT DISTINCT stock_code FROM investor_trading WHERE time = %s
-              )
-            ORDER BY s.stock_code
-        """, (target_date,))
-        return cur.fetchall()
+    """target_date에 investor_trading 데이터가 없는 KOSPI/KOSDAQ 종목 (누락 행렬)"""
+    return missing_matrix(conn, "investor", target_date, target_date, days=[target_date]).missing_stocks()
 
 
 # ── 병렬 수집 worker (module-level, pickle 가능) ──────────────────────────
-def _fetch_hist(client, code, name, start, end):
-    rows = client.get_hist(code, start, end)
-    return code, name, rows
+def _fetch_hist_batch(client, stocks, start, end):
+    """stocks: [(code, name), ...] 한 묶음 → [(code, name, 응답 행), ...] (decode_hist 로 디코딩)"""
+    by_code = client.get_hist_batch([c for c, _ in stocks], start, end,
+                                    batch_size=len(stocks), raw=True)
+    return [(code, name, by_code.get(code, [])) for code, name in stocks]
+
+
+def _fetch_investor_batch(client, stocks, start, end):
+    """stocks: [(code, name), ...] 한 묶음 → [(code, name, 응답 행), ...] (decode_investor)"""
+    by_code = client.get_investor_batch([c for c, _ in stocks], start, end,
+                                        batch_size=len(stocks), raw=True)
+    return [(code, name, by_code.get(code, [])) for code, name in stocks]
+
+
+def _fetch_snapshot_batch(client, stocks, start, end):
+    """
+    stocks 한 페이지의 start(=end) 하루치 시세 (/api/stock/info) → [(code, name, 응답 행), ...]
+    스냅샷에 빠진 종목은 hist 로 한 번 더 조회
+    """
+    codes = [c for c, _ in stocks]
+    by_code = client.get_snapshot(codes, start, page_size=len(stocks), raw=True)
+    missing = [c for c in codes if not by_code.get(c)]
+    if missing:
+        by_code.update(client.get_hist_batch(missing, start, end, raw=True))
+    return [(code, name, by_code.get(code, [])) for code, name in stocks]
+
+
+async def _fetch_snapshot_batch_async(aclient, codes, start, end, n):
+    by_code = await aclient.get_snapshot(codes, start, page_size=n, raw=True)
+    missing = [c for c in codes if not by_code.get(c)]
+    if missing:
+        by_code.update(await aclient.get_hist_batch(missing, start, end, raw=True))
+    return by_code
+
 
+# async 엔진용 묶음 수집 (동기 worker와 같은 형태로 반환)
+# (aclient, codes, start, end, 묶음 크기) → {code: rows}
+_ASYNC_FETCHERS = {
+    _fetch_hist_batch:     lambda c, codes, s, e, n: c.get_hist_batch(codes, s, e, batch_size=n, raw=True),
+    _fetch_investor_batch: lambda c, codes, s, e, n: c.get_investor_batch(codes, s, e, batch_size=n,
+                                                                          raw=True),
+    _fetch_snapshot_batch: _fetch_snapshot_batch_async,
+}
+
+
+# ── 수집 엔진 (WorkScheduler executor) ───────────────────────────────────
+class _ThreadEngine:
+    """ThreadPoolExecutor(MAX_WORKERS)에서 fetch_fn(client, chunk, start, end) 실행"""
+
+    def __init__(self, client):
+        self.client = client
+        self.max_inflight = MAX_WORKERS * 2
+
+    def __enter__(self):
+        self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        return False
+
+    def submit(self, fetch_fn, chunk, start, end):
+        return self._pool.submit(fetch_fn, self.client, chunk, start, end)
+
+
+class _AsyncEngine:
+    """
+    별도 스레드의 이벤트 루프 + AsyncInfomaxClient
+    submit 은 fetch_fn 에 대응하는 코루틴(_ASYNC_FETCHERS)을 루프에 넣고 concurrent Future 반환
+    """
+
+    def __init__(self):
+        self.max_inflight = settings.INFOMAX_ASYNC_CONCURRENCY * 2
+
+    def __enter__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="infomax-async", daemon=True)
+        self._thread.start()
+        self._aclient = asyncio.run_coroutine_threadsafe(self._open(), self._loop).result()
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            asyncio.run_coroutine_threadsafe(self._aclient.__aexit__(None, None, None), self._loop).result()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+        return False
 
-def _fetch_investor(client, code, name, start, end):
-    rows = client.get_investor(code, start, end)
-    return code, name, rows
+    @staticmethod
+    async def _open():
+        from collectors.async_infomax import AsyncInfomaxClient
+        return await AsyncInfomaxClient().__aenter__()
+
+    async def _one(self, fetcher, chunk, start, end):
+        by_code = await fetcher(self._aclient, [c for c, _ in chunk], start, end, len(chunk))
+        return [(code, name, by_code.get(code, [])) for code, name in chunk]
+
+    def submit(self, fetch_fn, chunk, start, end):
+        return asyncio.run_coroutine_threadsafe(
+            self._one(_ASYNC_FETCHERS[fetch_fn], chunk, start, end), self._loop)
+
+
+def _fetch_engine(engine: str, client):
+    return _AsyncEngine() if engine == "async" else _ThreadEngine(client)
+
+
+def iter_fetch_scheduled(engine: str, client, scheduler: WorkScheduler):
+    """
+    scheduler 의 흐름들(hist·investor …)을 한 엔진에서 섞어 수행
+    → (흐름 이름, (start, end), [(code, name, rows), ...])
+    engine="thread": ThreadPoolExecutor(MAX_WORKERS) / "async": 이벤트 루프 스레드 + AsyncInfomaxClient
+    동시 제출 수는 엔진별 상한까지 — 소비(DB writer 큐)가 막히면 새 요청 제출도 멈춤
+    """
+    with _fetch_engine(engine, client) as executor:
+        yield from scheduler.run(executor, executor.max_inflight)
+
+
+def iter_fetch_units(engine: str, fetch_fn, client, units):
+    """
+    묶음마다 기간이 다를 수 있는 단위를 재시도 없이 수행 (백필: 종목 묶음 × 기간 창)
+    units: [(chunk, start, end), ...] → (units 인덱스, [(code, name, rows), ...]) 를 완료 순서대로 yield
+    """
+    todo = iter(enumerate(units))
+    with _fetch_engine(engine, client) as executor:
+        def submit(n):
+            for i, (chunk, start, end) in islice(todo, n):
+                futures[executor.submit(fetch_fn, chunk, start, end)] = i
+
+        futures = {}
+        submit(executor.max_inflight)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            submit(len(done))
+            for future in done:
+                yield futures.pop(future), future.result()
 
 
 # ── DB UPSERT ─────────────────────────────────────────────────────────────
@@ -180,9 +327,12 @@ def upsert_batch(conn, sql: str, rows: list[tuple]) -> tuple[int, int]:
     Returns: (changed_rows, total_rows)
     changed_rows: 실제 INSERT되거나 값이 달라서 UPDATE된 건수
     total_rows:   시도한 전체 건수 (changed + skipped)
+    DB_COPY_THRESHOLD 행 이상이면 COPY → staging 병합 (database.bulk.copy_upsert)
     """
     if not rows:
         return 0, 0
+    if settings.DB_COPY_THRESHOLD and len(rows) >= settings.DB_COPY_THRESHOLD:
+        return copy_upsert(conn, sql, rows)
     with conn.cursor() as cur:
         psycopg2.extras.execute_values(cur, sql, rows, page_size=500)
         changed = cur.rowcount  # WHERE 조건 불만족(값 동일)은 카운트 안 됨
@@ -191,178 +341,440 @@ def upsert_batch(conn, sql: str, rows: list[tuple]) -> tuple[int, int]:
 
 
 # ── 특이사항 분석 ─────────────────────────────────────────────────────────
-def analyze_anomalies(ohlcv_rows: list[dict],
-                      investor_rows: list[dict],
+def analyze_anomalies(ohlcv: pd.DataFrame,
+                      investor: pd.DataFrame,
                       prev_close: dict) -> list[dict]:
     """
-    특이사항 목록 반환
+    특이사항 목록 반환 (validators.anomalies 규칙 엔진 — 기간 안의 날짜별 등락률 기준)
     각 항목: {"type", "stock_code", "stock_name", "date", "detail", "value"}
+    prev_close: 기간 시작일 직전 종가 (기간 첫 거래일 등락률용)
     """
-    anomalies = []
-
-    # ── OHLCV 특이사항 ─────────────────────────────────────────
-    for r in ohlcv_rows:
-        code  = r["stock_code"]
-        name  = r.get("stock_name", code)
-        dt    = r["date"]
-        close = r["close_price"] or 0
-        high  = r["high_price"]  or 0
-        low   = r["low_price"]   or 0
-        vol   = r["volume"]      or 0
-
-        # 거래량 0 → 거래정지/관리종목
-        if vol == 0 and close > 0:
-            anomalies.append({
-                "type": "거래정지",
-                "stock_code": code, "stock_name": name, "date": dt,
-                "detail": f"거래량=0, 종가={close:,}원",
-                "value": 0,
-            })
-
-        # OHLCV 논리 오류
-        if high and low and high < low:
-            anomalies.append({
-                "type": "OHLCV오류",
-                "stock_code": code, "stock_name": name, "date": dt,
-                "detail": f"고가({high:,}) < 저가({low:,})",
-                "value": high - low,
-            })
-
-        # 전일 대비 급등락 (상/하한가 근접)
-        prev = prev_close.get(code)
-        if prev and prev > 0 and close > 0:
-            chg_rate = abs(close - prev) / prev
-            if chg_rate >= THRESHOLD_PRICE_CHANGE:
-                direction = "급등" if close > prev else "급락"
-                anomalies.append({
-                    "type": f"가격{direction}",
-                    "stock_code": code, "stock_name": name, "date": dt,
-                    "detail": f"전일종가={prev:,}원 → 당일종가={close:,}원 ({chg_rate*100:+.1f}%)",
-                    "value": chg_rate,
-                })
-
-    # ── 투자자 수급 특이사항 ────────────────────────────────────
-    # 종목별 날짜별 순매수 집계
-    net_by_stock = defaultdict(lambda: defaultdict(int))
-    names = {}
-    for r in investor_rows:
-        code = r["stock_code"]
-        dt   = r["date"]
-        net_by_stock[code][dt] += (r["net_buy_value"] or 0)
-        names[code] = r.get("stock_name", code)
-
-    for code, dates in net_by_stock.items():
-        for dt, net_total in dates.items():
-            if abs(net_total) >= THRESHOLD_LARGE_NET_BUY:
-                direction = "대규모순매수" if net_total > 0 else "대규모순매도"
-                anomalies.append({
-                    "type": direction,
-                    "stock_code": code, "stock_name": names.get(code, code),
-                    "date": dt,
-                    "detail": f"전체투자자 순매수합계={net_total/1e8:+.1f}억원",
-                    "value": abs(net_total),
-                })
-
-    return anomalies
+    return detect_anomalies(ohlcv, investor, prev_close)
 
 
 # ── 종목 마스터 자동 갱신 ────────────────────────────────────────────────
 def sync_stock_master(conn, client) -> dict:
     """
-    STEP 0: 종목 마스터 갱신
-    - /api/stock/code    → 신규 상장 종목 INSERT
+    STEP 0: 종목 마스터 갱신 (database.stock_master — 집합 비교, 한 트랜잭션)
+    - /api/stock/code    → 신규 상장 INSERT, 종목명 / 시장 / ISIN 변경 UPDATE
     - /api/stock/expired → 상장폐지 종목 is_active=False UPDATE
+                           (지난 동기화일 - STOCK_MASTER_EXPIRED_OVERLAP_DAYS 부터만 조회)
 
-    Returns: {"new_listed": [...], "delisted": [...], "errors": [...]}
+    Returns: {"new_listed", "delisted", "renamed", "market_changed", "isin_changed": [...], "errors": [...],
+              "db_seconds"}
     """
-    result = {"new_listed": [], "delisted": [], "errors": []}
-
-    # DB 전체 종목 코드 + 활성 여부
-    with conn.cursor() as cur:
-        cur.execute("SELECT stock_code, is_active FROM stocks")
-        db_stocks = {row[0]: row[1] for row in cur.fetchall()}
-
-    # ── 신규 상장 종목 ─────────────────────────────────────────
+    errors = []
     try:
         api_stocks = client.get_stock_codes()
-        for s in api_stocks:
-            code = s["code"]
-            if not code or code in db_stocks:
-                continue
-            with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO stocks
-                        (stock_code, stock_name, market, standard_code, listing_date, is_active)
-                    VALUES (%s, %s, %s, %s, %s, TRUE)
-                    ON CONFLICT (stock_code) DO NOTHING
-                """, (code, s["name"], s["market"], s["standard_code"], s["listing_date"]))
-            conn.commit()
-            result["new_listed"].append(code)
     except Exception as e:
-        result["errors"].append(f"신규 상장 조회 실패: {e}")
-
-    # ── 상장폐지 종목 ──────────────────────────────────────────
+        api_stocks = None
+        errors.append(f"신규 상장 조회 실패: {e}")
     try:
-        # DB 활성 종목 중 가장 오래된 상장일을 startDate로 사용
-        # → API 기본값(today-365)보다 넓게 조회해 누락 방지
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT MIN(listing_date) FROM stocks
-                WHERE is_active = TRUE AND listing_date IS NOT NULL
-            """)
-            oldest_listing = cur.fetchone()[0]
-
-        expired_start = oldest_listing if oldest_listing else date(2000, 1, 1)
+        expired_start = expired_window_start(conn, settings.STOCK_MASTER_EXPIRED_OVERLAP_DAYS)
         expired = client.get_expired_codes(start_date=expired_start)
-        for s in expired:
-            code = s["code"]
-            if not code:
-                continue
-            # DB에 있고 현재 is_active=True인 경우만 처리
-            if db_stocks.get(code) is True:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        UPDATE stocks
-                        SET is_active      = FALSE,
-                            delisting_date = %s,
-                            updated_at     = NOW()
-                        WHERE stock_code = %s AND is_active = TRUE
-                    """, (s["delisting_date"], code))
-                conn.commit()
-                result["delisted"].append(code)
     except Exception as e:
-        result["errors"].append(f"상장폐지 조회 실패: {e}")
+        expired = None
+        errors.append(f"상장폐지 조회 실패: {e}")
 
+    db_started = time.monotonic()
+    result = sync_master(conn, api_stocks, expired, datetime.now(KST).date())
+    result["db_seconds"] = time.monotonic() - db_started
+    result["errors"] = errors
     return result
 
 
-# ── 전일 종가 조회 ────────────────────────────────────────────────────────
-def get_prev_close(conn, target_date: date) -> dict[str, float]:
-    """target_date 직전 영업일의 종가 딕셔너리"""
-    with conn.cursor() as cur:
-        cur.execute("""
-            SELECT DISTINCT ON (stock_code)
-                stock_code, close_price
-            FROM ohlcv_daily
-            WHERE time < %s
-            ORDER BY stock_code, time DESC
-        """, (target_date,))
-        return {row[0]: row[1] for row in cur.fetchall()}
+def _remaining_work(stocks: list, windows: list, skip: set, batch_size: int) -> tuple[int, int]:
+    """
+    사용량 추정용 (창 평균 종목 수, 요청 수) — 이어받기 시 저장 완료된 (종목, 창) 제외
+    """
+    per_window = [sum(1 for code, _ in stocks if (code, s) not in skip) for s, _ in windows]
+    n_requests = sum(-(-n // batch_size) for n in per_window)
+    return -(-sum(per_window) // max(1, len(windows))), n_requests
+
+
+def _engine_label(engine: str) -> str:
+    if engine == "async":
+        return f"async, 동시 요청={settings.INFOMAX_ASYNC_CONCURRENCY}"
+    return f"workers={MAX_WORKERS}"
+
+
+# ── 수집 루프 (본 수집 / 재조회 라운드 / 샤드 worker 공통) ────────────────
+COLLECT_LABELS = {"ohlcv": "OHLCV", "investor": "수급"}
+
+
+class ChunkCollector:
+    """
+    스케줄러 결과 → 컬럼 디코딩 → writer 큐, 종목별 성공/실패 + 특이사항(묶음 단위) 집계
+    한 창이라도 데이터를 못 받은 종목은 실패
+
+    on_progress(name, scheduler, writer, done, total): 묶음마다 호출
+    (기본: 흐름 완료 / PROGRESS_EVERY 종목마다 진행 출력, 샤드 worker 는 부모에게 전달)
+    """
+
+    def __init__(self, engine: str, client, journal: RunJournal, detector: AnomalyAccumulator,
+                 on_progress=None):
+        self.engine = engine
+        self.client = client
+        self.journal = journal
+        self.detector = detector
+        self.on_progress = on_progress or self.print_progress
+        self.seen       = {"ohlcv": set(), "investor": set()}
+        self.failed     = {"ohlcv": set(), "investor": set()}
+        self.fail_codes = {"ohlcv": [], "investor": []}     # 실패한 순서
+        self.mktcap_source = {"api": 0, "computed": 0}      # 시가총액 행: API 제공 / 종가 × 상장주식수
+        self._next_progress = PROGRESS_EVERY
+        self._announced = {"ohlcv": 0, "investor": 0}       # 출력한 재시도 회차
+
+    def counts(self, name: str) -> tuple[int, int]:
+        """(성공 종목 수, 실패 종목 수)"""
+        return len(self.seen[name]) - len(self.failed[name]), len(self.failed[name])
+
+    def collect(self, scheduler: WorkScheduler, writer: DbWriter):
+        done_count = 0
+        total_units = sum(s.total for s in scheduler.streams)
+        self._next_progress = PROGRESS_EVERY
+        for name, window, chunk_result in iter_fetch_scheduled(self.engine, self.client, scheduler):
+            done_count += len(chunk_result)
+            for code, _, rows in chunk_result:
+                self.seen[name].add(code)
+                if not rows and code not in self.failed[name]:
+                    self.failed[name].add(code)
+                    self.fail_codes[name].append(code)
+
+            names = {c: n for c, n, _ in chunk_result}
+            if name == "ohlcv":
+                # 묶음 단위 컬럼 디코딩 (시가총액: 스냅샷 값, 없으면 종가 × 상장주식수)
+                frame = decode_hist(rows for _, _, rows in chunk_result)
+                writer.put("ohlcv", OHLCV_SQL, to_records(frame, OHLCV_COLUMNS))
+                mktcap = frame[(frame["market_cap"] > 0).fillna(False)]
+                writer.put("market_cap", MKTCAP_SQL, to_records(mktcap, MKTCAP_COLUMNS))
+                reported = int(mktcap["market_cap_reported"].sum())
+                self.mktcap_source["api"]      += reported
+                self.mktcap_source["computed"] += len(mktcap) - reported
+                frame["stock_name"] = frame["stock_code"].map(names)
+                self.detector.add_ohlcv(frame)
+            else:
+                frame = decode_investor(rows for _, _, rows in chunk_result)
+                writer.put("investor", INVESTOR_SQL, to_records(frame, INVESTOR_COLUMNS))
+                frame["stock_name"] = frame["stock_code"].map(names)
+                self.detector.add_investor(frame)
+            # 위 데이터 행이 커밋된 뒤에 기록 → journal 에 있으면 저장 완료 보장 (--resume 시 건너뜀)
+            writer.put("journal", UNITS_SQL, self.journal.entries(name, window, chunk_result),
+                       after_data=True)
+            self.on_progress(name, scheduler, writer, done_count, total_units)
+
+    def print_progress(self, name: str, scheduler: WorkScheduler, writer: DbWriter,
+                       done: int, total: int):
+        for stream, p in scheduler.progress().items():
+            if p["attempt"] > self._announced.get(stream, 0) and p["deferred"]:
+                self._announced[stream] = p["attempt"]
+                print(f"  ↻ [{stream}] {p['deferred']}개 종목 재시도 예약 ({p['attempt']}회차)")
+        progress = scheduler.progress()[name]
+        if progress["done"] == progress["total"]:
+            success, fail = self.counts(name)
+            print(f"  ✅ {COLLECT_LABELS[name]} 수집 완료 (성공:{success} 실패:{fail})")
+        if done >= self._next_progress or done == total:
+            self._next_progress = (done // PROGRESS_EVERY + 1) * PROGRESS_EVERY
+            print(f"  [{done:5}/{total}] {scheduler.progress_line()} "
+                  f"| 저장 대기 {writer.queue_depth()}묶음")
+
+    def merge(self, shard: dict):
+        """샤드 worker 결과의 종목별 성공/실패 합치기 (샤드끼리 종목이 겹치지 않음)"""
+        for name in ("ohlcv", "investor"):
+            self.seen[name]   |= shard["seen"][name]
+            self.failed[name] |= shard["failed"][name]
+            self.fail_codes[name] += shard["fail_codes"][name]
+        for key, n in shard.get("mktcap_source", {}).items():
+            self.mktcap_source[key] += n
+
+    def keep_failed(self, name: str, still_missing: set):
+        """재조회 후에도 누락인 종목만 실패로 남김"""
+        self.failed[name] &= still_missing
+        self.fail_codes[name] = [c for c in self.fail_codes[name] if c in still_missing]
+
+
+def _reset_client_stats(client):
+    """회차별 통계 (스케줄러 프로세스·샤드 worker 에서 반복 실행 시)"""
+    client.rate_limiter.reset_stats()
+    if client.rate_controller:
+        client.rate_controller.reset_stats()
+    client.usage.reset_run()
+    client.breaker.reset_stats()
+    if client.cache:
+        client.cache.reset_stats()
+
+
+def _client_stats(client) -> dict:
+    """{"throttle", "usage", "wait"(endpoint별 rate limit 대기), "cache"} — 보고서·수집 로그용 API 통계"""
+    client.usage.flush()
+    throttle = client.rate_limiter.stats()
+    if client.rate_controller:
+        throttle["adaptive"] = client.rate_controller.stats()
+    throttle["breaker"] = client.breaker.stats()
+    return {"throttle": throttle, "usage": client.usage.run_usage(), "wait": client.usage.run_wait(),
+            "cache": client.cache.stats() if client.cache else None}
+
+
+# ── 샤드 병렬 수집 (프로세스 풀, 대량 백필용) ─────────────────────────────
+# JSON 디코딩·행 변환·upsert 가 한 프로세스(코어 1개, DB 연결 1개)에 몰리지 않도록
+# 종목 묶음을 N개 샤드로 나눠 worker 프로세스마다 자체 DB 연결·DbWriter·수집 엔진으로 수행
+# 한 종목의 모든 창은 같은 샤드 → 창 경계 등락률(AnomalyAccumulator)도 샤드 안에서 확정됨
+UNTHROTTLED_RATE_PER_MIN = 1e9
+
+_shard_progress = None      # worker 프로세스: 부모에게 진행 상황을 보내는 큐
+
+
+def _is_replay_api() -> bool:
+    """API 주소가 로컬(녹화 fixture 재생 mock 서버)이면 True"""
+    return urlparse(settings.INFOMAX_BASE_URL).hostname in ("localhost", "127.0.0.1", "::1")
+
+
+def _init_shard_worker(progress_queue, throttle: bool):
+    """
+    worker 프로세스 초기화
+    throttle=True:  프로세스 간 공유 rate limiter (INFOMAX_RATE_SHARED 가 꺼져 있어도 샤드끼리는 공유)
+    throttle=False: rate limit 없음 (로컬 재생 전용 — 캐시 적중은 원래 limiter 를 거치지 않음)
+    """
+    global _shard_progress
+    _shard_progress = progress_queue
+    from collectors.async_infomax import AsyncInfomaxClient
+    if not throttle:
+        limiter = TokenBucket(UNTHROTTLED_RATE_PER_MIN, burst=MAX_WORKERS)
+    elif not isinstance(InfomaxClient.rate_limiter, SharedTokenBucket):
+        limiter = SharedTokenBucket.from_settings()
+    else:
+        return
+    InfomaxClient.rate_limiter = AsyncInfomaxClient.rate_limiter = limiter
+    InfomaxClient.breaker.bucket = limiter
+    if InfomaxClient.rate_controller:
+        InfomaxClient.rate_controller.bucket = limiter
+
+
+def collect_shard(spec: dict) -> dict:
+    """
+    worker 프로세스: 샤드 하나 수집·저장 (자체 DB 연결 / DbWriter / InfomaxClient)
+    spec: {"shard", "engine", "run_id", "start", "end", "windows", "prev_close",
+           "streams": {name: (fetch_fn, chunks, batch_size, skip)}}
+    Returns: 부모가 합칠 결과 (종목별 성공/실패, 저장·재시도·API 통계, 특이사항)
+    """
+    conn = get_conn()
+    try:
+        client = InfomaxClient()
+        _reset_client_stats(client)
+        journal = RunJournal(conn, spec["run_id"], spec["start"], spec["end"])
+        retries, streams = {}, []
+        for name, (fetch_fn, chunks, batch_size, skip) in spec["streams"].items():
+            retries[name] = RetryQueue.from_settings()
+            streams.append(WorkStream(name, fetch_fn, chunks, spec["windows"], batch_size,
+                                      retries[name], skip=skip))
+        apply_schedule(streams, settings.INFOMAX_SCHEDULE_PRIORITY, settings.INFOMAX_SCHEDULE_WEIGHTS)
+
+        def report(name, scheduler, writer, done, total):
+            _shard_progress.put((spec["shard"], scheduler.progress(), writer.queue_depth()))
+
+        collector = ChunkCollector(spec["engine"], client, journal,
+                                   AnomalyAccumulator(spec["prev_close"]), on_progress=report)
+        with DbWriter.from_settings(get_conn, upsert_batch) as writer:
+            collector.collect(WorkScheduler(streams), writer)
+        return {
+            "seen":          collector.seen,
+            "failed":        collector.failed,
+            "fail_codes":    collector.fail_codes,
+            "mktcap_source": collector.mktcap_source,
+            "retry":         {name: q.stats() for name, q in retries.items()},
+            "writer":        writer.stats(),
+            "anomalies":     collector.detector.finish(),
+            **_client_stats(client),
+        }
+    finally:
+        conn.close()
+
+
+def run_shards(specs: list[dict], throttle: bool) -> list[dict]:
+    """
+    샤드별 collect_shard 를 프로세스 풀(spawn — 부모 DB 연결을 물려받지 않음)에서 실행
+    worker 진행 상황을 합쳐 PROGRESS_EVERY 종목마다 출력, 샤드 결과 목록 반환 (worker 예외는 전파)
+    """
+    ctx = multiprocessing.get_context("spawn")
+    progress_queue = ctx.Queue()
+    latest = {}                 # shard → (흐름별 진행, 저장 대기 묶음)
+    announced = set()
+    next_progress = PROGRESS_EVERY
+
+    def show(shard, progress, depth):
+        nonlocal next_progress
+        latest[shard] = (progress, depth)
+        merged = defaultdict(lambda: {"done": 0, "total": 0, "retrying": 0})
+        for p, _ in latest.values():
+            for name, s in p.items():
+                for key in ("done", "total", "retrying"):
+                    merged[name][key] += s[key]
+        done = sum(m["done"] for m in merged.values())
+        total = sum(m["total"] for m in merged.values())
+        if len(latest) == len(specs):
+            for name, m in merged.items():
+                if m["done"] == m["total"] and name not in announced:
+                    announced.add(name)
+                    print(f"  ✅ {COLLECT_LABELS[name]} 수집 완료")
+        if done >= next_progress:
+            next_progress = (done // PROGRESS_EVERY + 1) * PROGRESS_EVERY
+            line = " | ".join(f"{name} {m['done']:,}/{m['total']:,}"
+                              + (f" (재시도 {m['retrying']})" if m["retrying"] else "")
+                              for name, m in merged.items())
+            print(f"  [{done:5}/{total}] {line} | 샤드 {len(latest)}/{len(specs)} "
+                  f"| 저장 대기 {sum(d for _, d in latest.values())}묶음")
+
+    with ProcessPoolExecutor(max_workers=len(specs), mp_context=ctx,
+                             initializer=_init_shard_worker, initargs=(progress_queue, throttle)) as pool:
+        futures = [pool.submit(collect_shard, spec) for spec in specs]
+        while not all(f.done() for f in futures):
+            try:
+                show(*progress_queue.get(timeout=1))
+            except Empty:
+                pass
+        while True:
+            try:
+                show(*progress_queue.get_nowait())
+            except Empty:
+                break
+        return [f.result() for f in futures]
+
+
+def shard_specs(n_shards: int, streams: dict, skip: dict, prev_close: dict, **common) -> list[dict]:
+    """
+    종목 묶음을 n_shards 개로 라운드로빈 분배 (빈 샤드 제외)
+    streams: {name: (fetch_fn, chunks, batch_size)} / skip: {name: {(code, 창 시작일)}}
+    """
+    specs = []
+    for i in range(n_shards):
+        shard_streams = {}
+        for name, (fetch_fn, chunks, batch_size) in streams.items():
+            mine = chunks[i::n_shards]
+            codes = {c for chunk in mine for c, _ in chunk}
+            shard_streams[name] = (fetch_fn, mine, batch_size, {(c, s) for c, s in skip[name] if c in codes})
+        if not any(chunks for _, chunks, _, _ in shard_streams.values()):
+            continue
+        ohlcv_codes = {c for chunk in shard_streams.get("ohlcv", (None, []))[1] for c, _ in chunk}
+        specs.append({"shard": len(specs), "streams": shard_streams,
+                      "prev_close": {c: v for c, v in prev_close.items() if c in ohlcv_codes}, **common})
+    return specs
+
+
+def merge_stats(stats: list[dict]) -> dict:
+    """
+    같은 모양의 통계 dict 합치기 (숫자는 합계 — max_*·속도·크기는 최댓값, min_* 은 최솟값 / dict 는 재귀 / bool 은 any)
+    비율(avg_*, hit_rate)은 합친 뒤 호출하는 쪽에서 다시 계산
+    """
+    stats = [s for s in stats if s]
+    merged = {}
+    for key in {k for s in stats for k in s}:
+        values = [s[key] for s in stats if key in s]
+        if isinstance(values[0], dict):
+            merged[key] = merge_stats(values)
+        elif isinstance(values[0], bool):
+            merged[key] = any(values)
+        elif key.startswith("max_") or key in ("size_bytes", "rate_per_min", "effective_rate", "batch_rows"):
+            merged[key] = max(values)
+        elif key.startswith("min_"):
+            merged[key] = min(values)
+        elif isinstance(values[0], (int, float)):
+            merged[key] = sum(values)
+        else:
+            merged[key] = values[0]
+    return merged
+
+
+# ── 늦은 데이터 재조회 ────────────────────────────────────────────────────
+def repoll_probe(conn, universe: dict[str, set], start: date, end: date,
+                 windows: list[tuple[date, date]]) -> tuple[float, dict]:
+    """
+    커밋된 DB 기준 누락 행렬 → (수집률, {name: (누락 종목, 다 받은 (종목, 창 시작일))})
+    universe: {name: 이번 실행 수집 대상 종목} — 그 밖의 종목은 세지 않음
+    거래일 = 이번 기간에 OHLCV 가 한 종목이라도 들어온 날 (설·추석 등 평일 휴장일 제외)
+    아무 날도 없으면(전부 지연) 평일 - 학습된 휴장일
+    """
+    days = present_days(conn, "ohlcv", start, end) or ClosedDays.from_settings().trading_days(start, end)
+    expected = n_missing = 0
+    missing = {}
+    for name in ("ohlcv", "investor"):
+        if not universe[name]:
+            continue
+        m = missing_matrix(conn, name, start, end, days=days)
+        rows = [i for i, c in enumerate(m.codes) if c in universe[name]]
+        expected  += int(m.expected[rows].sum())
+        n_missing += int(m.missing[rows].sum())
+        by_window = {w: {c for c, _ in m.missing_stocks(*w) if c in universe[name]} for w in windows}
+        stocks = sorted({(c, n) for c, n in m.missing_stocks() if c in universe[name]})
+        filled = {(c, w[0]) for w, codes in by_window.items() for c, _ in stocks if c not in codes}
+        missing[name] = (stocks, filled)
+    return (1 - n_missing / expected if expected else 1.0), missing
+
+
+# ── 단계별 수집 로그 (data_collection_logs) ──────────────────────────────
+def _api_totals(client) -> tuple[int, int, float]:
+    """이 회차 지금까지 (API 호출 수, 응답 바이트, rate limit 대기 초)"""
+    usage = client.usage.run_usage().values()
+    return (sum(e["requests"] for e in usage), sum(e["bytes"] for e in usage),
+            sum(client.usage.run_wait().values()))
+
+
+def _step_status(failed_codes: list, deferred: bool) -> tuple[str, Optional[str]]:
+    """수집 단계 (status, 오류 요약) — 연기·실패 종목이 있으면 PARTIAL"""
+    errors = []
+    if deferred:
+        errors.append("일일 사용량 한도로 연기")
+    if failed_codes:
+        errors.append(f"실패 {len(failed_codes)}종목: {', '.join(failed_codes[:20])}"
+                      + (" ..." if len(failed_codes) > 20 else ""))
+    return ("PARTIAL" if errors else "SUCCESS"), "; ".join(errors) or None
+
+
+def _save_telemetry(conn, telemetry: CollectionLog):
+    """단계별 수집 로그 저장 — 실패해도 업데이트 결과에는 영향 없음"""
+    try:
+        telemetry.save(conn)
+    except Exception as e:
+        conn.rollback()
+        print(f"  ⚠️  수집 로그(data_collection_logs) 기록 실패: {e}")
 
 
 # ── 메인 업데이트 로직 ────────────────────────────────────────────────────
-def run_update(target_date: date = None, missing_only: bool = False) -> dict:
+def run_update(target_date: date = None, missing_only: bool = False,
+               engine: str = None, resume: bool = False, repoll: bool = None,
+               workers: int = None, throttle: bool = None) -> dict:
     """
     일별 업데이트 실행
     missing_only=True: target_date에 누락된 종목만 재수집 (이미 수집된 종목 스킵)
+    engine: "thread"(기본, ThreadPoolExecutor) / "async"(asyncio) — None이면 INFOMAX_ENGINE
+    resume=True: 끝나지 않은 최근 실행(collection_runs)의 기간으로 다시 실행하며
+                 journal에 저장 완료로 기록된 (endpoint, 종목, 창)은 건너뜀
+    repoll=True: 본 수집 뒤 누락 종목만 백오프 간격으로 재조회 (수집률 목표 또는 마감까지)
+                 — None이면 DAILY_REPOLL_ENABLED
+    workers>1: 종목 묶음을 샤드로 나눠 프로세스 풀에서 수집 (worker마다 DB 연결·writer, 대량 백필용)
+               — None이면 DAILY_SHARD_WORKERS
+    throttle=False: 샤드 worker rate limit 없음 (녹화 재생 등 로컬 API 전용)
+                    — None이면 API 주소가 로컬일 때만 끔
     Returns: 결과 딕셔너리 (보고서 생성용)
     """
     started_at = datetime.now(KST)
+    engine = engine or settings.INFOMAX_ENGINE
+    repoll = settings.DAILY_REPOLL_ENABLED if repoll is None else repoll
+    workers = max(1, settings.DAILY_SHARD_WORKERS if workers is None else workers)
+    throttle = not _is_replay_api() if throttle is None else throttle
     conn = get_conn()
     client = InfomaxClient()
+    _reset_client_stats(client)     # 스케줄러 프로세스에서 반복 실행 시 회차별 통계
 
     # ── 업데이트 날짜 결정 ─────────────────────────────────────
-    if target_date:
+    # 이어받기: 중단된 실행의 기간을 그대로 사용 (부분 저장으로 DB 최신일이 이미 바뀌었을 수 있음)
+    journal = RunJournal.resume(conn, target_date) if resume else None
+    done_units = set()
+    if journal:
+        start_date, end_date = journal.start, journal.end
+        done_units = journal.done_units()
+        print(f"  이어받기: 실행 #{journal.run_id} ({start_date} ~ {end_date}), "
+              f"저장 완료 {len(done_units):,}개 (endpoint, 종목, 창) 건너뜀")
+    elif target_date:
         start_date = end_date = target_date
     else:
         start_date, end_date = get_update_range(conn)
@@ -370,29 +782,39 @@ def run_update(target_date: date = None, missing_only: bool = False) -> dict:
             print(f"  업데이트할 데이터 없음 (DB 최신: {end_date}, 어제: {end_date})")
             conn.close()
             return {}
+    if resume and not journal:
+        print("  이어받을 실행 없음 (최근 실행이 정상 종료) → 새로 실행")
+    journal = journal or RunJournal.begin(conn, start_date, end_date)
+    telemetry = CollectionLog(journal.run_id, end_date)     # 단계별 수집 로그
 
     # ─────────────────────────────────────────────────────────
     # STEP 0: 종목 마스터 갱신 (신규 상장 / 상장폐지 자동 반영)
     # ─────────────────────────────────────────────────────────
     print("[0/2] 종목 마스터 갱신 중...")
     master_sync = {"new_listed": [], "delisted": [], "errors": []}
+    step_started, api_before, master_failed = now_kst(), _api_totals(client), False
     try:
         master_sync = sync_stock_master(conn, client)
-        if master_sync["new_listed"]:
-            codes_str = ", ".join(master_sync["new_listed"][:5])
-            suffix    = f" 외 {len(master_sync['new_listed'])-5}개" if len(master_sync["new_listed"]) > 5 else ""
-            print(f"  ✅ 신규 상장 {len(master_sync['new_listed'])}개 추가: {codes_str}{suffix}")
-        if master_sync["delisted"]:
-            codes_str = ", ".join(master_sync["delisted"][:5])
-            suffix    = f" 외 {len(master_sync['delisted'])-5}개" if len(master_sync["delisted"]) > 5 else ""
-            print(f"  ✅ 상장폐지 처리 {len(master_sync['delisted'])}개: {codes_str}{suffix}")
-        if not master_sync["new_listed"] and not master_sync["delisted"] and not master_sync["errors"]:
-            print("  ✅ 변동 없음 (신규 상장 / 상장폐지 없음)")
+        changes = [(key, label) for key, label in MASTER_CHANGES if master_sync.get(key)]
+        for key, label in changes:
+            codes_str = ", ".join(master_sync[key][:5])
+            suffix    = f" 외 {len(master_sync[key])-5}개" if len(master_sync[key]) > 5 else ""
+            print(f"  ✅ {label} {len(master_sync[key])}개: {codes_str}{suffix}")
+        if not changes and not master_sync["errors"]:
+            print("  ✅ 변동 없음 (신규 상장 / 상장폐지 / 정보 변경 없음)")
         for err in master_sync["errors"]:
             print(f"  ⚠️  {err}")
     except Exception as e:
         print(f"  ⚠️  종목 마스터 갱신 실패 (수집은 계속 진행): {e}")
         master_sync["errors"].append(str(e))
+        master_failed = True
+    calls, nbytes, waited = (a - b for a, b in zip(_api_totals(client), api_before))
+    telemetry.add("MASTER_SYNC", step_started, now_kst(),
+                  status="FAILED" if master_failed else "PARTIAL" if master_sync["errors"] else "SUCCESS",
+                  records_count=sum(len(master_sync.get(key, [])) for key, _ in MASTER_CHANGES),
+                  error_message="; ".join(master_sync["errors"]) or None,
+                  api_calls=calls, api_bytes=nbytes, throttle_wait=waited,
+                  db_write_seconds=master_sync.get("db_seconds"))
 
     if missing_only and target_date:
         all_stocks   = get_missing_ohlcv_stocks(conn, target_date)
@@ -401,7 +823,6 @@ def run_update(target_date: date = None, missing_only: bool = False) -> dict:
     else:
         all_stocks   = get_stocks(conn, include_etf=True)
         kospi_kosdaq = get_stocks(conn, include_etf=False)
-    code_to_name = {c: n for c, n in all_stocks}
 
     total_stocks    = len(all_stocks)
     investor_stocks = len(kospi_kosdaq)
@@ -412,8 +833,46 @@ def run_update(target_date: date = None, missing_only: bool = False) -> dict:
     print(f"  전체 종목: {total_stocks}개 | 수급 대상: {investor_stocks}개")
     print(f"{'='*70}\n")
 
-    # 전일 종가 (급등락 감지용)
-    prev_close = get_prev_close(conn, start_date)
+    # 하루치 업데이트는 /api/stock/info 스냅샷 (페이지당 INFO_PAGE_SIZE종목), 기간이면 hist
+    if settings.INFOMAX_SNAPSHOT_ENABLED and start_date == end_date:
+        ohlcv_endpoint, ohlcv_fetch, ohlcv_page = "/api/stock/info", _fetch_snapshot_batch, INFO_PAGE_SIZE
+    else:
+        ohlcv_endpoint, ohlcv_fetch, ohlcv_page = "/api/stock/hist", _fetch_hist_batch, HIST_BATCH_SIZE
+    hist_chunks     = chunked(all_stocks, ohlcv_page)
+    investor_chunks = chunked(kospi_kosdaq, INVESTOR_BATCH_SIZE)
+    # hist/investor 는 한 요청 최대 30일 → 긴 기간(장기 미실행 후 자동 감지 등)은 창으로 나눠 요청
+    windows = split_windows(start_date, end_date)
+    if len(windows) > 1:
+        print(f"  기간 {(end_date - start_date).days + 1}일 → {len(windows)}개 창으로 분할 수집")
+    skip = {name: {(code, s) for endpoint, code, s in done_units if endpoint == name}
+            for name in ("ohlcv", "investor")}
+
+    # ── 일일 사용량 한도 검토 ──────────────────────────────────
+    # 예상 바이트가 남은 한도를 넘는 단계는 연기, 모든 단계가 넘으면 중단 (QuotaExceededError)
+    n_days = max(1, business_days(start_date, end_date))
+    try:
+        ohlcv_n, ohlcv_req = _remaining_work(all_stocks, windows, skip["ohlcv"], ohlcv_page)
+        inv_n, inv_req     = _remaining_work(kospi_kosdaq, windows, skip["investor"], INVESTOR_BATCH_SIZE)
+        quota_plan = QuotaPlanner(client.usage).require([
+            (ohlcv_endpoint,        ohlcv_n, n_days, ohlcv_req),
+            ("/api/stock/investor", inv_n,   n_days, inv_req),
+        ])
+    except Exception:
+        # QuotaExceededError 등 → 실행 행이 RUNNING 으로 남지 않게 종료 처리 (--resume 시 다시 수행)
+        journal.finish("FAILED")
+        conn.close()
+        raise
+    print(f"  사용량 한도: 남음 {format_bytes(quota_plan['remaining'])} | 예상 "
+          + ", ".join(f"{ep.rsplit('/', 1)[-1]} {format_bytes(b)}" for ep, b in quota_plan["estimates"].items()))
+    if ohlcv_endpoint in quota_plan["deferred"]:
+        print("  ⚠️  OHLCV 수집 연기 (일일 사용량 한도 초과 예상)")
+        hist_chunks = []
+    if "/api/stock/investor" in quota_plan["deferred"]:
+        print("  ⚠️  투자자별 수급 수집 연기 (일일 사용량 한도 초과 예상)")
+        investor_chunks = []
+
+    # 전일 종가 (급등락 감지용) — latest_close 캐시에서 기준일 직전 종가
+    prev_close = prev_close_as_of(conn, start_date)
 
     # ── 결과 집계 변수 ─────────────────────────────────────────
     result = {
@@ -424,150 +883,178 @@ def run_update(target_date: date = None, missing_only: bool = False) -> dict:
         "ohlcv":          {"success": 0, "fail": 0, "rows": 0, "changed": 0, "skipped": 0, "fail_codes": []},
         "market_cap":     {"rows": 0, "changed": 0, "skipped": 0},
         "investor":       {"success": 0, "fail": 0, "rows": 0, "changed": 0, "skipped": 0, "fail_codes": []},
-        "ohlcv_data":     [],   # 분석용 raw rows
-        "investor_data":  [],   # 분석용 raw rows
         "anomalies":      [],
         "errors":         [],
+        "quota_plan":     quota_plan,
+        "ohlcv_source":   ohlcv_endpoint,
     }
 
     # ─────────────────────────────────────────────────────────
-    # STEP 1: OHLCV + 시가총액 수집 (전 종목, 병렬)
+    # STEP 1~2: OHLCV + 시가총액 / 투자자별 수급 수집 (한 스케줄러에서 섞어 병렬)
+    # 두 endpoint 작업을 공유 rate limiter 아래 번갈아 제출 → 한쪽 꼬리 구간에도 한도가 놀지 않음
+    # 수집 루프는 디코딩 후 writer 큐에 put 만 하고 다음 묶음으로 진행 (저장은 writer 스레드)
     # ─────────────────────────────────────────────────────────
-    print(f"[1/2] OHLCV + 시가총액 수집 ({total_stocks}개 종목, workers={MAX_WORKERS})...")
-
-    ohlcv_batch  = []
-    mktcap_batch = []
-    all_ohlcv_rows = []
-    done_count = 0
-
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {
-            executor.submit(_fetch_hist, client, code, name, start_date, end_date): code
-            for code, name in all_stocks
-        }
-        for future in as_completed(futures):
-            code, name, rows = future.result()
-            done_count += 1
-
-            if not rows:
-                result["ohlcv"]["fail"] += 1
-                result["ohlcv"]["fail_codes"].append(code)
+    print(f"[1/2] OHLCV + 시가총액 ({total_stocks}개 종목, {ohlcv_endpoint} "
+          f"{len(hist_chunks)}개 묶음 × 최대 {ohlcv_page}종목)")
+    print(f"[2/2] 투자자별 수급 ({investor_stocks}개 종목, "
+          f"{len(investor_chunks)}개 묶음 × 최대 {INVESTOR_BATCH_SIZE}종목)")
+    print(f"  → {len(windows)}개 창, 동시 수집 ({_engine_label(engine)})...")
+
+    hist_retry     = RetryQueue.from_settings()
+    investor_retry = RetryQueue.from_settings()
+    streams = [
+        WorkStream("ohlcv", ohlcv_fetch, hist_chunks, windows, ohlcv_page, hist_retry,
+                   skip=skip["ohlcv"]),
+        WorkStream("investor", _fetch_investor_batch, investor_chunks, windows,
+                   INVESTOR_BATCH_SIZE, investor_retry, skip=skip["investor"]),
+    ]
+    apply_schedule(streams, settings.INFOMAX_SCHEDULE_PRIORITY, settings.INFOMAX_SCHEDULE_WEIGHTS)
+    scheduler = WorkScheduler(streams)
+
+    # 특이사항은 묶음이 올 때마다 판정 (원본 행을 모아 두지 않음 → 메모리는 묶음 크기 수준)
+    collector = ChunkCollector(engine, client, journal, AnomalyAccumulator(prev_close))
+    failed = collector.failed
+    fetchers = {"ohlcv": (ohlcv_fetch, ohlcv_page), "investor": (_fetch_investor_batch, INVESTOR_BATCH_SIZE)}
+    specs = []
+    if workers > 1:
+        specs = shard_specs(workers,
+                            {"ohlcv":    (ohlcv_fetch, hist_chunks, ohlcv_page),
+                             "investor": (_fetch_investor_batch, investor_chunks, INVESTOR_BATCH_SIZE)},
+                            skip, prev_close, engine=engine, run_id=journal.run_id,
+                            start=start_date, end=end_date, windows=windows)
+    shards = []
+
+    # 재조회 대상: 이번 실행의 수집 대상 종목 (사용량 한도로 연기된 단계는 제외)
+    universe = {"ohlcv":    {c for chunk in hist_chunks for c, _ in chunk},
+                "investor": {c for chunk in investor_chunks for c, _ in chunk}}
+    last_probe = {}
+
+    def probe() -> tuple[float, dict]:
+        writer.flush()
+        coverage, missing = repoll_probe(conn, universe, start_date, end_date, windows)
+        last_probe.update(missing)
+        print(f"  [재조회] 수집률 {coverage:.2%} (누락 "
+              + ", ".join(f"{COLLECT_LABELS[n]} {len(st)}종목" for n, (st, _) in missing.items()) + ")")
+        return coverage, missing
+
+    def poll(missing: dict):
+        streams = []
+        for name, (stocks, filled) in missing.items():
+            if stocks:
+                fetch_fn, page = fetchers[name]
+                streams.append(WorkStream(name, fetch_fn, chunked(stocks, page), windows, page,
+                                          RetryQueue.from_settings(), skip=filled))
+        collector.collect(WorkScheduler(streams), writer)
+
+    collect_started = now_kst()
+    try:
+        with DbWriter.from_settings(get_conn, upsert_batch) as writer:
+            if specs:
+                print(f"  → {len(specs)}개 샤드 프로세스로 분할 수집 "
+                      f"({'공유 rate limit' if throttle else 'rate limit 없음 — 로컬 재생'})")
+                shards = run_shards(specs, throttle)
+                for shard in shards:
+                    collector.merge(shard)
+                for name in ("ohlcv", "investor"):
+                    success, fail = collector.counts(name)
+                    print(f"  ✅ {COLLECT_LABELS[name]} 수집 완료 (성공:{success} 실패:{fail})")
             else:
-                result["ohlcv"]["success"] += 1
-                for r in rows:
-                    if r["date"] is None:
-                        continue
-                    r["stock_name"] = name
-                    all_ohlcv_rows.append(r)
-
-                    ohlcv_batch.append((
-                        r["date"], r["stock_code"],
-                        r["open_price"], r["high_price"],
-                        r["low_price"],  r["close_price"],
-                        r["volume"],     r["trading_value"],
-                    ))
-
-                    if r["close_price"] and r["listed_shares"]:
-                        mkt_cap = r["close_price"] * r["listed_shares"]
-                        mktcap_batch.append((r["date"], r["stock_code"], mkt_cap))
-
-            # 배치 저장 (500건마다, 메인 스레드에서만 실행)
-            if len(ohlcv_batch) >= 500:
-                ch, tot = upsert_batch(conn, OHLCV_SQL, ohlcv_batch)
-                result["ohlcv"]["changed"] += ch
-                result["ohlcv"]["skipped"] += tot - ch
-                result["ohlcv"]["rows"]    += tot
-                ohlcv_batch.clear()
-            if len(mktcap_batch) >= 500:
-                ch, tot = upsert_batch(conn, MKTCAP_SQL, mktcap_batch)
-                result["market_cap"]["changed"] += ch
-                result["market_cap"]["skipped"] += tot - ch
-                result["market_cap"]["rows"]    += tot
-                mktcap_batch.clear()
-
-            if done_count % 500 == 0 or done_count == total_stocks:
-                print(f"  [{done_count:4}/{total_stocks}] 진행 중... (성공:{result['ohlcv']['success']} 실패:{result['ohlcv']['fail']})")
-
-    # 잔여 저장
-    if ohlcv_batch:
-        ch, tot = upsert_batch(conn, OHLCV_SQL, ohlcv_batch)
-        result["ohlcv"]["changed"] += ch
-        result["ohlcv"]["skipped"] += tot - ch
-        result["ohlcv"]["rows"]    += tot
-    if mktcap_batch:
-        ch, tot = upsert_batch(conn, MKTCAP_SQL, mktcap_batch)
-        result["market_cap"]["changed"] += ch
-        result["market_cap"]["skipped"] += tot - ch
-        result["market_cap"]["rows"]    += tot
-
-    result["ohlcv_data"] = all_ohlcv_rows
-    print(f"  ✅ OHLCV {result['ohlcv']['rows']:,}건 저장 (변경:{result['ohlcv']['changed']:,} / 스킵:{result['ohlcv']['skipped']:,})")
+                collector.collect(scheduler, writer)
+
+            # 늦게 올라오는 데이터(연휴 직후 등): 누락 종목만 백오프 간격으로 다시 요청
+            if repoll and (failed["ohlcv"] or failed["investor"]):
+                print(f"\n[재조회] 누락 종목 재요청 (목표 {settings.DAILY_REPOLL_TARGET:.1%}, "
+                      f"최대 {settings.DAILY_REPOLL_MAX_MINUTES}분)")
+                before = len(failed["ohlcv"]) + len(failed["investor"])
+                result["repoll"] = poll_until(
+                    probe, poll, settings.DAILY_REPOLL_TARGET,
+                    time.monotonic() + settings.DAILY_REPOLL_MAX_MINUTES * 60,
+                    settings.DAILY_REPOLL_BASE_WAIT, settings.DAILY_REPOLL_MAX_WAIT)
+                # 마지막 확인에서도 누락인 종목만 실패로 남김
+                for name, (stocks, _) in last_probe.items():
+                    collector.keep_failed(name, {c for c, _ in stocks})
+                result["repoll"]["recovered"] = before - len(failed["ohlcv"]) - len(failed["investor"])
+    except Exception as e:
+        # 중단된 수집도 단계 로그를 남김 (--resume 으로 이어받기)
+        for data_type in ("OHLCV", "MARKET_CAP", "INVESTOR"):
+            telemetry.add(data_type, collect_started, now_kst(), status="FAILED",
+                          error_message=f"{type(e).__name__}: {e}")
+        _save_telemetry(conn, telemetry)
+        raise
+    collect_completed = now_kst()
+
+    for name in ("ohlcv", "investor"):
+        result[name]["success"], result[name]["fail"] = collector.counts(name)
+        result[name]["fail_codes"] = collector.fail_codes[name]
+    result["ohlcv"]["retry"]    = merge_stats([hist_retry.stats()] + [s["retry"]["ohlcv"] for s in shards])
+    result["investor"]["retry"] = merge_stats([investor_retry.stats()] + [s["retry"]["investor"] for s in shards])
+
+    # writer 종료 = 남은 행까지 모두 커밋됨 → 테이블별 저장 건수 반영 (샤드 worker 저장분 합산)
+    writer_stats = [writer.stats()] + [s["writer"] for s in shards]
+    result["writer"] = merge_stats(writer_stats)
+    depths = [w["avg_queue_depth"] for w in writer_stats if w["batches"]]
+    result["writer"]["avg_queue_depth"] = sum(depths) / len(depths) if depths else 0.0
+    tables = result["writer"].pop("tables")
+    for key in ("ohlcv", "market_cap", "investor"):
+        result[key].update(tables.get(key, {}))
+    result["market_cap"]["source"] = dict(collector.mktcap_source)
+    if shards:
+        result["shards"] = {"workers": len(shards), "throttle": throttle}
+    # 최근 종가 캐시 갱신 (이어받기로 건너뛴 종목도 포함 — 중단된 실행의 갱신 누락 복구)
+    if collector.seen["ohlcv"] or done_units:
+        refresh_latest_close(conn, [code for code, _ in all_stocks])
+    journal.finish("PARTIAL" if failed["ohlcv"] or failed["investor"] or quota_plan["deferred"]
+                   else "SUCCESS")
+    result["resume"] = {"run_id": journal.run_id, "resumed": bool(done_units),
+                        "skipped": sum(s.skipped for s in streams)}
+    print(f"\n  ✅ OHLCV {result['ohlcv']['rows']:,}건 저장 (변경:{result['ohlcv']['changed']:,} / 스킵:{result['ohlcv']['skipped']:,})")
     print(f"  ✅ 시가총액 {result['market_cap']['rows']:,}건 저장 (변경:{result['market_cap']['changed']:,} / 스킵:{result['market_cap']['skipped']:,})")
-
-    # ─────────────────────────────────────────────────────────
-    # STEP 2: 투자자별 수급 수집 (KOSPI + KOSDAQ, 병렬)
-    # ─────────────────────────────────────────────────────────
-    print(f"\n[2/2] 투자자별 수급 수집 ({investor_stocks}개 종목, workers={MAX_WORKERS})...")
-
-    investor_batch    = []
-    all_investor_rows = []
-    done_count = 0
-
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {
-            executor.submit(_fetch_investor, client, code, name, start_date, end_date): code
-            for code, name in kospi_kosdaq
-        }
-        for future in as_completed(futures):
-            code, name, rows = future.result()
-            done_count += 1
-
-            if not rows:
-                result["investor"]["fail"] += 1
-                result["investor"]["fail_codes"].append(code)
-            else:
-                result["investor"]["success"] += 1
-                for r in rows:
-                    if r["date"] is None:
-                        continue
-                    r["stock_name"] = name
-                    all_investor_rows.append(r)
-                    investor_batch.append((
-                        r["date"], r["stock_code"], r["investor_type"],
-                        r["net_buy_value"], r["net_buy_volume"],
-                    ))
-
-            if len(investor_batch) >= 500:
-                ch, tot = upsert_batch(conn, INVESTOR_SQL, investor_batch)
-                result["investor"]["changed"] += ch
-                result["investor"]["skipped"] += tot - ch
-                result["investor"]["rows"]    += tot
-                investor_batch.clear()
-
-            if done_count % 500 == 0 or done_count == investor_stocks:
-                print(f"  [{done_count:4}/{investor_stocks}] 진행 중... (성공:{result['investor']['success']} 실패:{result['investor']['fail']})")
-
-    if investor_batch:
-        ch, tot = upsert_batch(conn, INVESTOR_SQL, investor_batch)
-        result["investor"]["changed"] += ch
-        result["investor"]["skipped"] += tot - ch
-        result["investor"]["rows"]    += tot
-
-    result["investor_data"] = all_investor_rows
     print(f"  ✅ 수급 {result['investor']['rows']:,}건 저장 (변경:{result['investor']['changed']:,} / 스킵:{result['investor']['skipped']:,})")
 
     # ─────────────────────────────────────────────────────────
     # STEP 3: 특이사항 분석
     # ─────────────────────────────────────────────────────────
     print("\n[분석] 특이사항 감지 중...")
-    result["anomalies"] = analyze_anomalies(
-        result["ohlcv_data"],
-        result["investor_data"],
-        prev_close,
-    )
+    with telemetry.step("ANOMALY") as step:
+        # 창 경계 첫 거래일 등락률 확정 (샤드 worker 결과와 합쳐 날짜·종목 순)
+        result["anomalies"] = sorted(collector.detector.finish() + [a for s in shards for a in s["anomalies"]],
+                                     key=lambda a: (a["date"], a["stock_code"]))
+        step["records_count"] = len(result["anomalies"])
     print(f"  ✅ 특이사항 {len(result['anomalies'])}건 감지")
 
+    # API 통계 (샤드 worker 호출분 합산)
+    api_stats = [_client_stats(client)] + shards
+    throttle_stats = merge_stats([s["throttle"] for s in api_stats])
+    throttle_stats["avg_wait"] = (throttle_stats["total_wait"] / throttle_stats["calls"]
+                                  if throttle_stats["calls"] else 0.0)
+    result["usage"] = {
+        "run":         merge_stats([s["usage"] for s in api_stats]),
+        "today_bytes": client.usage.used_bytes(),
+        "limit_bytes": client.usage.daily_limit_bytes,
+    }
+    result["throttle"] = throttle_stats
+    if client.cache:
+        cache = merge_stats([s["cache"] for s in api_stats])
+        lookups = cache["hits"] + cache["misses"]
+        result["cache"] = {**cache, "hit_rate": cache["hits"] / lookups if lookups else 0.0}
+
+    # 수집 단계 로그 — endpoint별 호출·대기, 테이블별 DB 쓰기 시간 (시가총액은 OHLCV 응답에서 추출)
+    waits = merge_stats([s["wait"] for s in api_stats])
+    key_seconds = result["writer"].get("key_seconds", {})
+    steps = [("OHLCV",      "ohlcv",      ohlcv_endpoint,        result["ohlcv"]["fail_codes"]),
+             ("MARKET_CAP", "market_cap", None,                  result["ohlcv"]["fail_codes"]),
+             ("INVESTOR",   "investor",   "/api/stock/investor", result["investor"]["fail_codes"])]
+    for data_type, key, endpoint, fail_codes in steps:
+        status, error = _step_status(fail_codes, (endpoint or ohlcv_endpoint) in quota_plan["deferred"])
+        usage = result["usage"]["run"].get(endpoint, {})
+        telemetry.add(data_type, collect_started, collect_completed, status=status,
+                      records_count=result[key].get("rows", 0), error_message=error,
+                      api_calls=usage.get("requests", 0) if endpoint else None,
+                      api_bytes=usage.get("bytes", 0) if endpoint else None,
+                      throttle_wait=waits.get(endpoint, 0.0) if endpoint else None,
+                      db_write_seconds=key_seconds.get(key, 0.0))
     result["finished_at"] = datetime.now(KST)
+    _save_telemetry(conn, telemetry)
     conn.close()
     return result
 
@@ -607,6 +1094,67 @@ def generate_report(result: dict) -> str:
     lines.append(f"  완료 일시 : {finished.strftime('%Y-%m-%d %H:%M:%S KST')}")
     lines.append(f"  소요 시간 : {int(elapsed//3600)}시간 {int(elapsed%3600//60)}분 {int(elapsed%60)}초")
     lines.append(f"  업데이트 기간 : {s_date} ~ {e_date}")
+    resume = result.get("resume")
+    if resume and resume["resumed"]:
+        lines.append(f"  이어받기  : 실행 #{resume['run_id']}, 저장 완료 {resume['skipped']:,}개 (종목, 창) 건너뜀")
+    throttle = result.get("throttle")
+    if throttle:
+        lines.append(
+            f"  API 호출  : {throttle['calls']:,}회 "
+            f"(한도 {throttle['rate_per_min']:.0f}회/분, "
+            f"대기 합계 {throttle['total_wait']:.0f}초 / 평균 {throttle['avg_wait']:.2f}초 / 최대 {throttle['max_wait']:.2f}초)"
+        )
+        adaptive = throttle.get("adaptive")
+        if adaptive and (adaptive["throttled"] or adaptive["timeouts"]):
+            lines.append(
+                f"  속도 조절 : 429 {adaptive['throttled']}회 / timeout {adaptive['timeouts']}회 → "
+                f"감속 {adaptive['decreases']}회 (최저 {adaptive['min_rate_seen']:.0f}회/분), "
+                f"가속 {adaptive['increases']}회, 종료 시 {adaptive['effective_rate']:.0f}회/분"
+            )
+        breaker = throttle.get("breaker")
+        if breaker and breaker["trips"]:
+            lines.append(
+                f"  장애 정지 : 서킷 브레이커 {breaker['trips']}회 열림 "
+                f"(전체 일시정지 합계 {breaker['paused_seconds']:.0f}초)"
+            )
+    usage = result.get("usage")
+    if usage:
+        run_bytes = sum(e["bytes"] for e in usage["run"].values())
+        lines.append(
+            f"  API 사용량 : {format_bytes(run_bytes)} "
+            f"(당일 누적 {format_bytes(usage['today_bytes'])} / 한도 {format_bytes(usage['limit_bytes'])})"
+        )
+        for endpoint, e in sorted(usage["run"].items()):
+            lines.append(f"    {endpoint:<22} {e['requests']:>6,}회  {format_bytes(e['bytes']):>10}")
+    cache = result.get("cache")
+    if cache:
+        lines.append(
+            f"  응답 캐시 : 적중 {cache['hits']:,}회 / 미적중 {cache['misses']:,}회 "
+            f"(적중률 {cache['hit_rate']:.0%}, 저장 {cache['stores']:,}건, "
+            f"삭제 {cache['evictions']:,}건, 크기 {format_bytes(cache['size_bytes'])})"
+        )
+    writer = result.get("writer")
+    if writer:
+        lines.append(
+            f"  DB 저장   : {writer['batches']:,}회 쓰기 / {writer['write_seconds']:.0f}초 "
+            f"(큐 평균 {writer['avg_queue_depth']:.1f} / 최대 {writer['max_queue_depth']}묶음, "
+            f"수집 대기 {writer['producer_wait']:.0f}초, 저장 유휴 {writer['writer_idle']:.0f}초, "
+            f"종료 시 묶음 {writer['batch_rows']:,}행)"
+        )
+    shards = result.get("shards")
+    if shards:
+        lines.append(f"  샤드 수집 : 프로세스 {shards['workers']}개 "
+                     f"({'공유 rate limit' if shards['throttle'] else 'rate limit 없음 — 로컬 재생'})")
+    repoll = result.get("repoll")
+    if repoll:
+        lines.append(
+            f"  재조회    : {repoll['rounds']}회 / 대기 {repoll['waited']:.0f}초 → "
+            f"수집률 {repoll['coverage']:.2%}, 복구 {repoll['recovered']}종목 "
+            f"({'목표 도달' if repoll['stopped'] == 'target' else '마감'})"
+        )
+    deferred = result.get("quota_plan", {}).get("deferred", [])
+    if deferred:
+        lines.append(f"  ⚠️  사용량 한도로 연기된 수집: {', '.join(deferred)}")
     lines.append("")
 
     # ── 종목 마스터 갱신 ───────────────────────────────────────
@@ -629,6 +1177,13 @@ def generate_report(result: dict) -> str:
     else:
         lines.append("  상장폐지   : 없음")
 
+    for key, label in (("renamed", "종목명 변경"), ("market_changed", "시장 변경  "),
+                       ("isin_changed", "ISIN 변경  ")):
+        codes = master_sync.get(key, [])
+        if codes:
+            suffix = f" 외 {len(codes)-10}개" if len(codes) > 10 else ""
+            lines.append(f"  {label}: {len(codes)}개  →  {', '.join(codes[:10])}{suffix}")
+
     if ms_errors:
         for err in ms_errors:
             lines.append(f"  ⚠️  {err}")
@@ -668,6 +1223,10 @@ def generate_report(result: dict) -> str:
     lines.append(f"    신규/변경  : {ohlcv['changed']:,}건")
     lines.append(f"    스킵(동일) : {ohlcv['skipped']:,}건")
     lines.append(f"    성공 종목  : {ohlcv['success']:,}개")
+    if ohlcv.get('retry', {}).get('deferred'):
+        retry = ohlcv['retry']
+        lines.append(f"    재시도     : {retry['deferred']:,}개 종목 지연 재시도 → {retry['recovered']:,}개 복구 "
+                     f"({retry['rounds']}라운드, 대기 {retry['waited']:.0f}초)")
     lines.append(f"    실패 종목  : {ohlcv['fail']:,}개")
     if ohlcv['fail_codes']:
         codes_str = ', '.join(ohlcv['fail_codes'][:20])
@@ -678,13 +1237,19 @@ def generate_report(result: dict) -> str:
     lines.append(f"    전체 건수  : {mktcap['rows']:,}건")
     lines.append(f"    신규/변경  : {mktcap['changed']:,}건")
     lines.append(f"    스킵(동일) : {mktcap['skipped']:,}건")
-    lines.append(f"    산출 방식  : close_price × listed_shares (hist API)")
+    source = mktcap.get("source", {})
+    lines.append(f"    산출 방식  : API market_cap {source.get('api', 0):,}건 / "
+                 f"close_price × listed_shares {source.get('computed', 0):,}건")
 
     lines.append(f"\n  [investor_trading]")
     lines.append(f"    전체 건수  : {investor['rows']:,}건")
     lines.append(f"    신규/변경  : {investor['changed']:,}건")
     lines.append(f"    스킵(동일) : {investor['skipped']:,}건")
     lines.append(f"    성공 종목  : {investor['success']:,}개")
+    if investor.get('retry', {}).get('deferred'):
+        retry = investor['retry']
+        lines.append(f"    재시도     : {retry['deferred']:,}개 종목 지연 재시도 → {retry['recovered']:,}개 복구 "
+                     f"({retry['rounds']}라운드, 대기 {retry['waited']:.0f}초)")
     lines.append(f"    실패 종목  : {investor['fail']:,}개")
     if investor['fail_codes']:
         codes_str = ', '.join(investor['fail_codes'][:20])
@@ -703,10 +1268,8 @@ def generate_report(result: dict) -> str:
         for a in anomalies:
             by_type[a["type"]].append(a)
 
-        type_order = ["거래정지", "OHLCV오류", "가격급등", "가격급락",
-                      "대규모순매수", "대규모순매도"]
         sorted_types = sorted(by_type.keys(),
-                              key=lambda t: type_order.index(t) if t in type_order else 99)
+                              key=lambda t: TYPE_ORDER.index(t) if t in TYPE_ORDER else 99)
 
         lines.append(f"\n  총 {len(anomalies)}건의 특이사항이 감지되었습니다.\n")
 
@@ -764,9 +1327,10 @@ def save_report(report_text: str, target_date: date) -> Path:
 
 
 # ── 진입점 ────────────────────────────────────────────────────────────────
-def main(target_date: date = None, missing_only: bool = False):
+def main(target_date: date = None, missing_only: bool = False, engine: str = None,
+         resume: bool = False, repoll: bool = None, workers: int = None, throttle: bool = None):
     try:
-        result = run_update(target_date, missing_only)
+        result = run_update(target_date, missing_only, engine, resume, repoll, workers, throttle)
         report = generate_report(result)
 
         # 콘솔 출력
@@ -777,13 +1341,24 @@ def main(target_date: date = None, missing_only: bool = False):
         fpath = save_report(report, end_date)
         print(f"\n📁 보고서 저장: {fpath}")
 
-        # 품질 체크 (수집 완료 후 자동 실행)
+        # 품질 체크 (수집 완료 후 자동 실행) — 같은 실행의 단계 로그로 기록
+        telemetry = CollectionLog(result["resume"]["run_id"], end_date)
         try:
-            run_quality_checks(end_date)
+            with telemetry.step("QUALITY_CHECK") as step:
+                checks = run_quality_checks(end_date)
+                step["records_count"] = len(checks)
+                step["error_message"] = "; ".join(
+                    f"{c['table']} {c['type']} {c['issue_count']}건" for c in checks if c.get("issue_count")
+                ) or None
         except Exception as qc_err:
             print(f"\n⚠️  품질 체크 중 오류 (업데이트 결과에는 영향 없음): {qc_err}")
+        conn = get_conn()
+        try:
+            _save_telemetry(conn, telemetry)
+        finally:
+            conn.close()
 
-    except Exception as e:
+    except Exception:
         err_msg = traceback.format_exc()
         print(f"\n❌ 업데이트 중 오류 발생:\n{err_msg}", file=sys.stderr)
         # 오류 보고서 저장
@@ -795,21 +1370,33 @@ def main(target_date: date = None, missing_only: bool = False):
 
 
 if __name__ == "__main__":
-    # --missing-only 플래그 파싱
+    # --missing-only / --async / --resume / --repoll / --workers=N / --no-throttle 플래그 파싱
     missing_only_flag = "--missing-only" in sys.argv
+    resume_flag = "--resume" in sys.argv
+    repoll_flag = True if "--repoll" in sys.argv else None
+    throttle_flag = False if "--no-throttle" in sys.argv else None
+    workers_args = [a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--workers=")]
+    engine_arg = "async" if "--async" in sys.argv else None
     date_args = [a for a in sys.argv[1:] if not a.startswith("--")]
 
     if date_args:
         try:
             td = datetime.strptime(date_args[0], "%Y%m%d").date()
         except ValueError:
-            print("날짜 형식 오류. 사용법: python daily_update.py YYYYMMDD [--missing-only]")
+            print("날짜 형식 오류. 사용법: python daily_update.py YYYYMMDD [--missing-only] [--async] [--resume] [--repoll] "
+                  "[--workers=N] [--no-throttle]")
             sys.exit(1)
     else:
         td = None
 
+    try:
+        workers_arg = int(workers_args[0]) if workers_args else None
+    except ValueError:
+        print("--workers=N 은 정수로 지정해야 합니다.")
+        sys.exit(1)
+
     if missing_only_flag and td is None:
         print("--missing-only는 날짜 지정 시에만 사용 가능합니다.")
         sys.exit(1)
 
-    main(td, missing_only_flag)
+    main(td, missing_only_flag, engine_arg, resume_flag, repoll_flag, workers_arg, throttle_flag)
@@ -0,0 +1,150 @@
+"""
+AsyncInfomaxClient 테스트
+
+- 복수 종목 분배/분할 규칙이 동기 InfomaxClient와 같은지 (가짜 _get)
+- 로컬 aiohttp 서버를 상대로 실제 HTTP 요청·응답 파싱
+"""
+
+import asyncio
+from datetime import date
+
+from aiohttp import web
+
+import collectors.async_infomax as async_infomax
+from collectors.async_infomax import AsyncInfomaxClient
+from collectors.infomax import REJECTED
+from collectors.quota import UsageLedger
+
+
+START = date(2026, 2, 19)
+END   = date(2026, 2, 20)
+
+
+def hist_row(code):
+    return {"date": "20260220", "code": code, "open_price": 100, "high_price": 110,
+            "low_price": 90, "close_price": 105, "trading_volume": 10,
+            "trading_value": 1050, "listed_shares": 1000}
+
+
+class FakeAsyncClient(AsyncInfomaxClient):
+    """_get 호출을 기록하고 handler 응답을 돌려주는 테스트용 클라이언트"""
+
+    def __init__(self, handler):
+        super().__init__(concurrency=4)
+        self.handler = handler
+        self.calls = []
+
+    async def _get(self, endpoint, params):
+        self.calls.append(params["code"])
+        return self.handler(endpoint, params)
+
+
+class TestAsyncBatch:
+    """async 복수 종목 일괄 조회 테스트"""
+
+    def test_batch_split_on_failure(self):
+        """묶음 실패 시 절반씩 나눠 재요청 (동기 클라이언트와 같은 결과)"""
+        def handler(endpoint, params):
+            if "BAD000" in params["code"]:
+                return None
+            return {"success": True, "results": [hist_row(c) for c in params["code"].split(",")]}
+        client = FakeAsyncClient(handler)
+        codes = ["005930", "000660", "BAD000", "035420"]
+
+        result = asyncio.run(client.get_hist_batch(codes, START, END, batch_size=4))
+
+        assert result["BAD000"] == []
+        assert all(result[c] for c in ("005930", "000660", "035420"))
+        assert sorted(client.calls) == sorted(["005930,000660,BAD000,035420", "005930,000660",
+                                               "BAD000,035420", "BAD000", "035420"])
+
+    def test_investor_degrades_to_single(self):
+        """investor 묶음 요청이 거부되면 단일 종목 요청으로 전환"""
+        def handler(endpoint, params):
+            if "," in params["code"]:
+                return REJECTED
+            return {"success": True, "results": [
+                {"date": "20260220", "code": params["code"], "investor": "개인",
+                 "bid_value": 5, "ask_value": 2, "bid_volume": 1, "ask_volume": 0},
+            ]}
+        client = FakeAsyncClient(handler)
+
+        result = asyncio.run(client.get_investor_batch(["005930", "000660"], START, END))
+
+        assert result["005930"][0]["investor_type"] == "RETAIL"
+        assert result["000660"][0]["net_buy_value"] == 3
+
+
+class TestAsyncHttp:
+    """로컬 서버 상대 실제 HTTP 테스트"""
+
+    def test_get_hist_batch_over_http(self, monkeypatch, tmp_path):
+        received = []
+        ledger = UsageLedger(tmp_path, daily_limit_bytes=10**9)
+        monkeypatch.setattr(AsyncInfomaxClient, "usage", ledger)
+
+        async def hist(request):
+            received.append(request.query["code"])
+            codes = request.query["code"].split(",")
+            return web.json_response({"success": True, "results": [hist_row(c) for c in codes]})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/api/stock/hist", hist)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            monkeypatch.setattr(async_infomax, "BASE_URL", f"http://127.0.0.1:{port}")
+            try:
+                async with AsyncInfomaxClient(concurrency=2) as client:
+                    return await client.get_hist_batch(["005930", "000660", "035420"],
+                                                       START, END, batch_size=2)
+            finally:
+                await runner.cleanup()
+
+        result = asyncio.run(scenario())
+
+        assert sorted(received) == ["005930,000660", "035420"]
+        assert result["035420"][0]["close_price"] == 105
+        assert result["005930"][0]["date"] == date(2026, 2, 20)
+        assert ledger.run_usage()["/api/stock/hist"]["requests"] == 2
+
+    def test_non_json_200_is_retried(self, monkeypatch, tmp_path):
+        """200 이지만 JSON 이 아닌 응답(점검 페이지) → 장애로 기록하고 재시도"""
+        received = []
+        ledger = UsageLedger(tmp_path, daily_limit_bytes=10**9)
+        monkeypatch.setattr(AsyncInfomaxClient, "usage", ledger)
+
+        async def hist(request):
+            received.append(request.query["code"])
+            if len(received) == 1:
+                return web.Response(text="<html>점검 중</html>", content_type="text/html")
+            return web.json_response({"success": True, "results": [hist_row("005930")]})
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/api/stock/hist", hist)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            monkeypatch.setattr(async_infomax, "BASE_URL", f"http://127.0.0.1:{port}")
+            try:
+                async with AsyncInfomaxClient(concurrency=1) as client:
+                    failures = []
+                    monkeypatch.setattr(client.breaker, "record_failure", lambda: failures.append(1))
+                    rows = await client.get_hist("005930", START, END)
+                    return rows, failures
+            finally:
+                await runner.cleanup()
+
+        rows, failures = asyncio.run(scenario())
+
+        # Then: 예외 없이 두 번째 응답으로 성공, 첫 응답은 장애 1회
+        assert received == ["005930", "005930"]
+        assert rows[0]["close_price"] == 105
+        assert failures == [1]
+        assert ledger.run_usage()["/api/stock/hist"]["requests"] == 2
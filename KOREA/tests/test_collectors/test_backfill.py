@@ -0,0 +1,224 @@
+"""
+백필 계획 테스트
+
+30일 창 분할 / 누락 종목 판정·사용량 한도 / 계획 저장·진행 로그 이어받기 / 휴장일 학습 /
+기간이 서로 다른 작업 단위 병렬 수행을 검증합니다.
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+from collectors.backfill import BackfillPlan, ClosedDays, split_windows
+from collectors.infomax import HIST_BATCH_SIZE
+from collectors.quota import QuotaPlanner, UsageLedger
+from scripts.backfill import build_units, learn_closed_days, quota_limit
+from scripts.daily_update import iter_fetch_units
+
+
+class TestSplitWindows:
+    """기간 분할 테스트"""
+
+    def test_splits_into_30_day_windows(self):
+        windows = split_windows(date(2026, 1, 1), date(2026, 3, 5), max_days=30)
+
+        assert windows == [(date(2026, 1, 1), date(2026, 1, 30)),
+                           (date(2026, 1, 31), date(2026, 3, 1)),
+                           (date(2026, 3, 2), date(2026, 3, 5))]
+
+    def test_short_and_empty_ranges(self):
+        assert split_windows(date(2026, 1, 1), date(2026, 1, 1)) == [(date(2026, 1, 1), date(2026, 1, 1))]
+        assert split_windows(date(2026, 1, 2), date(2026, 1, 1)) == []
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((" ".join(sql.split()), params))
+
+    def fetchall(self):
+        return self.conn.results.pop(0)
+
+
+class FakeConn:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class TestBuildUnits:
+    """창별 누락 종목 → 작업 단위 테스트"""
+
+    def test_only_incomplete_stocks_within_listing(self, tmp_path):
+        # Given: 2/16~20 창, A 는 2/20 누락 / B 는 상장 전 날짜만 없음(누락 행렬이 제외) / C 전 기간 누락
+        stocks = [("A", "a", None, None), ("B", "b", date(2026, 2, 19), None),
+                  ("C", "c", None, date(2026, 2, 19))]
+        conn = FakeConn(stocks, [("A", date(2026, 2, 20)), ("C", date(2026, 2, 16))])
+        closed = ClosedDays(tmp_path / "closed_days.json")
+        closed.add([date(2026, 2, 16), date(2026, 2, 17)])
+
+        # When
+        units = build_units(conn, date(2026, 2, 16), date(2026, 2, 20), ["ohlcv"], closed)
+
+        # Then: 학습된 휴장일 제외 거래일, 상장·폐지일 반영 (C 는 폐지 전 거래일 2/18 만 기대)
+        assert conn.executed[-1][1]["days"] == [date(2026, 2, 18), date(2026, 2, 19), date(2026, 2, 20)]
+        assert units == [{"table": "ohlcv", "start": "2026-02-16", "end": "2026-02-20",
+                          "stocks": [("A", "a")]}]
+
+    def test_no_trading_days(self, tmp_path):
+        closed = ClosedDays(tmp_path / "closed_days.json")
+        closed.add([date(2026, 2, 16)])
+        conn = FakeConn([("A", "a", None, None)], [])
+
+        assert build_units(conn, date(2026, 2, 16), date(2026, 2, 16), ["ohlcv"], closed) == []
+
+
+class TestQuotaLimit:
+    """백필 사용량 한도 — daily_update 와 같은 요청 수 기준"""
+
+    def test_request_overhead_follows_batches(self, tmp_path):
+        # Given: 한 단위 = 묶음 3개 분량 종목
+        stocks = [[f"S{i}", ""] for i in range(HIST_BATCH_SIZE * 2 + 1)]
+        unit = {"table": "ohlcv", "start": "2026-02-16", "end": "2026-02-20", "stocks": stocks}
+        closed = ClosedDays(tmp_path / "closed_days.json")
+        ledger = UsageLedger(tmp_path / "usage", daily_limit_bytes=0)
+        need = QuotaPlanner(ledger).estimate("/api/stock/hist", len(stocks), 5, 3)
+
+        # When / Then: 요청 3번 분량의 오버헤드까지 들어가야 수행
+        ledger.daily_limit_bytes = need
+        assert quota_limit([unit], SimpleNamespace(usage=ledger), closed) == 1
+        ledger.daily_limit_bytes = need - 1
+        assert quota_limit([unit], SimpleNamespace(usage=ledger), closed) == 0
+
+
+class TestClosedDays:
+    """휴장일 학습 테스트"""
+
+    def test_learned_days_are_excluded_and_persisted(self, tmp_path):
+        # Given: 2026-02-16~20 (월~금) 중 설 연휴 2일
+        closed = ClosedDays(tmp_path / "closed_days.json")
+
+        # When
+        closed.add([date(2026, 2, 16), date(2026, 2, 17)])
+
+        # Then
+        reloaded = ClosedDays(tmp_path / "closed_days.json")
+        assert reloaded.trading_days(date(2026, 2, 14), date(2026, 2, 20)) == [
+            date(2026, 2, 18), date(2026, 2, 19), date(2026, 2, 20)]
+
+    def test_remove_wrongly_learned_day(self, tmp_path):
+        closed = ClosedDays(tmp_path / "closed_days.json")
+        closed.add([date(2026, 2, 16), date(2026, 2, 17)])
+
+        assert closed.remove([date(2026, 2, 17), date(2026, 2, 18)]) == [date(2026, 2, 17)]
+        assert ClosedDays(tmp_path / "closed_days.json").days == {date(2026, 2, 16)}
+
+
+class TestLearnClosedDays:
+    """휴장일 학습 조건 테스트 (2026-02-16~20, 데이터는 2/18~20 만)"""
+
+    W_START, W_END = date(2026, 2, 16), date(2026, 2, 20)
+    PRESENT = [(date(2026, 2, 18),), (date(2026, 2, 19),), (date(2026, 2, 20),)]
+
+    def test_old_window_with_data_learns_empty_weekdays(self, tmp_path):
+        closed = ClosedDays(tmp_path / "closed_days.json")
+
+        learned = learn_closed_days(FakeConn(self.PRESENT), closed, self.W_START, self.W_END,
+                                    today=date(2026, 3, 20))
+
+        assert learned == [date(2026, 2, 16), date(2026, 2, 17)]
+
+    def test_recent_window_is_not_learned(self, tmp_path):
+        """종료일이 최근이면 (지연 데이터 가능) 학습하지 않음"""
+        closed = ClosedDays(tmp_path / "closed_days.json")
+
+        learned = learn_closed_days(FakeConn(self.PRESENT), closed, self.W_START, self.W_END,
+                                    today=date(2026, 2, 23))
+
+        assert learned == [] and closed.days == set()
+
+    def test_window_without_any_data_is_not_learned(self, tmp_path):
+        """창 전체가 비어 있으면 (API 장애) 휴장일로 기록하지 않음"""
+        closed = ClosedDays(tmp_path / "closed_days.json")
+
+        learned = learn_closed_days(FakeConn([]), closed, self.W_START, self.W_END,
+                                    today=date(2026, 3, 20))
+
+        assert learned == [] and closed.days == set()
+
+    def test_day_with_data_is_removed_from_closed(self, tmp_path):
+        """휴장일로 기록됐는데 데이터가 들어온 날짜 → 기록에서 삭제"""
+        closed = ClosedDays(tmp_path / "closed_days.json")
+        closed.add([date(2026, 2, 18)])
+
+        learn_closed_days(FakeConn(self.PRESENT), closed, self.W_START, self.W_END,
+                          today=date(2026, 2, 23))
+
+        assert closed.days == set()
+
+
+class TestBackfillPlan:
+    """계획 저장 / 이어받기 테스트"""
+
+    def make_plan(self, tmp_path):
+        units = [{"table": "ohlcv", "start": "2026-01-01", "end": "2026-01-30",
+                  "stocks": [["A", "a"]]},
+                 {"table": "ohlcv", "start": "2026-01-31", "end": "2026-03-01",
+                  "stocks": [["A", "a"]]},
+                 {"table": "investor", "start": "2026-01-01", "end": "2026-01-30",
+                  "stocks": [["A", "a"]]}]
+        return BackfillPlan.create(tmp_path / "plan.json", date(2026, 1, 1), date(2026, 3, 1), units)
+
+    def test_resume_replays_progress_log(self, tmp_path):
+        # Given: 단위 0 완료, 단위 2 실패 후 중단
+        plan = self.make_plan(tmp_path)
+        plan.mark(0, "done")
+        plan.mark(2, "failed", "timeout")
+
+        # When
+        resumed = BackfillPlan.load_or_none(tmp_path / "plan.json")
+
+        # Then: 완료 단위만 빠지고 실패 단위는 다시 수행 대상
+        assert [u["id"] for u in resumed.pending()] == [1, 2]
+        assert resumed.units[2]["error"] == "timeout"
+        assert resumed.window_done("ohlcv", "2026-01-01")
+        assert not resumed.window_done("ohlcv", "2026-01-31")
+        assert resumed.stats()["done"] == 1
+
+    def test_truncated_log_line_is_ignored(self, tmp_path):
+        plan = self.make_plan(tmp_path)
+        plan.mark(0, "done")
+        with open(plan.progress_path, "a", encoding="utf-8") as f:
+            f.write('{"id": 1, "sta')
+
+        resumed = BackfillPlan.load_or_none(tmp_path / "plan.json")
+
+        assert [u["id"] for u in resumed.pending()] == [1, 2]
+
+    def test_missing_plan(self, tmp_path):
+        assert BackfillPlan.load_or_none(tmp_path / "none.json") is None
+
+
+class TestIterFetchUnits:
+    """기간이 다른 단위 병렬 수행 테스트"""
+
+    def test_each_unit_uses_its_own_window(self):
+        def fetch(client, stocks, start, end):
+            return [(c, n, [(start, end)]) for c, n in stocks]
+        units = [([("A", "a")], date(2026, 1, 1), date(2026, 1, 30)),
+                 ([("A", "a")], date(2026, 1, 31), date(2026, 2, 5))]
+
+        results = dict(iter_fetch_units("thread", fetch, None, units))
+
+        assert results[0] == [("A", "a", [(date(2026, 1, 1), date(2026, 1, 30))])]
+        assert results[1] == [("A", "a", [(date(2026, 1, 31), date(2026, 2, 5))])]
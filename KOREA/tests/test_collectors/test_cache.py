@@ -0,0 +1,207 @@
+"""
+ResponseCache 테스트
+
+임시 폴더와 가짜 시계로 TTL 규칙 / 키 정규화 / 용량 초과 삭제 /
+InfomaxClient._get 연동(적중 시 API 미호출)을 검증합니다.
+"""
+
+import os
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from collectors.cache import ResponseCache, cache_key
+from collectors.infomax import InfomaxClient
+
+
+KST = ZoneInfo("Asia/Seoul")
+# 2026-02-20 15:00 KST
+NOW = datetime(2026, 2, 20, 15, 0, tzinfo=KST).timestamp()
+
+HIST = "/api/stock/hist"
+OK   = {"success": True, "results": [{"code": "005930", "close_price": 1000}]}
+
+
+class FakeClock:
+    def __init__(self, now: float = NOW):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(tmp_path, max_bytes=10_000_000, today_ttl=300):
+    clock = FakeClock()
+    return ResponseCache(tmp_path, max_bytes, today_ttl=today_ttl, clock=clock), clock
+
+
+def range_params(code="005930", start="20260219", end="20260219"):
+    return {"code": code, "startDate": start, "endDate": end}
+
+
+# ==========================================
+# 키 / 조회 테스트
+# ==========================================
+
+class TestCacheKey:
+    """캐시 키 정규화 테스트"""
+
+    def test_code_order_does_not_matter(self):
+        a = cache_key(HIST, range_params("005930,000660"))
+        b = cache_key(HIST, range_params("000660,005930"))
+        assert a == b
+
+    def test_endpoint_and_params_distinguish(self):
+        assert cache_key(HIST, range_params()) != cache_key("/api/stock/investor", range_params())
+        assert cache_key(HIST, range_params()) != cache_key(HIST, range_params(end="20260218"))
+
+
+class TestResponseCache:
+    """TTL 규칙 및 통계 테스트"""
+
+    def test_miss_then_hit(self, tmp_path):
+        cache, _ = make_cache(tmp_path)
+
+        assert cache.get(HIST, range_params()) is None
+        cache.put(HIST, range_params(), OK)
+
+        assert cache.get(HIST, range_params()) == OK
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_past_range_never_expires(self, tmp_path):
+        """endDate 가 늦은 데이터 구간(late_days)보다 이전 → 만료 없음"""
+        cache, clock = make_cache(tmp_path)
+        params = range_params(start="20260202", end="20260206")
+        cache.put(HIST, params, OK)
+
+        clock.now += 365 * 86400
+
+        assert cache.get(HIST, params) == OK
+
+    def test_recent_past_range_uses_late_ttl(self, tmp_path):
+        """어제 구간 → 늦게 올라올 수 있으므로 late_ttl 후 만료"""
+        cache, clock = make_cache(tmp_path)
+        params = range_params(end="20260219")
+        cache.put(HIST, params, OK)
+
+        clock.now += 3599
+        assert cache.get(HIST, params) == OK
+        clock.now += 2
+        assert cache.get(HIST, params) is None
+
+    def test_partial_batch_uses_late_ttl(self, tmp_path):
+        """오래된 구간이라도 복수 종목 중 일부만 온 묶음은 영구 캐시하지 않음"""
+        cache, clock = make_cache(tmp_path)
+        partial = range_params("005930,000660", start="20260202", end="20260206")
+        full = range_params("005930,035420", start="20260202", end="20260206")
+        cache.put(HIST, partial, OK)
+        cache.put(HIST, full, {"success": True, "results": [{"code": "005930"}, {"code": "035420"}]})
+
+        clock.now += 3601
+
+        assert cache.get(HIST, partial) is None
+        assert cache.get(HIST, full) is not None
+
+    def test_today_range_uses_short_ttl(self, tmp_path):
+        """오늘 데이터 포함 → today_ttl 후 만료"""
+        cache, clock = make_cache(tmp_path, today_ttl=300)
+        params = range_params(end="20260220")
+        cache.put(HIST, params, OK)
+
+        clock.now += 299
+        assert cache.get(HIST, params) == OK
+        clock.now += 2
+        assert cache.get(HIST, params) is None
+
+    def test_empty_past_result_uses_short_ttl(self, tmp_path):
+        """과거 구간이라도 results가 비어 있으면 (지연 제공 가능) 짧게만 유지"""
+        cache, clock = make_cache(tmp_path, today_ttl=300)
+        params = range_params(end="20260219")
+        cache.put(HIST, params, {"success": True, "results": []})
+
+        clock.now += 301
+
+        assert cache.get(HIST, params) is None
+
+    def test_code_list_expires_at_midnight(self, tmp_path):
+        """날짜 파라미터 없는 /api/stock/code → 당일 자정(KST)까지"""
+        cache, clock = make_cache(tmp_path)
+        cache.put("/api/stock/code", {}, OK)
+
+        clock.now = datetime(2026, 2, 20, 23, 59, tzinfo=KST).timestamp()
+        assert cache.get("/api/stock/code", {}) == OK
+        clock.now = datetime(2026, 2, 21, 0, 1, tzinfo=KST).timestamp()
+        assert cache.get("/api/stock/code", {}) is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """용량 초과 시 오래 안 쓴 항목부터 삭제"""
+        # Given: 항목 2개가 들어가는 크기
+        cache, _ = make_cache(tmp_path)
+        cache.put(HIST, range_params("A"), OK)
+        entry_size = cache.stats()["size_bytes"]
+        cache.max_bytes = int(entry_size * 2.5)
+        cache.put(HIST, range_params("B"), OK)
+
+        # When: 세 번째 저장 → 가장 오래된 A 삭제
+        path_a = cache._path(cache_key(HIST, range_params("A")))
+        os.utime(path_a, (0, 0))
+        cache.put(HIST, range_params("C"), OK)
+
+        # Then
+        assert cache.stats()["evictions"] == 1
+        assert cache.get(HIST, range_params("A")) is None
+        assert cache.get(HIST, range_params("B")) == OK
+        assert cache.get(HIST, range_params("C")) == OK
+
+    def test_size_survives_restart(self, tmp_path):
+        """재시작 시 기존 파일 크기를 다시 집계"""
+        cache, _ = make_cache(tmp_path)
+        cache.put(HIST, range_params(), OK)
+
+        reopened, _ = make_cache(tmp_path)
+
+        assert reopened.stats()["size_bytes"] == cache.stats()["size_bytes"]
+        assert reopened.get(HIST, range_params()) == OK
+
+
+# ==========================================
+# InfomaxClient 연동 테스트
+# ==========================================
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, data):
+        self._data = data
+        self.content = b"x" * 100
+
+    def json(self):
+        return self._data
+
+
+class TestClientCache:
+    """InfomaxClient._get 캐시 연동"""
+
+    def test_hit_skips_api_call(self, tmp_path, monkeypatch):
+        # Given
+        cache, _ = make_cache(tmp_path)
+        client = InfomaxClient(cache=cache)
+        calls = []
+
+        def fake_get(url, params=None, **kwargs):
+            calls.append(params)
+            return FakeResponse(OK)
+        monkeypatch.setattr(client.session, "get", fake_get)
+        monkeypatch.setattr(client, "_throttle", lambda: 0.0)
+        monkeypatch.setattr(client.usage, "record", lambda *a, **k: None)
+
+        # When: 같은 요청 두 번
+        first  = client._get(HIST, range_params())
+        second = client._get(HIST, range_params())
+
+        # Then: API는 1회만
+        assert first == second == OK
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
@@ -0,0 +1,124 @@
+"""
+컬럼 디코딩 테스트
+
+응답 행(raw=True) → DataFrame 변환 / DB 튜플 변환 / 컬럼 기반 특이사항 분석이
+기존 행(dict) 단위 파서와 같은 값을 내는지 검증합니다.
+"""
+
+from datetime import date
+
+from collectors.columnar import (
+    decode_hist, decode_investor, parse_dates, to_records,
+    OHLCV_COLUMNS, MKTCAP_COLUMNS, INVESTOR_COLUMNS,
+)
+from collectors.infomax import InfomaxClient
+from scripts.daily_update import analyze_anomalies
+from tests.test_collectors.test_infomax import FakeClient, echo_hist, hist_row, START, END
+
+
+def investor_raw(code: str, investor: str, bid: int, ask: int, dt: str = "20260220") -> dict:
+    return {"date": dt, "code": code, "stock_code": code, "investor": investor,
+            "bid_value": bid, "ask_value": ask, "bid_volume": bid // 10, "ask_volume": ask // 10}
+
+
+class TestParseDates:
+    """YYYYMMDD 벡터 파싱 테스트"""
+
+    def test_strings_ints_and_invalid(self):
+        parsed = parse_dates(["20260220", 20260219, "2026-02", None])
+
+        assert list(parsed[:2].dt.date) == [date(2026, 2, 20), date(2026, 2, 19)]
+        assert parsed[2:].isna().all()
+
+
+class TestDecodeHist:
+    """hist / info 응답 디코딩 테스트"""
+
+    def test_matches_row_parser(self):
+        """raw=True + decode_hist 결과가 _parse_hist_rows 와 같은 값"""
+        # Given
+        client = FakeClient(echo_hist)
+        codes = ["005930", "000660"]
+
+        # When
+        raw = client.get_hist_batch(codes, START, END, raw=True)
+        frame = decode_hist(raw.values())
+        rows = client.get_hist_batch(codes, START, END)
+
+        # Then
+        expected = [(r["date"], r["stock_code"], r["open_price"], r["high_price"], r["low_price"],
+                     r["close_price"], r["volume"], r["trading_value"])
+                    for code in codes for r in rows[code]]
+        assert to_records(frame, OHLCV_COLUMNS) == expected
+
+    def test_market_cap_from_snapshot_or_computed(self):
+        """market_cap 이 있으면 그대로, 없으면 종가 × 상장주식수"""
+        rows = [{**hist_row("005930"), "stock_code": "005930", "market_cap": 123},
+                {**hist_row("000660", close=500), "stock_code": "000660"}]
+
+        frame = decode_hist([rows])
+
+        assert [cap for _, _, cap in to_records(frame, MKTCAP_COLUMNS)] == [123, 500 * 100]
+        assert frame["market_cap_reported"].tolist() == [True, False]
+
+    def test_rows_without_date_are_dropped_and_nulls_are_none(self):
+        rows = [{"stock_code": "005930", "close_price": 1},
+                {"date": "20260220", "stock_code": "000660", "close_price": None}]
+
+        records = to_records(decode_hist([rows]), OHLCV_COLUMNS)
+
+        assert records == [(date(2026, 2, 20), "000660", None, None, None, None, None, None)]
+        assert to_records(decode_hist([]), OHLCV_COLUMNS) == []
+
+
+class TestDecodeInvestor:
+    """investor 응답 디코딩 테스트"""
+
+    def test_maps_investor_types_and_net_buy(self):
+        # Given: 매핑 대상 2종 + 대상 아닌 1종
+        rows = [investor_raw("005930", "개인", 300, 100),
+                investor_raw("005930", "외국인", 100, 400),
+                investor_raw("005930", "정부", 999, 0)]
+
+        # When
+        records = to_records(decode_investor([rows]), INVESTOR_COLUMNS)
+
+        # Then: _parse_investor_rows 와 같은 순매수 값
+        expected = [(r["date"], r["stock_code"], r["investor_type"],
+                     r["net_buy_value"], r["net_buy_volume"])
+                    for r in InfomaxClient._parse_investor_rows({"results": rows}, None)]
+        assert records == expected
+        assert [r[2] for r in records] == ["RETAIL", "FOREIGN"]
+
+
+class TestAnalyzeAnomalies:
+    """컬럼 기반 특이사항 분석 테스트"""
+
+    def test_ohlcv_rules(self):
+        # Given: 거래정지 / 고가<저가 / 30% 급등
+        rows = [
+            {**hist_row("000001", close=1000), "trading_volume": 0},
+            {**hist_row("000002"), "high_price": 900, "low_price": 1100},
+            {**hist_row("000003", close=1300)},
+        ]
+        frame = decode_hist([[{**r, "stock_code": r["code"]} for r in rows]])
+
+        # When
+        anomalies = analyze_anomalies(frame, decode_investor([]), {"000003": 1000})
+
+        # Then
+        by_type = {a["type"]: a for a in anomalies}
+        assert set(by_type) == {"거래정지", "OHLCV오류", "가격급등"}
+        assert by_type["가격급등"]["value"] == 0.3
+        assert by_type["거래정지"]["date"] == date(2026, 2, 20)
+
+    def test_large_net_buy_summed_per_stock_day(self):
+        """투자자 유형을 합산해 500억 이상이면 대규모순매수"""
+        rows = [investor_raw("005930", "개인", int(3e10), 0),
+                investor_raw("005930", "외국인", int(3e10), 0),
+                investor_raw("000660", "개인", int(3e10), 0)]
+
+        anomalies = analyze_anomalies(decode_hist([]), decode_investor([rows]), {})
+
+        assert [(a["type"], a["stock_code"]) for a in anomalies] == [("대규모순매수", "005930")]
+        assert anomalies[0]["value"] == int(6e10)
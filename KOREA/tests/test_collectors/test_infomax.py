@@ -0,0 +1,287 @@
+"""
+InfomaxClient 테스트
+
+실제 API를 호출하지 않고 _get을 가짜 응답으로 대체해
+복수 종목 일괄 조회 / 응답 분배 / 실패 시 분할 재요청 로직을 검증합니다.
+"""
+
+from datetime import date
+
+from collectors.infomax import REJECTED, InfomaxClient, chunked
+
+
+START = date(2026, 2, 19)
+END   = date(2026, 2, 20)
+
+
+def hist_row(code: str, dt: str = "20260220", close: int = 1000) -> dict:
+    """hist API 응답 1행 (필요한 필드만)"""
+    return {
+        "date": dt, "code": code,
+        "open_price": close, "high_price": close, "low_price": close,
+        "close_price": close, "trading_volume": 10, "trading_value": close * 10,
+        "listed_shares": 100,
+    }
+
+
+class FakeClient(InfomaxClient):
+    """_get 호출을 기록하고 handler가 만든 응답을 돌려주는 테스트용 클라이언트"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.calls = []
+
+    def _get(self, endpoint, params):
+        self.calls.append((endpoint, dict(params)))
+        return self.handler(endpoint, params)
+
+
+def echo_hist(endpoint, params):
+    """요청한 모든 코드에 대해 1행씩 돌려주는 정상 응답"""
+    codes = params["code"].split(",")
+    return {"success": True, "results": [hist_row(c) for c in codes]}
+
+
+# ==========================================
+# chunked 테스트
+# ==========================================
+
+class TestChunked:
+    """묶음 분할 헬퍼 테스트"""
+
+    def test_even_split(self):
+        assert chunked([1, 2, 3, 4], 2) == [[1, 2], [3, 4]]
+
+    def test_remainder(self):
+        assert chunked([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+
+    def test_size_below_one_is_clamped(self):
+        assert chunked([1, 2], 0) == [[1], [2]]
+
+
+# ==========================================
+# get_hist_batch 테스트
+# ==========================================
+
+class TestGetHistBatch:
+    """복수 종목 일봉 일괄 조회 테스트"""
+
+    def test_groups_codes_into_requests(self):
+        """batch_size 단위로 묶어서 요청"""
+        # Given
+        client = FakeClient(echo_hist)
+        codes = ["005930", "000660", "035420", "035720", "051910"]
+
+        # When
+        result = client.get_hist_batch(codes, START, END, batch_size=2)
+
+        # Then: 5종목 / 2 = 3회 요청
+        assert len(client.calls) == 3
+        assert client.calls[0][1]["code"] == "005930,000660"
+        assert client.calls[0][1]["startDate"] == "20260219"
+        assert set(result) == set(codes)
+        assert all(len(rows) == 1 for rows in result.values())
+
+    def test_demultiplex_by_code(self):
+        """병합된 results를 종목코드별로 분배"""
+        # Given: 종목마다 행 수가 다른 응답
+        def handler(endpoint, params):
+            return {"success": True, "results": [
+                hist_row("005930", "20260219", 75000),
+                hist_row("000660", "20260219", 180000),
+                hist_row("005930", "20260220", 76000),
+            ]}
+        client = FakeClient(handler)
+
+        # When
+        result = client.get_hist_batch(["005930", "000660"], START, END)
+
+        # Then
+        assert [r["close_price"] for r in result["005930"]] == [75000, 76000]
+        assert [r["close_price"] for r in result["000660"]] == [180000]
+        assert result["005930"][1]["date"] == date(2026, 2, 20)
+
+    def test_unrequested_codes_are_ignored(self):
+        """요청하지 않은 코드가 응답에 섞여 있으면 버림"""
+        def handler(endpoint, params):
+            return {"success": True, "results": [hist_row("005930"), hist_row("999999")]}
+        client = FakeClient(handler)
+
+        result = client.get_hist_batch(["005930"], START, END)
+
+        assert set(result) == {"005930"}
+
+    def test_missing_code_returns_empty_list(self):
+        """응답에 없는 종목은 빈 리스트"""
+        def handler(endpoint, params):
+            return {"success": True, "results": [hist_row("005930")]}
+        client = FakeClient(handler)
+
+        result = client.get_hist_batch(["005930", "000660"], START, END)
+
+        assert result["000660"] == []
+
+    def test_failed_batch_falls_back_to_smaller_chunks(self):
+        """묶음 실패 시 절반씩 나눠 재요청, 문제 종목만 최종 실패"""
+        # Given: "BAD000"이 포함된 요청은 실패
+        def handler(endpoint, params):
+            if "BAD000" in params["code"]:
+                return None
+            return echo_hist(endpoint, params)
+        client = FakeClient(handler)
+        codes = ["005930", "000660", "BAD000", "035420"]
+
+        # When
+        result = client.get_hist_batch(codes, START, END, batch_size=4)
+
+        # Then: 4 → [2 OK, 2 fail] → [1 fail, 1 OK]
+        requested = [p["code"] for _, p in client.calls]
+        assert requested == ["005930,000660,BAD000,035420",
+                             "005930,000660",
+                             "BAD000,035420",
+                             "BAD000",
+                             "035420"]
+        assert result["BAD000"] == []
+        assert all(result[c] for c in ("005930", "000660", "035420"))
+
+    def test_single_code_without_code_field(self):
+        """단일 종목 요청은 응답에 code가 없어도 요청 코드로 채움"""
+        code = "005930"
+
+        def handler(endpoint, params):
+            row = hist_row(code)
+            del row["code"]
+            return {"success": True, "results": [row]}
+        client = FakeClient(handler)
+
+        result = client.get_hist_batch([code], START, END)
+
+        assert result[code][0]["stock_code"] == code
+
+
+# ==========================================
+# get_investor_batch 테스트
+# ==========================================
+
+def investor_row(code, investor="외국인", bid=300, ask=100):
+    """investor API 응답 1행"""
+    return {
+        "date": "20260220", "code": code, "investor": investor,
+        "bid_value": bid, "ask_value": ask, "bid_volume": 30, "ask_volume": 10,
+    }
+
+
+class TestGetInvestorBatch:
+    """복수 종목 투자자별 수급 일괄 조회 테스트"""
+
+    def test_demultiplex_and_investor_map(self):
+        """종목별 분배 + INVESTOR_MAP 변환 + 매핑 없는 유형 스킵"""
+        # Given
+        def handler(endpoint, params):
+            return {"success": True, "results": [
+                investor_row("005930", "외국인"),
+                investor_row("005930", "기금공제"),
+                investor_row("005930", "보험"),       # 매핑 없음 → 스킵
+                investor_row("000660", "개인", bid=100, ask=400),
+            ]}
+        client = FakeClient(handler)
+
+        # When
+        result = client.get_investor_batch(["005930", "000660"], START, END)
+
+        # Then
+        assert [r["investor_type"] for r in result["005930"]] == ["FOREIGN", "PENSION"]
+        assert result["000660"][0]["investor_type"] == "RETAIL"
+        assert result["000660"][0]["net_buy_value"] == -300
+        assert result["005930"][0]["net_buy_volume"] == 20
+
+    def test_degrades_to_single_code_when_batch_rejected(self):
+        """묶음 요청이 거부되면 단일 종목 요청으로 전환하고 이후에도 유지"""
+        # Given: 복수 코드 요청은 거부 (success=False)
+        def handler(endpoint, params):
+            if "," in params["code"]:
+                return REJECTED
+            return {"success": True, "results": [investor_row(params["code"])]}
+        client = FakeClient(handler)
+        codes = ["005930", "000660", "035420", "035720"]
+
+        # When
+        result = client.get_investor_batch(codes, START, END, batch_size=2)
+
+        # Then: 첫 묶음만 시도하고 나머지는 처음부터 단일 요청
+        requested = [p["code"] for _, p in client.calls]
+        assert requested == ["005930,000660", "005930", "000660", "035420", "035720"]
+        assert all(len(result[c]) == 1 for c in codes)
+
+    def test_transient_failure_splits_instead_of_degrading(self):
+        """첫 묶음이 timeout 등으로 실패(None)해도 단일 종목 모드로 전환하지 않고 반으로 쪼갬"""
+        # Given: 첫 요청만 실패
+        def handler(endpoint, params):
+            if len(client.calls) == 1:
+                return None
+            return {"success": True, "results": [investor_row(c) for c in params["code"].split(",")]}
+        client = FakeClient(handler)
+        codes = ["005930", "000660", "035420", "035720"]
+
+        # When
+        result = client.get_investor_batch(codes, START, END, batch_size=4)
+
+        # Then: 절반 묶음으로 다시 받고 이후에도 묶음 요청 유지
+        requested = [p["code"] for _, p in client.calls]
+        assert requested == ["005930,000660,035420,035720", "005930,000660", "035420,035720"]
+        assert "/api/stock/investor" not in client._no_batch_endpoints
+        assert all(len(result[c]) == 1 for c in codes)
+
+    def test_degrades_when_rows_have_no_code(self):
+        """응답 행에 code가 없어 분배할 수 없으면 단일 종목 요청으로 전환"""
+        def handler(endpoint, params):
+            row = investor_row(params["code"])
+            if "," in params["code"]:
+                del row["code"]
+            return {"success": True, "results": [row]}
+        client = FakeClient(handler)
+
+        result = client.get_investor_batch(["005930", "000660"], START, END)
+
+        assert len(client.calls) == 3
+        assert result["005930"][0]["stock_code"] == "005930"
+        assert result["000660"][0]["stock_code"] == "000660"
+
+
+# ==========================================
+# get_snapshot 테스트
+# ==========================================
+
+class TestGetSnapshot:
+    """단일 일자 전 종목 스냅샷 (/api/stock/info) 테스트"""
+
+    def test_pages_codes_with_date_param(self):
+        """page_size개씩 묶어 date 파라미터로 요청"""
+        # Given
+        client = FakeClient(echo_hist)
+        codes = ["005930", "000660", "035420"]
+
+        # When
+        result = client.get_snapshot(codes, END, page_size=2)
+
+        # Then
+        assert [(e, p["code"]) for e, p in client.calls] == [
+            ("/api/stock/info", "005930,000660"), ("/api/stock/info", "035420")]
+        assert client.calls[0][1]["date"] == "20260220"
+        assert "startDate" not in client.calls[0][1]
+        assert all(len(rows) == 1 for rows in result.values())
+
+    def test_market_cap_and_missing_date(self):
+        """응답 시가총액은 그대로, date가 없으면 요청 일자로 채움"""
+        def handler(endpoint, params):
+            row = {**hist_row("005930"), "market_cap": 123456}
+            del row["date"]
+            return {"success": True, "results": [row, hist_row("000660")]}
+        client = FakeClient(handler)
+
+        result = client.get_snapshot(["005930", "000660"], END)
+
+        assert result["005930"][0]["market_cap"] == 123456
+        assert result["005930"][0]["date"] == END
+        assert result["000660"][0]["market_cap"] is None
@@ -0,0 +1,121 @@
+"""
+MockInfomaxServer 테스트
+
+로컬 mock 서버를 띄워 InfomaxClient가 실제 HTTP로 요청하도록 하고
+복수 종목 응답 / 단일 종목 전환 / 429 (분당 한도·주입) / 녹화 → 재생을 검증합니다.
+"""
+
+from datetime import date
+
+import pytest
+import requests
+
+import collectors.infomax as infomax
+from collectors.cache import FixtureStore
+from collectors.infomax import InfomaxClient
+from collectors.mock_infomax import MockInfomaxServer, HIST, INVESTOR, INFO, synthetic_hist_row
+from collectors.quota import UsageLedger
+
+
+START = date(2026, 2, 19)    # 목
+END   = date(2026, 2, 23)    # 월 (주말 제외 3 거래일)
+
+
+@pytest.fixture
+def make_client(monkeypatch, tmp_path):
+    """mock 서버를 향하는 InfomaxClient 생성기 (rate limit 대기 없음, 사용량은 임시 폴더)"""
+    monkeypatch.setattr(InfomaxClient, "usage", UsageLedger(tmp_path / "usage", 10**12))
+    monkeypatch.setattr(InfomaxClient, "cache", None)
+    monkeypatch.setattr(InfomaxClient, "recorder", None)
+
+    def factory(server, **kwargs):
+        monkeypatch.setattr(infomax, "BASE_URL", server.base_url)
+        client = InfomaxClient(**kwargs)
+        client._throttle = lambda: 0.0
+        return client
+    return factory
+
+
+class TestMockServer:
+    """mock 서버 동작 테스트"""
+
+    def test_hist_batch_over_http(self, make_client):
+        """복수 종목 요청 → 종목 × 거래일 행, 합성 값은 결정적"""
+        # Given
+        with MockInfomaxServer(n_stocks=5) as server:
+            client = make_client(server)
+
+            # When
+            result = client.get_hist_batch(server.codes, START, END, batch_size=2)
+
+            # Then: 5종목 / 2 = 3회 요청, 종목마다 3 거래일
+            assert server.stats()[HIST]["requests"] == 3
+        assert all(len(rows) == 3 for rows in result.values())
+        code = server.codes[0]
+        expected = synthetic_hist_row(code, START)["close_price"]
+        assert result[code][0]["close_price"] == expected
+
+    def test_investor_batch_disabled_degrades_to_single(self, make_client):
+        """서버가 investor 묶음을 거부하면 클라이언트가 단일 종목 요청으로 전환"""
+        with MockInfomaxServer(n_stocks=4, batch_endpoints={HIST}) as server:
+            client = make_client(server)
+
+            result = client.get_investor_batch(server.codes, START, START, batch_size=4)
+
+            # 묶음 1회 실패 + 단일 4회
+            assert server.stats()[INVESTOR]["requests"] == 5
+        # 14종 중 INVESTOR_MAP 4종만 저장 대상
+        assert all(len(rows) == 4 for rows in result.values())
+
+    def test_snapshot_over_http(self, make_client):
+        """/api/stock/info 한 페이지로 전 종목 하루치 + 시가총액"""
+        with MockInfomaxServer(n_stocks=5) as server:
+            client = make_client(server)
+
+            result = client.get_snapshot(server.codes, END)
+
+            assert server.stats()[INFO]["requests"] == 1
+        row = result[server.codes[0]][0]
+        assert row["close_price"] == synthetic_hist_row(server.codes[0], END)["close_price"]
+        assert row["market_cap"] == row["close_price"] * row["listed_shares"]
+
+    def test_rate_limit_returns_429_with_retry_after(self):
+        """분당 한도 초과 시 429 + Retry-After"""
+        with MockInfomaxServer(rate_per_min=2) as server:
+            url = f"{server.base_url}/api/stock/code"
+            statuses = [requests.get(url, timeout=5) for _ in range(3)]
+
+            assert [r.status_code for r in statuses] == [200, 200, 429]
+            assert 0 < int(statuses[2].headers["Retry-After"]) <= 61
+            assert server.stats()["/api/stock/code"]["limited"] == 1
+
+    def test_throttle_injection(self):
+        """throttle_rate=1 이면 모든 요청에 429"""
+        with MockInfomaxServer(throttle_rate=1.0, retry_after=3) as server:
+            r = requests.get(f"{server.base_url}/api/stock/code", timeout=5)
+
+        assert r.status_code == 429
+        assert r.headers["Retry-After"] == "3"
+
+
+class TestRecordReplay:
+    """녹화 모드 → fixture 재생 테스트"""
+
+    def test_recorded_responses_replay_without_synthetic(self, make_client, tmp_path):
+        # Given: 녹화 모드 클라이언트로 단일 종목 요청
+        store = FixtureStore(tmp_path / "fixtures")
+        with MockInfomaxServer(n_stocks=2, seed=1) as server:
+            recorder_client = make_client(server, recorder=store)
+            recorded = {code: recorder_client.get_hist(code, START, END) for code in server.codes}
+
+        # When: 합성 데이터 없이 fixture만으로 재생 (다른 seed) — 복수 종목 요청은 단일 fixture 병합
+        with MockInfomaxServer(n_stocks=2, fixtures=store, synthetic=False, seed=2) as replay:
+            client = make_client(replay)
+            single = client.get_hist(replay.codes[0], START, END)
+            batch = client.get_hist_batch(replay.codes, START, END)
+            missing = client.get_hist(replay.codes[0], START, START)
+
+        # Then
+        assert single == recorded[replay.codes[0]]
+        assert batch == recorded
+        assert missing == []
@@ -0,0 +1,124 @@
+"""
+일일 사용량 집계(UsageLedger) / 수집 계획(QuotaPlanner) 테스트
+
+tmp_path 아래에 사용량 파일을 만들어 프로세스 간 합산과 한도 판단을 검증합니다.
+"""
+
+from datetime import date
+
+import pytest
+
+from collectors.quota import UsageLedger, QuotaPlanner, business_days, format_bytes
+from utils.exceptions import QuotaExceededError
+
+
+HIST = "/api/stock/hist"
+INVESTOR = "/api/stock/investor"
+
+
+class TestUsageLedger:
+    """사용량 기록/파일 반영 테스트"""
+
+    def test_record_and_run_usage(self, tmp_path):
+        ledger = UsageLedger(tmp_path, daily_limit_bytes=10_000)
+
+        ledger.record(HIST, 1000, rows=3)
+        ledger.record(HIST, 500, rows=1)
+        ledger.record(INVESTOR, 200)
+
+        run = ledger.run_usage()
+        assert run[HIST] == {"requests": 2, "bytes": 1500, "rows": 4}
+        assert run[INVESTOR]["requests"] == 1
+        assert ledger.used_bytes() == 1700          # 미반영분 포함
+        assert ledger.remaining_bytes() == 8300
+
+    def test_run_wait_per_endpoint(self, tmp_path):
+        """rate limit 대기는 회차 통계에만 (당일 파일·사용량에는 영향 없음)"""
+        ledger = UsageLedger(tmp_path, daily_limit_bytes=10_000)
+
+        ledger.record_wait(HIST, 1.5)
+        ledger.record_wait(HIST, 0.5)
+        ledger.flush()
+
+        assert ledger.run_wait() == {HIST: 2.0}
+        assert ledger.used_bytes() == 0
+        ledger.reset_run()
+        assert ledger.run_wait() == {}
+
+    def test_flush_merges_across_ledgers(self, tmp_path):
+        """다른 프로세스(별도 ledger)의 사용량이 당일 파일에서 합산"""
+        # Given: 두 개의 독립 ledger (= 두 프로세스)
+        a = UsageLedger(tmp_path, daily_limit_bytes=10_000)
+        b = UsageLedger(tmp_path, daily_limit_bytes=10_000)
+
+        # When
+        a.record(HIST, 1000)
+        a.flush()
+        b.record(HIST, 2000)
+        b.flush()
+
+        # Then
+        assert a.used_bytes() == 3000
+        assert b.today_usage()[HIST]["requests"] == 2
+        assert a.run_usage()[HIST]["bytes"] == 1000   # 회차 사용량은 자기 것만
+
+    def test_bytes_per_row(self, tmp_path):
+        ledger = UsageLedger(tmp_path, daily_limit_bytes=10_000)
+        assert ledger.bytes_per_row(HIST) is None
+
+        ledger.record(HIST, 900, rows=3)
+
+        assert ledger.bytes_per_row(HIST) == 300
+
+
+class TestQuotaPlanner:
+    """예상 사용량 산출 및 연기/거부 테스트"""
+
+    def test_estimate_uses_defaults_before_measurement(self, tmp_path):
+        planner = QuotaPlanner(UsageLedger(tmp_path, daily_limit_bytes=10**9))
+
+        est = planner.estimate(HIST, n_stocks=100, n_days=2, n_requests=2)
+
+        assert est == 100 * 2 * 320 + 2 * 600
+
+    def test_estimate_uses_measured_bytes_per_row(self, tmp_path):
+        ledger = UsageLedger(tmp_path, daily_limit_bytes=10**9)
+        ledger.record(INVESTOR, 1400, rows=14)      # 100 B/행
+        planner = QuotaPlanner(ledger)
+
+        est = planner.estimate(INVESTOR, n_stocks=10, n_days=1, n_requests=1)
+
+        assert est == 10 * 14 * 100
+
+    def test_defers_work_that_does_not_fit(self, tmp_path):
+        """우선순위 순서로 한도 안에 들어가는 작업만 허용"""
+        # Given: hist 100종목 1일 ≈ 32,600 B, investor 100종목 1일 ≈ 322,600 B
+        planner = QuotaPlanner(UsageLedger(tmp_path, daily_limit_bytes=100_000))
+
+        plan = planner.plan([(HIST, 100, 1, 1), (INVESTOR, 100, 1, 1)])
+
+        assert plan["allowed"] == [HIST]
+        assert plan["deferred"] == [INVESTOR]
+        assert plan["remaining"] == 100_000
+
+    def test_require_refuses_when_nothing_fits(self, tmp_path):
+        ledger = UsageLedger(tmp_path, daily_limit_bytes=1000)
+        ledger.record(HIST, 900)
+        planner = QuotaPlanner(ledger)
+
+        with pytest.raises(QuotaExceededError) as exc:
+            planner.require([(HIST, 100, 1, 1)])
+
+        assert exc.value.remaining_bytes == 100
+
+
+class TestHelpers:
+
+    def test_business_days_skips_weekend(self):
+        # 2026-02-20(금) ~ 2026-02-23(월)
+        assert business_days(date(2026, 2, 20), date(2026, 2, 23)) == 2
+
+    def test_format_bytes(self):
+        assert format_bytes(512) == "512 B"
+        assert format_bytes(2000) == "2.0 KB"
+        assert format_bytes(200_000_000) == "200.0 MB"
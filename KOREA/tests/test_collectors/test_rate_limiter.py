@@ -0,0 +1,268 @@
+"""
+TokenBucket rate limiter 테스트
+
+가짜 clock/sleep을 주입해 실제로 기다리지 않고 예약 시각과 대기 통계를 검증합니다.
+"""
+
+import threading
+
+import pytest
+
+from config.settings import settings
+from collectors.rate_limiter import TokenBucket, SharedTokenBucket, AdaptiveRateController, parse_retry_after
+
+
+class FakeClock:
+    """sleep 호출 시 시간만 앞으로 이동하는 가짜 시계"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """토큰 버킷 예약/대기 테스트"""
+
+    def test_burst_then_steady_rate(self):
+        """burst개까지는 즉시, 이후 간격(60/rate초)마다 1개"""
+        # Given: 분당 60회 = 1초 간격, burst 3
+        clock = FakeClock()
+        bucket = TokenBucket(60, burst=3, clock=clock)
+
+        # When: 같은 시각에 5개 예약
+        times = [bucket.reserve() for _ in range(5)]
+
+        # Then
+        assert times == [100.0, 100.0, 100.0, 101.0, 102.0]
+
+    def test_idle_time_refills_only_up_to_burst(self):
+        """오래 쉬어도 burst 이상 쌓이지 않음"""
+        clock = FakeClock()
+        bucket = TokenBucket(60, burst=2, clock=clock)
+        bucket.reserve()
+
+        clock.now += 1000
+        times = [bucket.reserve() for _ in range(3)]
+
+        assert times == [1100.0, 1100.0, 1101.0]
+
+    def test_acquire_reports_wait(self):
+        """acquire는 대기한 초를 반환하고 통계에 누적"""
+        # Given: 분당 120회 = 0.5초 간격, burst 1
+        clock = FakeClock()
+        bucket = TokenBucket(120, burst=1, clock=clock, sleep=clock.sleep)
+
+        # When
+        waits = [bucket.acquire() for _ in range(3)]
+
+        # Then
+        assert waits == [0.0, 0.5, 0.5]
+        stats = bucket.stats()
+        assert stats["calls"] == 3
+        assert stats["total_wait"] == pytest.approx(1.0)
+        assert stats["max_wait"] == pytest.approx(0.5)
+        assert stats["rate_per_min"] == 120
+
+    def test_reset_stats(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        bucket.acquire()
+
+        bucket.reset_stats()
+
+        assert bucket.stats()["calls"] == 0
+        assert bucket.stats()["total_wait"] == 0.0
+
+    def test_reservations_are_distinct_across_threads(self):
+        """여러 스레드가 동시에 예약해도 같은 슬롯을 중복 배정하지 않음"""
+        clock = FakeClock()
+        bucket = TokenBucket(60, burst=1, clock=clock)
+        times = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(50):
+                t = bucket.reserve()
+                with lock:
+                    times.append(t)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(times) == [100.0 + i for i in range(200)]
+
+    def test_pause_blocks_all_reservations(self):
+        """pause 동안은 burst 여유가 있어도 발급 안 함"""
+        clock = FakeClock()
+        bucket = TokenBucket(60, burst=3, clock=clock)
+
+        bucket.pause(10)
+
+        assert bucket.reserve() == 110.0
+
+    def test_set_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, burst=1, clock=clock)
+        bucket.reserve()
+
+        bucket.set_rate(30)
+
+        assert bucket.rate_per_min == 30
+        assert bucket.reserve() == 101.0    # 기존 예약(1초 간격)은 유지
+        assert bucket.reserve() == 103.0    # 이후 2초 간격
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+
+class TestSharedTokenBucket:
+    """잠금 파일로 예약 상태를 공유하는 버킷 (프로세스마다 인스턴스 1개)"""
+
+    def test_instances_share_one_budget(self, tmp_path):
+        # Given: 같은 상태 파일을 쓰는 두 "프로세스"
+        clock = FakeClock()
+        a = SharedTokenBucket(tmp_path / "rate.state", 60, burst=1, clock=clock)
+        b = SharedTokenBucket(tmp_path / "rate.state", 60, burst=1, clock=clock)
+
+        # When: 번갈아 예약
+        times = [a.reserve(), b.reserve(), a.reserve(), b.reserve()]
+
+        # Then: 합쳐서 초당 1건 (각자 버킷이면 100, 100, 101, 101)
+        assert times == [100.0, 101.0, 102.0, 103.0]
+
+    def test_pause_and_rate_change_apply_to_all(self, tmp_path):
+        """한 프로세스의 429 감속·Retry-After 일시정지가 다른 프로세스에도 적용"""
+        clock = FakeClock()
+        a = SharedTokenBucket(tmp_path / "rate.state", 60, burst=1, clock=clock)
+        b = SharedTokenBucket(tmp_path / "rate.state", 60, burst=1, clock=clock)
+
+        a.set_rate(30)
+        a.pause(10)
+
+        assert b.reserve() == 110.0
+        assert b.rate_per_min == 30
+        assert b.reserve() == 112.0
+
+    def test_idle_state_uses_own_rate(self, tmp_path):
+        """오래 쉰 상태 파일의 (낮춰진) 속도는 새 프로세스에 남지 않음"""
+        clock = FakeClock()
+        SharedTokenBucket(tmp_path / "rate.state", 60, clock=clock).set_rate(10)
+        clock.now += 3600
+
+        fresh = SharedTokenBucket(tmp_path / "rate.state", 60, clock=clock, idle_reset=60)
+        fresh.reserve()
+
+        assert fresh.rate_per_min == 60
+
+
+# ==========================================
+# AdaptiveRateController 테스트
+# ==========================================
+
+class TestAdaptiveRateController:
+    """AIMD 속도 조절 테스트"""
+
+    def make(self, rate=60, **kwargs):
+        clock = FakeClock()
+        bucket = TokenBucket(rate, clock=clock)
+        params = dict(min_rate=10, max_rate=60, decrease_factor=0.5,
+                      increase_step=5, increase_every=3, cooldown=5.0)
+        params.update(kwargs)
+        return clock, bucket, AdaptiveRateController(bucket, clock=clock, **params)
+
+    def test_throttle_halves_rate(self):
+        """429 → 곱셈 감소"""
+        clock, bucket, ctrl = self.make()
+
+        ctrl.on_throttled()
+
+        assert ctrl.effective_rate == 30
+
+    def test_decrease_respects_min_rate(self):
+        clock, bucket, ctrl = self.make(rate=15)
+
+        ctrl.on_timeout()
+
+        assert ctrl.effective_rate == 10
+
+    def test_concurrent_429s_decrease_once_within_cooldown(self):
+        """cooldown 안에 도착한 429는 한 번만 감속"""
+        clock, bucket, ctrl = self.make()
+
+        ctrl.on_throttled()
+        ctrl.on_throttled()
+        clock.now += 6
+        ctrl.on_throttled()
+
+        assert ctrl.effective_rate == 15
+        assert ctrl.stats()["throttled"] == 3
+        assert ctrl.stats()["decreases"] == 2
+
+    def test_additive_increase_after_sustained_success(self):
+        """연속 성공 increase_every회마다 덧셈 증가, max_rate 상한"""
+        clock, bucket, ctrl = self.make(rate=50)
+
+        for _ in range(2):
+            ctrl.on_success()
+        assert ctrl.effective_rate == 50
+        ctrl.on_success()
+        assert ctrl.effective_rate == 55
+        for _ in range(6):
+            ctrl.on_success()
+        assert ctrl.effective_rate == 60
+
+    def test_from_settings_caps_at_safety_rate(self, monkeypatch):
+        """자동 재가속은 안전 여유를 둔 설정 속도까지만 (플랜 한도 100% 로 올라가지 않음)"""
+        monkeypatch.setattr(settings, "INFOMAX_RATE_PER_MIN", 40)
+        clock = FakeClock()
+        bucket = TokenBucket(settings.infomax_rate_per_min, clock=clock)
+        ctrl = AdaptiveRateController.from_settings(bucket)
+
+        ctrl.on_throttled()
+        for _ in range(2000):
+            ctrl.on_success()
+
+        assert settings.infomax_plan_rate_limit > 40
+        assert ctrl.effective_rate == 40
+
+    def test_failure_resets_success_streak(self):
+        clock, bucket, ctrl = self.make(rate=30)
+        ctrl.on_success()
+        ctrl.on_success()
+
+        ctrl.on_timeout()
+        ctrl.on_success()
+
+        assert ctrl.effective_rate == 15
+
+    def test_retry_after_pauses_bucket(self):
+        """Retry-After 동안 모든 요청 대기"""
+        clock, bucket, ctrl = self.make()
+
+        ctrl.on_throttled(retry_after=20)
+
+        assert bucket.reserve() == 120.0
+
+
+class TestParseRetryAfter:
+    """Retry-After 헤더 해석 테스트"""
+
+    def test_seconds(self):
+        assert parse_retry_after("7") == 7.0
+
+    def test_missing_or_garbage(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+    def test_past_http_date_is_zero(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
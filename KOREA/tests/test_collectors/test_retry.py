@@ -0,0 +1,231 @@
+"""
+지연 재시도 큐 / 서킷 브레이커 테스트
+
+가짜 시계·sleep 으로 실제 대기 없이 백오프 / 라운드 구성 / 브레이커 열림·재개를 검증합니다.
+"""
+
+from datetime import date
+
+from collectors.rate_limiter import TokenBucket
+from collectors.retry import RetryQueue, CircuitBreaker, backoff_delay, poll_until
+from collectors.scheduler import WorkScheduler, WorkStream
+from scripts.daily_update import iter_fetch_scheduled
+
+
+class FakeClock:
+    """수동으로 진행시키는 시계 (sleep 호출 시 시간 진행)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_queue(max_attempts=2, rng=lambda: 0.5):
+    clock = FakeClock()
+    q = RetryQueue(max_attempts, base_wait=10, max_wait=60,
+                   clock=clock, sleep=clock.sleep, rng=rng)
+    return q, clock
+
+
+# ==========================================
+# backoff / RetryQueue 테스트
+# ==========================================
+
+class TestBackoff:
+    """지터 지수 백오프 테스트"""
+
+    def test_doubles_per_attempt_within_jitter(self):
+        assert backoff_delay(1, 10, 100, rng=lambda: 0.0) == 5
+        assert backoff_delay(1, 10, 100, rng=lambda: 1.0) == 10
+        assert backoff_delay(3, 10, 100, rng=lambda: 1.0) == 40
+
+    def test_capped(self):
+        assert backoff_delay(10, 10, 60, rng=lambda: 1.0) == 60
+
+
+class TestRetryQueue:
+    """패스 단위 지연 재시도 테스트"""
+
+    def test_round_waits_backoff_and_returns_all_items(self):
+        # Given
+        q, clock = make_queue()
+
+        # When
+        assert q.defer(["A", "B"], attempt=1) == []
+        items = q.next_round()
+
+        # Then: 같은 패스 항목은 한 라운드, 10 × (0.5 + 0.5 × 0.5) = 7.5초 대기
+        assert items == ["A", "B"]
+        assert clock.sleeps == [7.5]
+        assert len(q) == 0
+
+    def test_gives_up_after_max_attempts(self):
+        q, _ = make_queue(max_attempts=1)
+        q.defer(["A", "B"], attempt=1)
+        q.next_round()
+
+        gave_up = q.defer(["B"], attempt=2)
+
+        assert gave_up == ["B"]
+        stats = q.stats()
+        assert (stats["deferred"], stats["recovered"], stats["gave_up"]) == (2, 1, 1)
+
+    def test_disabled_returns_items_immediately(self):
+        """max_attempts=0 → 재시도 없이 바로 포기"""
+        q, clock = make_queue(max_attempts=0)
+
+        assert q.defer(["A"], attempt=1) == ["A"]
+        assert q.next_round() == []
+        assert clock.sleeps == []
+        assert q.stats()["recovered"] == 0
+
+
+# ==========================================
+# poll_until (늦은 데이터 재조회) 테스트
+# ==========================================
+
+class TestPollUntil:
+    """완전성 확인 → 백오프 대기 → 누락분만 재수집"""
+
+    def test_polls_missing_until_target(self):
+        # Given: 확인할 때마다 누락이 줄어드는 수집률
+        clock = FakeClock()
+        probes = iter([(0.90, ["A", "B"]), (0.95, ["B"]), (1.0, [])])
+        polled = []
+
+        # When
+        result = poll_until(lambda: next(probes), polled.append, target=0.995, deadline=10_000,
+                            base_wait=300, max_wait=1800, clock=clock, sleep=clock.sleep, rng=lambda: 1.0)
+
+        # Then: 누락분만 재요청, 대기 300 → 600초
+        assert polled == [["A", "B"], ["B"]]
+        assert clock.sleeps == [300, 600]
+        assert result == {"rounds": 2, "coverage": 1.0, "stopped": "target", "waited": 900}
+
+    def test_stops_before_wait_crosses_deadline(self):
+        """다음 대기가 마감을 넘으면 자지 않고 종료"""
+        clock = FakeClock()
+        polled = []
+
+        result = poll_until(lambda: (0.5, ["A"]), polled.append, target=0.995, deadline=1000,
+                            base_wait=300, max_wait=1800, clock=clock, sleep=clock.sleep, rng=lambda: 1.0)
+
+        # 300 + 600 = 900 뒤 다음 대기 1200 은 마감(1000) 초과
+        assert clock.sleeps == [300, 600]
+        assert len(polled) == 2
+        assert (result["stopped"], result["coverage"]) == ("deadline", 0.5)
+
+    def test_complete_data_does_not_poll(self):
+        clock = FakeClock()
+
+        result = poll_until(lambda: (1.0, []), lambda m: None, target=0.995, deadline=0,
+                            base_wait=300, max_wait=1800, clock=clock, sleep=clock.sleep)
+
+        assert (result["rounds"], result["stopped"], clock.sleeps) == (0, "target", [])
+
+
+# ==========================================
+# CircuitBreaker 테스트
+# ==========================================
+
+def make_breaker(threshold=3, cooldown=10):
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_min=60, burst=1, clock=clock, sleep=clock.sleep)
+    return CircuitBreaker(bucket, threshold=threshold, cooldown=cooldown, clock=clock), bucket, clock
+
+
+class TestCircuitBreaker:
+    """연속 실패 → 전체 일시정지 테스트"""
+
+    def test_opens_after_threshold_and_pauses_bucket(self):
+        # Given
+        breaker, bucket, clock = make_breaker(threshold=3, cooldown=10)
+
+        # When: 연속 실패 3회
+        for _ in range(3):
+            breaker.record_failure()
+
+        # Then: 10초 동안 토큰 발급 중지
+        assert breaker.is_open
+        assert bucket.reserve() >= 10
+        assert breaker.stats()["trips"] == 1
+
+    def test_success_resets_count(self):
+        breaker, _, _ = make_breaker(threshold=3)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert not breaker.is_open
+
+    def test_failures_while_open_are_ignored(self):
+        """열려 있는 동안 도착한 실패(같은 장애)로는 다시 열리지 않음"""
+        breaker, _, _ = make_breaker(threshold=2)
+        for _ in range(5):
+            breaker.record_failure()
+
+        assert breaker.stats()["trips"] == 1
+
+    def test_half_open_retrips_with_doubled_cooldown(self):
+        """재개 후 첫 실패에 다시 열리고 정지 시간 2배"""
+        breaker, _, clock = make_breaker(threshold=3, cooldown=10)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 10
+
+        breaker.record_failure()
+
+        assert breaker.is_open
+        assert breaker.stats()["paused_seconds"] == 30   # 10 + 20
+
+
+# ==========================================
+# iter_fetch_scheduled 재시도 테스트
+# ==========================================
+
+def fetch_scheduled(fetch, stocks, q, batch_size=50):
+    """daily_update 와 같은 경로 (WorkStream + 스레드 엔진) → 내보낸 (code, name, rows)"""
+    stream = WorkStream("ohlcv", fetch, [stocks], [(date.today(), date.today())], batch_size, q)
+    return [t for _, _, chunk in iter_fetch_scheduled("thread", None, WorkScheduler([stream]))
+            for t in chunk]
+
+
+class TestScheduledRetry:
+    """daily_update 지연 재시도 루프 테스트"""
+
+    def test_failed_codes_are_retried_in_batches(self):
+        # Given: 첫 요청에서는 "B", "C" 가 빈 응답
+        calls = []
+
+        def fetch(client, stocks, start, end):
+            calls.append([c for c, _ in stocks])
+            first = len(calls) == 1
+            return [(c, n, [] if first and c in ("B", "C") else [{"c": c}]) for c, n in stocks]
+        q, _ = make_queue(max_attempts=2)
+        stocks = [("A", "a"), ("B", "b"), ("C", "c")]
+
+        # When
+        results = fetch_scheduled(fetch, stocks, q)
+
+        # Then: 실패 2종목을 한 묶음으로 재요청, 모든 종목 1번씩
+        assert calls == [["A", "B", "C"], ["B", "C"]]
+        assert sorted(c for c, _, rows in results if rows) == ["A", "B", "C"]
+        assert q.stats()["recovered"] == 2
+
+    def test_gives_up_with_empty_rows(self):
+        def fetch(client, stocks, start, end):
+            return [(c, n, []) for c, n in stocks]
+        q, _ = make_queue(max_attempts=1)
+
+        results = fetch_scheduled(fetch, [("A", "a")], q)
+
+        assert results == [("A", "a", [])]
+        assert q.stats()["gave_up"] == 1
@@ -0,0 +1,168 @@
+"""
+수집 작업 스케줄러 테스트
+
+즉시 완료되는 가짜 executor 로 흐름 간 섞기(weight·priority) / 재시도 / 진행 현황을 검증합니다.
+"""
+
+from concurrent.futures import Future
+from datetime import date
+
+from collectors.scheduler import WorkScheduler, WorkStream, apply_schedule, parse_stream_map
+from scripts.daily_update import iter_fetch_scheduled
+from tests.test_collectors.test_retry import make_queue
+
+DAY = date(2026, 2, 20)
+
+
+class ImmediateExecutor:
+    """submit 즉시 실행해 완료된 Future 반환 (제출 순서 기록)"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fetch_fn, chunk, start, end):
+        self.submitted.append(fetch_fn.__name__)
+        future = Future()
+        future.set_result(fetch_fn(chunk, start, end))
+        return future
+
+
+def ok_fetch(chunk, start, end):
+    return [(code, name, [{"code": code}]) for code, name in chunk]
+
+
+def hist(chunk, start, end):
+    return ok_fetch(chunk, start, end)
+
+
+def investor(chunk, start, end):
+    return ok_fetch(chunk, start, end)
+
+
+def stocks(prefix: str, n: int) -> list[tuple[str, str]]:
+    return [(f"{prefix}{i}", f"{prefix}{i}") for i in range(n)]
+
+
+def make_stream(name, fetch, n_chunks, **kw):
+    q, _ = make_queue()
+    return WorkStream(name, fetch, [[s] for s in stocks(name, n_chunks)], [(DAY, DAY)], 1, q, **kw)
+
+
+class TestWorkScheduler:
+    """흐름 섞기 / 우선순위 / 재시도 테스트"""
+
+    def test_equal_weights_interleave(self):
+        # Given
+        streams = [make_stream("h", hist, 3), make_stream("i", investor, 3)]
+        executor = ImmediateExecutor()
+
+        # When
+        results = list(WorkScheduler(streams).run(executor, max_inflight=1))
+
+        # Then: 번갈아 제출, 모든 종목 한 번씩
+        assert executor.submitted == ["hist", "investor"] * 3
+        assert sorted(code for _, _, chunk in results for code, _, _ in chunk) == \
+            ["h0", "h1", "h2", "i0", "i1", "i2"]
+
+    def test_weights_set_submission_ratio(self):
+        streams = [make_stream("h", hist, 4, weight=2), make_stream("i", investor, 2, weight=1)]
+        executor = ImmediateExecutor()
+
+        list(WorkScheduler(streams).run(executor, max_inflight=1))
+
+        assert executor.submitted == ["hist", "investor", "hist", "hist", "investor", "hist"]
+
+    def test_priority_runs_first(self):
+        streams = [make_stream("h", hist, 2), make_stream("i", investor, 2, priority=1)]
+        executor = ImmediateExecutor()
+
+        list(WorkScheduler(streams).run(executor, max_inflight=1))
+
+        assert executor.submitted == ["investor", "investor", "hist", "hist"]
+
+    def test_retry_backoff_does_not_block_other_stream(self):
+        """한 흐름이 재시도 백오프 중이어도 다른 흐름 단위는 계속 제출"""
+        # Given: h 는 첫 요청 빈 응답 → 재시도, 재시도 대기는 가짜 시계
+        calls = []
+
+        def flaky(chunk, start, end):
+            calls.append("h")
+            return [(code, name, [] if len(calls) == 1 else [{"c": code}]) for code, name in chunk]
+
+        def steady(chunk, start, end):
+            calls.append("i")
+            return ok_fetch(chunk, start, end)
+
+        h_queue, clock = make_queue(max_attempts=1)
+        h = WorkStream("h", flaky, [[("A", "a")]], [(DAY, DAY)], 10, h_queue)
+        i = make_stream("i", steady, 3)
+
+        # When
+        results = list(WorkScheduler([h, i]).run(ImmediateExecutor(), max_inflight=1))
+
+        # Then: 재시도(h)는 i 단위가 모두 끝난 뒤 백오프를 기다려 수행, A 는 복구
+        assert calls == ["h", "i", "i", "i", "h"]
+        assert clock.sleeps and h_queue.stats()["recovered"] == 1
+        assert (h.progress()["attempt"], h.progress()["deferred"]) == (1, 1)
+        assert [chunk for name, _, chunk in results if name == "h"] == [[("A", "a", [{"c": "A"}])]]
+
+    def test_progress_view(self):
+        streams = [make_stream("ohlcv", hist, 2), make_stream("investor", investor, 1)]
+        scheduler = WorkScheduler(streams)
+
+        list(scheduler.run(ImmediateExecutor(), max_inflight=2))
+
+        assert scheduler.progress()["ohlcv"] == {"done": 2, "total": 2, "inflight": 0, "retrying": 0,
+                                                 "attempt": 0, "deferred": 0}
+        assert scheduler.progress_line() == "ohlcv 2/2 | investor 1/1"
+
+    def test_thread_engine_runs_streams(self):
+        """daily_update 스레드 엔진으로 두 흐름 수행"""
+        def h_fetch(client, chunk, start, end):
+            return ok_fetch(chunk, start, end)
+
+        q1, _ = make_queue()
+        q2, _ = make_queue()
+        streams = [WorkStream("h", h_fetch, [stocks("h", 5)], [(DAY, DAY)], 5, q1),
+                   WorkStream("i", h_fetch, [stocks("i", 2), stocks("j", 2)], [(DAY, DAY)], 2, q2)]
+
+        results = list(iter_fetch_scheduled("thread", None, WorkScheduler(streams)))
+
+        assert sorted(len(chunk) for _, _, chunk in results) == [2, 2, 5]
+
+
+class TestWorkStreamSkip:
+    """이어받기: 저장 완료 (종목, 창) 제외"""
+
+    def test_skips_done_units_per_window(self):
+        # Given: 창 2개, 첫 창에서 A·B 완료, 둘째 창에서 C 완료
+        day2 = date(2026, 3, 30)
+        q, _ = make_queue()
+        skip = {("A", DAY), ("B", DAY), ("C", day2)}
+
+        # When
+        stream = WorkStream("ohlcv", hist, [[("A", "a"), ("B", "b")], [("C", "c")]],
+                            [(DAY, DAY), (day2, day2)], 2, q, skip=skip)
+
+        # Then: 남은 단위만 batch_size 로 다시 묶음
+        assert [([c for c, _ in chunk], s) for chunk, s, _ in stream.units] == \
+            [(["C"], DAY), (["A", "B"], day2)]
+        assert (stream.total, stream.skipped) == (3, 3)
+
+
+class TestApplySchedule:
+    """설정 문자열 → priority / weight"""
+
+    def test_parse_stream_map(self):
+        assert parse_stream_map("ohlcv=2, investor=0.5,bad,x=") == {"ohlcv": 2.0, "investor": 0.5}
+        assert parse_stream_map("") == {}
+
+    def test_default_weight_follows_unit_count(self):
+        streams = [make_stream("ohlcv", hist, 10), make_stream("investor", investor, 40)]
+
+        apply_schedule(streams, priority="investor=1", weights="")
+
+        assert [(s.priority, s.weight) for s in streams] == [(0, 10), (1, 40)]
+
+        apply_schedule(streams, weights="ohlcv=3")
+        assert streams[0].weight == 3
@@ -0,0 +1,85 @@
+"""
+샤드 병렬 수집 테스트
+
+프로세스 풀 없이 샤드 분배 / 샤드 결과 합치기 / 통계 합산을 검증합니다.
+"""
+
+from datetime import date
+
+from scripts.daily_update import ChunkCollector, merge_stats, shard_specs
+
+DAY = date(2026, 2, 20)
+
+
+def hist(chunk, start, end):
+    return []
+
+
+def investor(chunk, start, end):
+    return []
+
+
+def chunks(prefix: str, n: int) -> list[list[tuple[str, str]]]:
+    return [[(f"{prefix}{i}", f"{prefix}{i}")] for i in range(n)]
+
+
+class TestShardSpecs:
+    """종목 묶음 → 샤드 분배"""
+
+    def test_round_robin_with_own_skip_and_prev_close(self):
+        # Given: OHLCV 4묶음, 수급 2묶음, 이어받기로 건너뛸 단위
+        streams = {"ohlcv": (hist, chunks("A", 4), 1), "investor": (investor, chunks("B", 2), 1)}
+        skip = {"ohlcv": {("A1", DAY), ("A2", DAY)}, "investor": set()}
+
+        # When
+        specs = shard_specs(2, streams, skip, {"A0": 100, "A1": 200}, run_id=7, windows=[(DAY, DAY)])
+
+        # Then: 묶음은 번갈아, skip·전일 종가는 자기 샤드 종목만, 공통 값은 그대로
+        first, second = specs
+        assert first["streams"]["ohlcv"][1] == [[("A0", "A0")], [("A2", "A2")]]
+        assert second["streams"]["investor"][1] == [[("B1", "B1")]]
+        assert first["streams"]["ohlcv"][3] == {("A2", DAY)}
+        assert (first["prev_close"], second["prev_close"]) == ({"A0": 100}, {"A1": 200})
+        assert (first["run_id"], second["shard"]) == (7, 1)
+
+    def test_empty_shards_are_dropped(self):
+        streams = {"ohlcv": (hist, chunks("A", 1), 1), "investor": (investor, [], 1)}
+
+        specs = shard_specs(4, streams, {"ohlcv": set(), "investor": set()}, {})
+
+        assert [s["shard"] for s in specs] == [0]
+
+
+class TestMergeShards:
+    def test_collector_merges_and_keeps_only_still_missing(self):
+        # Given: 두 샤드 결과
+        collector = ChunkCollector("thread", None, None, None)
+        for seen, failed in (({"A", "B"}, ["B"]), ({"C", "D"}, ["C", "D"])):
+            collector.merge({"seen": {"ohlcv": seen, "investor": set()},
+                             "failed": {"ohlcv": set(failed), "investor": set()},
+                             "fail_codes": {"ohlcv": failed, "investor": []},
+                             "mktcap_source": {"api": 1, "computed": len(seen) - 1}})
+
+        assert collector.counts("ohlcv") == (1, 3)
+        assert collector.mktcap_source == {"api": 2, "computed": 2}
+
+        # When: 재조회로 C 복구
+        collector.keep_failed("ohlcv", {"B", "D"})
+
+        # Then
+        assert collector.counts("ohlcv") == (2, 2)
+        assert collector.fail_codes["ohlcv"] == ["B", "D"]
+
+    def test_merge_stats(self):
+        a = {"calls": 3, "total_wait": 1.5, "max_wait": 1.0, "rate_per_min": 57.0,
+             "adaptive": {"min_rate_seen": 40.0, "throttled": 1}, "breaker": {"open": False},
+             "tables": {"ohlcv": {"rows": 10}}}
+        b = {"calls": 2, "total_wait": 0.5, "max_wait": 2.0, "rate_per_min": 57.0,
+             "adaptive": {"min_rate_seen": 20.0, "throttled": 0}, "breaker": {"open": True},
+             "tables": {"ohlcv": {"rows": 5}, "investor": {"rows": 1}}}
+
+        merged = merge_stats([a, b, None])
+
+        assert merged == {"calls": 5, "total_wait": 2.0, "max_wait": 2.0, "rate_per_min": 57.0,
+                          "adaptive": {"min_rate_seen": 20.0, "throttled": 1}, "breaker": {"open": True},
+                          "tables": {"ohlcv": {"rows": 15}, "investor": {"rows": 1}}}
@@ -0,0 +1,130 @@
+"""
+COPY 대량 UPSERT 테스트
+
+가짜 커서로 실제 DB 없이 SQL 변환 / CSV 인코딩 / 경로 선택(행 수 기준)을 검증합니다.
+"""
+
+import csv
+from datetime import date
+
+import pytest
+
+from config.settings import settings
+from database.bulk import staging_plan, merge_sql, to_csv, copy_upsert
+from scripts.daily_update import upsert_batch, OHLCV_SQL, MKTCAP_SQL, INVESTOR_SQL
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = conn.rowcount
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+        self.rowcount = self.conn.rowcount
+
+    def copy_expert(self, sql, file):
+        self.conn.copied.append((sql, file.read()))
+
+
+class FakeConn:
+    def __init__(self, rowcount=0):
+        self.rowcount = rowcount
+        self.executed, self.copied = [], []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestStagingPlan:
+    """UPSERT SQL → staging 병합 SQL 변환 테스트"""
+
+    def test_parses_table_columns_and_keys(self):
+        plan = staging_plan(INVESTOR_SQL)
+
+        assert plan.table == "investor_trading"
+        assert plan.columns == ("time", "stock_code", "investor_type", "net_buy_value", "net_buy_volume")
+        assert plan.keys == ("time", "stock_code", "investor_type")
+        assert plan.stage == "_stage_investor_trading"
+
+    def test_merge_keeps_conflict_guard_and_dedups_keys(self):
+        plan = staging_plan(OHLCV_SQL)
+
+        sql = merge_sql(OHLCV_SQL, plan)
+
+        assert "VALUES %s" not in sql
+        assert "SELECT DISTINCT ON (time, stock_code)" in sql
+        assert "FROM _stage_ohlcv_daily ORDER BY time, stock_code, _seq DESC" in sql
+        assert "IS DISTINCT FROM" in sql       # 값이 같으면 갱신 안 함 (변경 건수 의미 유지)
+
+    def test_rejects_unsupported_sql(self):
+        with pytest.raises(ValueError):
+            staging_plan("UPDATE stocks SET is_active = FALSE")
+
+
+class TestCopyUpsert:
+    """COPY 경로 테스트"""
+
+    def test_csv_encodes_dates_nulls_and_sequence(self):
+        buf = to_csv([(date(2026, 2, 20), "005930", None), (date(2026, 2, 20), "000660", 7)])
+
+        assert buf.read() == "2026-02-20,005930,,0\n2026-02-20,000660,7,1\n"
+
+    def test_copy_then_merge_reports_changed_and_total(self):
+        # Given
+        conn = FakeConn(rowcount=1)
+        rows = [(date(2026, 2, 20), "005930", 100), (date(2026, 2, 20), "000660", 200)]
+
+        # When
+        changed, total = copy_upsert(conn, MKTCAP_SQL, rows)
+
+        # Then
+        assert (changed, total) == (1, 2)
+        assert "CREATE TEMP TABLE IF NOT EXISTS _stage_market_cap_daily" in conn.executed[0]
+        copy_sql, data = conn.copied[0]
+        assert copy_sql.startswith("COPY _stage_market_cap_daily (time, stock_code, market_cap, _seq)")
+        assert list(csv.reader(data.splitlines()))[1] == ["2026-02-20", "000660", "200", "1"]
+        assert conn.executed[-1].lstrip().startswith("INSERT INTO market_cap_daily")
+        assert conn.commits == 1
+
+
+class TestUpsertBatchPath:
+    """행 수에 따른 경로 자동 선택"""
+
+    def test_small_batches_use_execute_values(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_COPY_THRESHOLD", 3)
+        calls = []
+        monkeypatch.setattr("scripts.daily_update.psycopg2.extras.execute_values",
+                            lambda cur, sql, rows, page_size: calls.append(len(rows)))
+        conn = FakeConn(rowcount=2)
+
+        assert upsert_batch(conn, MKTCAP_SQL, [(date(2026, 2, 20), "005930", 1)] * 2) == (2, 2)
+        assert calls == [2] and not conn.copied
+
+    def test_large_batches_use_copy(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_COPY_THRESHOLD", 3)
+        conn = FakeConn(rowcount=3)
+
+        rows = [(date(2026, 2, 20), f"00000{i}", i) for i in range(3)]
+        assert upsert_batch(conn, MKTCAP_SQL, rows) == (3, 3)
+        assert len(conn.copied) == 1
+
+    def test_threshold_zero_disables_copy(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_COPY_THRESHOLD", 0)
+        monkeypatch.setattr("scripts.daily_update.psycopg2.extras.execute_values",
+                            lambda cur, sql, rows, page_size: None)
+        conn = FakeConn(rowcount=0)
+
+        upsert_batch(conn, MKTCAP_SQL, [(date(2026, 2, 20), "005930", 1)] * 10)
+
+        assert not conn.copied
@@ -0,0 +1,104 @@
+"""
+단계별 수집 로그 테스트
+
+가짜 연결로 실제 DB 없이 단계 기록 / 실패 기록 / 한 번에 저장을 검증합니다.
+"""
+
+from datetime import date, datetime, timezone
+
+import pytest
+
+from database.collection_log import CollectionLog, COLUMNS
+
+DAY = date(2026, 2, 20)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(" ".join(sql.split()))
+
+
+class FakeConn:
+    def __init__(self):
+        self.executed, self.inserted = [], []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def inserted(monkeypatch):
+    """execute_values → 연결별 INSERT 행 기록"""
+    def fake_execute_values(cur, sql, rows, page_size=100):
+        cur.conn.inserted.extend(dict(zip(COLUMNS, r)) for r in rows)
+    monkeypatch.setattr("database.collection_log.psycopg2.extras.execute_values", fake_execute_values)
+
+
+class TestCollectionLog:
+    def test_step_records_fields_and_duration(self):
+        log = CollectionLog(7, DAY)
+
+        with log.step("ANOMALY") as step:
+            step["records_count"] = 3
+
+        (row,) = log.rows
+        assert (row["run_id"], row["data_type"], row["status"], row["records_count"]) == (7, "ANOMALY", "SUCCESS", 3)
+        assert row["started_at"] <= row["completed_at"]
+
+    def test_failed_step_is_recorded_and_reraised(self):
+        log = CollectionLog(7, DAY)
+
+        with pytest.raises(ValueError):
+            with log.step("QUALITY_CHECK"):
+                raise ValueError("boom")
+
+        assert (log.rows[0]["status"], log.rows[0]["error_message"]) == ("FAILED", "ValueError: boom")
+
+    def test_add_normalizes_timezone_to_kst(self):
+        log = CollectionLog(None, DAY)
+
+        row = log.add("OHLCV", datetime(2026, 2, 20, 7, 30, tzinfo=timezone.utc),
+                      datetime(2026, 2, 20, 16, 40), api_calls=76, throttle_wait=12.5)
+
+        # TIMESTAMP(시간대 없음) 컬럼 → KST 벽시계 시각
+        assert row["started_at"] == datetime(2026, 2, 20, 16, 30)
+        assert row["completed_at"] == datetime(2026, 2, 20, 16, 40)
+
+
+class TestSave:
+    def test_one_insert_and_commit_for_all_steps(self, inserted):
+        # Given: 단계 2개
+        conn = FakeConn()
+        log = CollectionLog(7, DAY)
+        log.add("MASTER_SYNC", datetime(2026, 2, 20, 16), datetime(2026, 2, 20, 16, 1), records_count=2)
+        log.add("OHLCV", datetime(2026, 2, 20, 16, 1), datetime(2026, 2, 20, 16, 9), status="PARTIAL",
+                error_message="실패 1종목: 000001", db_write_seconds=4.2)
+
+        # When
+        saved = log.save(conn)
+
+        # Then: DDL 없이 한 번에 INSERT, 커밋 1번, 저장한 행은 비움
+        assert saved == 2 and conn.commits == 1 and log.rows == []
+        assert conn.executed == []
+        assert [(r["data_type"], r["status"]) for r in conn.inserted] == [("MASTER_SYNC", "SUCCESS"),
+                                                                         ("OHLCV", "PARTIAL")]
+        assert conn.inserted[1]["db_write_seconds"] == 4.2
+
+    def test_nothing_to_save(self):
+        conn = FakeConn()
+
+        assert CollectionLog(7, DAY).save(conn) == 0
+        assert conn.executed == []
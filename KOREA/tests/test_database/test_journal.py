@@ -0,0 +1,100 @@
+"""
+실행 journal 테스트
+
+가짜 연결로 실제 DB 없이 이어받을 실행 선택 / 완료 단위 조회 / journal 행 구성을 검증합니다.
+"""
+
+from datetime import date
+
+from database.journal import RunJournal, UNITS_SQL
+from database.bulk import staging_plan
+
+DAY = date(2026, 2, 20)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((" ".join(sql.split()), params))
+
+    def fetchone(self):
+        return self.conn.one
+
+    def fetchall(self):
+        return self.conn.all
+
+
+class FakeConn:
+    def __init__(self, one=None, all_rows=()):
+        self.one, self.all = one, list(all_rows)
+        self.executed = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestRunJournal:
+    """collection_runs / collection_run_units 테스트"""
+
+    def test_begin_inserts_running_run(self):
+        conn = FakeConn(one=(7,))
+
+        journal = RunJournal.begin(conn, DAY, DAY)
+
+        assert journal.run_id == 7
+        assert conn.executed == [(
+            "INSERT INTO collection_runs (start_date, end_date, status) VALUES (%s, %s, 'RUNNING') RETURNING id",
+            (DAY, DAY))]
+
+    def test_resume_latest_unfinished_run(self):
+        """가장 최근 실행이 끝나지 않았으면 그 실행의 기간으로 이어받기"""
+        conn = FakeConn(one=(3, date(2026, 1, 1), DAY, "RUNNING"))
+
+        journal = RunJournal.resume(conn)
+
+        assert (journal.run_id, journal.start, journal.end) == (3, date(2026, 1, 1), DAY)
+
+    def test_no_resume_after_success(self):
+        assert RunJournal.resume(FakeConn(one=(3, DAY, DAY, "SUCCESS"))) is None
+        assert RunJournal.resume(FakeConn(one=None)) is None
+
+    def test_resume_for_target_date_filters_range(self):
+        conn = FakeConn(one=(4, DAY, DAY, "PARTIAL"))
+
+        RunJournal.resume(conn, DAY)
+
+        sql, params = conn.executed[-1]
+        assert "WHERE start_date = %s AND end_date = %s" in sql and params == (DAY, DAY)
+
+    def test_done_units_and_entries(self):
+        # Given
+        conn = FakeConn(all_rows=[("ohlcv", "005930", DAY)])
+        journal = RunJournal(conn, 9, DAY, DAY)
+
+        # When
+        done = journal.done_units()
+        entries = journal.entries("investor", (DAY, DAY),
+                                  [("005930", "삼성전자", [{"x": 1}, {"x": 2}]), ("000660", "SK하이닉스", [])])
+
+        # Then: 데이터를 못 받은 종목은 기록하지 않음 (이어받기 때 다시 수집)
+        assert done == {("ohlcv", "005930", DAY)}
+        assert entries == [(9, "investor", "005930", DAY, DAY, 2)]
+
+    def test_units_sql_supports_copy_path(self):
+        """journal 행도 upsert_batch(COPY 경로 포함)로 쓸 수 있는 형식"""
+        plan = staging_plan(UNITS_SQL)
+
+        assert plan.table == "collection_run_units"
+        assert plan.keys == ("run_id", "endpoint", "stock_code", "start_date")
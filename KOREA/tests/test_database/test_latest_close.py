@@ -0,0 +1,89 @@
+"""
+최근 종가 캐시 테스트
+
+가짜 연결로 실제 DB 없이 캐시 적중 / 미스 시 종목별 조회 / 갱신 대상 종목을 검증합니다.
+"""
+
+from datetime import date
+
+from database.latest_close import prev_close_as_of, refresh_latest_close
+
+DAY = date(2026, 2, 20)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((" ".join(sql.split()), params))
+        self.rowcount = self.conn.rowcount
+
+    def fetchall(self):
+        return self.conn.results.pop(0)
+
+
+class FakeConn:
+    def __init__(self, *results, rowcount=0):
+        self.results = list(results)
+        self.rowcount = rowcount
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+class TestPrevCloseAsOf:
+    """기준일 직전 종가 조회"""
+
+    def test_cache_hit_skips_ohlcv_scan(self):
+        # Given: 모든 종목이 캐시로 판단 가능 (A: 직전 종가, B: 기준일 이전 데이터 없음)
+        conn = FakeConn([("A", 1000, False), ("B", None, False)])
+
+        # When
+        prev = prev_close_as_of(conn, DAY)
+
+        # Then: 활성 종목 기준 조회 1번, ohlcv_daily 조회 없음
+        assert prev == {"A": 1000}
+        sqls = [sql for sql, _ in conn.executed if "SELECT" in sql]
+        assert len(sqls) == 1 and "FROM stocks WHERE is_active = TRUE" in sqls[0]
+
+    def test_cache_miss_falls_back_per_stock(self):
+        """캐시에 없는 종목 / 과거 기준일 → 그 종목만 ohlcv_daily 인덱스 조회"""
+        conn = FakeConn([("A", 1000, False), ("B", None, True), ("C", None, True)],
+                        [("B", 2000)])
+
+        prev = prev_close_as_of(conn, DAY, codes=["C", "A", "B"])
+
+        assert prev == {"A": 1000, "B": 2000}
+        as_of_sql, as_of_params = conn.executed[-2]
+        assert "unnest(%(codes)s::varchar[])" in as_of_sql
+        assert as_of_params == {"as_of": DAY, "codes": ["A", "B", "C"]}
+        assert conn.executed[-1][1] == (["B", "C"], DAY)
+
+
+class TestRefreshLatestClose:
+    def test_refreshes_unique_codes(self):
+        conn = FakeConn(rowcount=2)
+
+        changed = refresh_latest_close(conn, ["B", "A", "B"])
+
+        assert changed == 2
+        sql, params = conn.executed[-1]
+        assert sql.startswith("INSERT INTO latest_close") and params == (["A", "B"],)
+
+    def test_no_codes_no_query(self):
+        conn = FakeConn()
+
+        assert refresh_latest_close(conn, []) == 0
+        assert conn.executed == []
@@ -0,0 +1,125 @@
+"""
+종목 마스터 동기화 테스트
+
+가짜 연결로 실제 DB 없이 한 트랜잭션 반영 / 변경 유형 분류 / high-water mark 조회 구간을 검증합니다.
+"""
+
+from datetime import date
+
+import pytest
+
+from database.stock_master import expired_window_start, sync_master
+
+TODAY = date(2026, 2, 20)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.last = ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.last = " ".join(sql.split())
+        self.conn.executed.append((self.last, params))
+        if self.conn.fail_on and self.conn.fail_on in self.last:
+            raise RuntimeError("db error")
+
+    def fetchone(self):
+        return self.conn.results.pop(0)
+
+    def fetchall(self):
+        for key, rows in self.conn.returning.items():
+            if key in self.last:
+                return rows
+        return []
+
+
+class FakeConn:
+    def __init__(self, results=(), returning=None, fail_on=None):
+        self.results = list(results)
+        self.returning = returning or {}
+        self.fail_on = fail_on
+        self.executed, self.staged = [], {}
+        self.commits = self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def staged(monkeypatch):
+    """execute_values → 임시 테이블별 적재 행 기록"""
+    def fake_execute_values(cur, sql, rows, page_size=100):
+        cur.conn.staged[sql.split()[2]] = rows
+    monkeypatch.setattr("database.stock_master.psycopg2.extras.execute_values", fake_execute_values)
+
+
+def api_stock(code, name="종목", market="KOSPI", isin=None):
+    return {"code": code, "name": name, "market": market, "standard_code": isin,
+            "listing_date": date(2020, 1, 1)}
+
+
+class TestSyncMaster:
+    """API 목록 ↔ stocks 차이 반영"""
+
+    def test_one_transaction_with_change_types(self, staged):
+        # Given: 신규 1 / 이름·시장 변경 1 / ISIN 변경 1 / 폐지 1
+        conn = FakeConn(returning={
+            "INSERT INTO stocks": [("000003",)],
+            "WITH diff": [("000001", True, True, False), ("000002", False, False, True)],
+            "SET is_active = FALSE": [("000009",)],
+        })
+        api = [api_stock("000001"), api_stock("000002"), api_stock("000003"), api_stock("000003")]
+        expired = [{"code": "000009", "name": "폐지", "delisting_date": TODAY}]
+
+        # When
+        result = sync_master(conn, api, expired, TODAY)
+
+        # Then: 커밋 1번, 중복 코드는 한 번만 적재, 유형별 분류
+        assert conn.commits == 1
+        assert [r[0] for r in conn.staged["_api_stocks"]] == ["000001", "000002", "000003"]
+        assert conn.staged["_api_expired"] == [("000009", TODAY)]
+        assert result == {"new_listed": ["000003"], "delisted": ["000009"], "renamed": ["000001"],
+                          "market_changed": ["000001"], "isin_changed": ["000002"]}
+        assert conn.executed[-1][1] == ("stock_expired", TODAY)
+
+    def test_failed_expired_fetch_keeps_watermark(self, staged):
+        """폐지 목록 조회 실패(None) → 폐지 처리·high-water mark 갱신 안 함"""
+        conn = FakeConn()
+
+        result = sync_master(conn, [api_stock("000001")], None, TODAY)
+
+        assert result["delisted"] == []
+        assert not any("sync_watermarks" in sql for sql, _ in conn.executed)
+
+    def test_error_rolls_back_everything(self, staged):
+        conn = FakeConn(fail_on="SET is_active = FALSE")
+
+        with pytest.raises(RuntimeError):
+            sync_master(conn, [api_stock("000001")], [], TODAY)
+
+        assert (conn.commits, conn.rollbacks) == (0, 1)
+
+
+class TestExpiredWindow:
+    def test_starts_from_watermark_minus_overlap(self):
+        conn = FakeConn(results=[(date(2026, 2, 19),)])
+
+        assert expired_window_start(conn, overlap_days=7) == date(2026, 2, 12)
+
+    def test_first_run_uses_oldest_listing(self):
+        conn = FakeConn(results=[None, (date(1990, 3, 1),)])
+
+        assert expired_window_start(conn) == date(1990, 3, 1)
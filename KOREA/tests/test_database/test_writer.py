@@ -0,0 +1,178 @@
+"""
+DB writer 스레드 테스트
+
+가짜 연결·쓰기 함수로 실제 DB 없이 묶음 합치기 / 큐 backpressure / 오류 전달 / 통계를 검증합니다.
+"""
+
+import threading
+
+import pytest
+
+from database.writer import DbWriter
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class RecordingWrite:
+    """write(conn, sql, rows) 호출 기록, gate 가 열릴 때까지 쓰기를 막을 수 있음"""
+
+    def __init__(self, changed_ratio: float = 1.0):
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.changed_ratio = changed_ratio
+
+    def __call__(self, conn, sql, rows):
+        self.gate.wait(5)
+        self.calls.append((sql, list(rows)))
+        return int(len(rows) * self.changed_ratio), len(rows)
+
+
+class TestDbWriter:
+    """생산자/소비자 writer 테스트"""
+
+    def test_writes_all_rows_and_counts_per_key(self):
+        # Given
+        conn, write = FakeConn(), RecordingWrite(changed_ratio=0.5)
+
+        # When
+        with DbWriter(lambda: conn, write, min_batch=10) as writer:
+            for i in range(5):
+                writer.put("ohlcv", "OHLCV", [(i, n) for n in range(4)])
+            writer.put("market_cap", "MKTCAP", [(1,), (2,)])
+            writer.put("ohlcv", "OHLCV", [])        # 빈 묶음은 무시
+
+        # Then
+        tables = writer.stats()["tables"]
+        assert tables["ohlcv"] == {"rows": 20, "changed": 10, "skipped": 10}
+        assert tables["market_cap"] == {"rows": 2, "changed": 1, "skipped": 1}
+        assert set(writer.stats()["key_seconds"]) == {"ohlcv", "market_cap"}
+        assert sum(len(rows) for sql, rows in write.calls if sql == "OHLCV") == 20
+        assert conn.closed
+
+    def test_queued_items_are_merged_into_larger_batches(self):
+        """writer가 막혀 있는 동안 쌓인 묶음은 한 번에 합쳐 씀"""
+        # Given: 첫 쓰기를 막아 큐에 묶음이 쌓이게 함
+        write = RecordingWrite()
+        write.gate.clear()
+        writer = DbWriter(FakeConn, write, max_queue=100, min_batch=1000).start()
+        writer.put("ohlcv", "OHLCV", [(0,)])
+        threading.Timer(0.2, write.gate.set).start()
+
+        # When
+        for i in range(1, 11):
+            writer.put("ohlcv", "OHLCV", [(i,)])
+        writer.close()
+
+        # Then: 11개 묶음 → 쓰기 호출은 그보다 적음, 순서 유지
+        rows = [r for _, batch in write.calls for r in batch]
+        assert rows == [(i,) for i in range(11)]
+        assert len(write.calls) < 11
+
+    def test_full_queue_blocks_producer(self):
+        """큐가 가득 차면 put 이 writer가 비울 때까지 대기"""
+        # Given: 쓰기가 막힌 writer, 큐 크기 1
+        write = RecordingWrite()
+        write.gate.clear()
+        writer = DbWriter(FakeConn, write, max_queue=1, min_batch=1).start()
+        writer.put("k", "SQL", [(1,)])      # writer가 꺼내 쓰기에서 대기
+
+        # When: 큐를 채운 뒤 하나 더 넣기
+        finished = threading.Event()
+
+        def producer():
+            writer.put("k", "SQL", [(2,)])
+            writer.put("k", "SQL", [(3,)])
+            finished.set()
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+
+        # Then: 쓰기가 막힌 동안은 끝나지 않고, 풀리면 끝남
+        assert not finished.wait(0.3)
+        write.gate.set()
+        thread.join(5)
+        assert finished.is_set()
+        writer.close()
+        stats = writer.stats()
+        assert stats["tables"]["k"]["rows"] == 3
+        assert stats["producer_wait"] > 0
+        assert stats["max_queue_depth"] >= 1
+
+    def test_flush_waits_for_pending_rows(self):
+        write = RecordingWrite()
+        writer = DbWriter(FakeConn, write, min_batch=1000).start()
+        writer.put("k", "SQL", [(1,), (2,)])
+
+        writer.flush()
+
+        assert writer.stats()["tables"]["k"]["rows"] == 2
+        writer.close()
+
+    def test_writer_error_is_raised_in_producer(self):
+        """writer 스레드의 쓰기 오류는 다음 put / close 에서 다시 발생"""
+        def failing(conn, sql, rows):
+            raise ValueError("boom")
+
+        writer = DbWriter(FakeConn, failing, min_batch=1).start()
+        writer.put("k", "SQL", [(1,)])
+
+        with pytest.raises(RuntimeError, match="boom"):
+            writer.close()
+
+    def test_context_exit_keeps_original_exception(self):
+        def failing(conn, sql, rows):
+            raise ValueError("boom")
+
+        with pytest.raises(KeyError):
+            with DbWriter(FakeConn, failing, min_batch=1) as writer:
+                writer.put("k", "SQL", [(1,)])
+                raise KeyError("fetch")
+
+    def test_batch_size_adapts_to_write_speed(self):
+        """실측 쓰기 속도 × target_seconds 로 다음 묶음 크기 조정 (min~max)"""
+        # Given: 쓰기 1회마다 1초 진행하는 시계 → 1,000행/초
+        now = [0.0]
+
+        def clock():
+            return now[0]
+
+        def write(conn, sql, rows):
+            now[0] += len(rows) / 1000
+            return len(rows), len(rows)
+
+        writer = DbWriter(FakeConn, write, min_batch=100, max_batch=5000,
+                          target_seconds=2.0, clock=clock).start()
+
+        # When
+        writer.put("k", "SQL", [(i,) for i in range(100)])
+        writer.close()
+
+        # Then
+        assert writer.stats()["batch_rows"] == 2000
+
+    def test_after_data_rows_are_written_after_data(self):
+        """after_data 키(journal)는 먼저 들어온 데이터 행이 쓰인 뒤에만 씀"""
+        # Given: 데이터 묶음이 크기 기준으로 나눠 쓰이도록 min_batch 작게
+        write = RecordingWrite()
+        write.gate.clear()
+        writer = DbWriter(FakeConn, write, max_queue=100, min_batch=1, max_batch=1).start()
+
+        # When
+        for i in range(3):
+            writer.put("ohlcv", "OHLCV", [(i,)])
+            writer.put("journal", "JOURNAL", [(f"unit{i}",)], after_data=True)
+        write.gate.set()
+        writer.close()
+
+        # Then: 각 journal 행 앞에 해당 데이터 행이 이미 쓰여 있음
+        order = [row for _, rows in write.calls for row in rows]
+        for i in range(3):
+            assert order.index((i,)) < order.index((f"unit{i}",))
+        assert writer.stats()["tables"]["journal"]["rows"] == 3
@@ -0,0 +1,100 @@
+"""
+특이사항 탐지 엔진 테스트
+
+여러 날 기간의 날짜별 등락률 / 규칙 플러그인 교체를 DB 없이 검증합니다.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from validators.anomalies import AnomalyAccumulator, Flag, detect_anomalies, prepare_ohlcv
+
+
+def ohlcv_frame(rows: list[tuple]) -> pd.DataFrame:
+    """(date, code, close, volume) → decode_hist 형식 DataFrame"""
+    df = pd.DataFrame(rows, columns=["date", "stock_code", "close_price", "volume"])
+    df["date"] = pd.to_datetime(df["date"])
+    for col in ("open_price", "high_price", "low_price"):
+        df[col] = df["close_price"]
+    return df.astype({c: "Int64" for c in ("open_price", "high_price", "low_price",
+                                           "close_price", "volume")})
+
+
+class TestPerDayReturns:
+    """기간 안의 날짜별 전 거래일 종가"""
+
+    def test_prev_is_previous_day_in_range(self):
+        # Given: 입력 순서가 섞인 3거래일, 기간 시작 직전 종가 1000
+        frame = ohlcv_frame([("2026-02-19", "A", 1300, 10),
+                             ("2026-02-18", "A", 1000, 10),
+                             ("2026-02-20", "A", 1310, 10)])
+
+        # When
+        f = prepare_ohlcv(frame, {"A": 1000})
+
+        # Then: 첫날은 prev_close, 이후는 같은 기간의 직전 거래일 종가
+        assert f.prev.tolist() == [1000, 1000, 1300]
+        assert np.round(f.ret, 4).tolist() == [0.0, 0.3, 0.0077]
+
+    def test_multi_day_range_flags_only_the_jump_day(self):
+        """기간 시작 전 종가와 비교하던 이전 방식이면 3일 모두 급등으로 잡힘"""
+        frame = ohlcv_frame([("2026-02-18", "A", 1300, 10),
+                             ("2026-02-19", "A", 1310, 10),
+                             ("2026-02-20", "A", 1320, 10)])
+
+        anomalies = detect_anomalies(frame, pd.DataFrame(), {"A": 1000})
+
+        assert [(a["type"], a["date"]) for a in anomalies] == [("가격급등", date(2026, 2, 18))]
+
+    def test_missing_prev_close_skips_first_day(self):
+        frame = ohlcv_frame([("2026-02-19", "B", 500, 0), ("2026-02-20", "B", 300, 10)])
+
+        anomalies = detect_anomalies(frame, pd.DataFrame(), {})
+
+        assert [(a["type"], a["date"]) for a in anomalies] == [
+            ("거래정지", date(2026, 2, 19)), ("가격급락", date(2026, 2, 20))]
+
+
+class TestPluggableRules:
+    def test_custom_rule_replaces_defaults(self):
+        # Given: 종가 1만원 이상만 잡는 규칙 하나
+        def expensive(f):
+            return [Flag(f.close >= 10_000, "고가주", lambda i: f"종가={f.close[i]:,}원", f.close)]
+
+        frame = ohlcv_frame([("2026-02-20", "A", 12_000, 0), ("2026-02-20", "B", 900, 0)])
+
+        # When
+        anomalies = detect_anomalies(frame, pd.DataFrame(), {}, ohlcv_rules=[expensive])
+
+        # Then: 기본 규칙(거래정지)은 실행되지 않음
+        assert [(a["type"], a["stock_code"], a["value"]) for a in anomalies] == [("고가주", "A", 12_000)]
+
+
+class TestAnomalyAccumulator:
+    """묶음 단위 스트리밍 분석 = 전체 한 번에 분석"""
+
+    def test_window_boundary_resolved_across_chunks(self):
+        # Given: 창 2개가 거꾸로 도착 — 둘째 창 첫날(2/19)의 전 거래일은 첫 창 마지막 날(2/18)
+        first_window  = ohlcv_frame([("2026-02-17", "A", 1000, 10), ("2026-02-18", "A", 1000, 10)])
+        second_window = ohlcv_frame([("2026-02-19", "A", 1300, 10), ("2026-02-20", "A", 1300, 10)])
+
+        # When
+        acc = AnomalyAccumulator({"A": 1000})
+        acc.add_ohlcv(second_window)
+        acc.add_ohlcv(first_window)
+        anomalies = acc.finish()
+
+        # Then: 2/19 만 급등 (기간 시작 전 종가 1000 과 비교했다면 2/20 도 잡힘)
+        assert [(a["type"], a["date"]) for a in anomalies] == [("가격급등", date(2026, 2, 19))]
+        whole = detect_anomalies(pd.concat([first_window, second_window]), pd.DataFrame(), {"A": 1000})
+        assert anomalies == whole
+
+    def test_boundary_rows_skip_only_prev_rules(self):
+        """묶음 첫 행은 거래정지 등 즉시 판정, 등락 규칙만 finish 에서 판정"""
+        acc = AnomalyAccumulator({"A": 1000})
+        acc.add_ohlcv(ohlcv_frame([("2026-02-19", "A", 1300, 0)]))
+
+        assert [a["type"] for a in acc.anomalies] == ["거래정지"]
+        assert [a["type"] for a in acc.finish()] == ["거래정지", "가격급등"]
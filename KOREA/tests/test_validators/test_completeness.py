@@ -0,0 +1,121 @@
+"""
+누락 행렬 테스트
+
+가짜 연결로 실제 DB 없이 상장·폐지일 반영 / 누락 종목 / 날짜별 수집률 / 비트맵을 검증합니다.
+"""
+
+from datetime import date
+
+from scripts.daily_update import repoll_probe
+from validators.completeness import MissingMatrix, missing_matrix, present_days
+
+D1, D2, D3 = date(2026, 2, 18), date(2026, 2, 19), date(2026, 2, 20)
+
+STOCKS = [
+    ("A", "가", None, None),                # 전 기간 상장
+    ("B", "나", date(2026, 2, 19), None),   # 2/19 상장
+    ("C", "다", None, date(2026, 2, 19)),   # 2/19 상장폐지 (2/18 까지 거래)
+]
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((" ".join(sql.split()), params))
+
+    def fetchall(self):
+        return self.conn.results.pop(0)
+
+
+class FakeConn:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class TestMissingMatrix:
+    def test_expected_follows_listing_and_delisting(self):
+        m = MissingMatrix("ohlcv", STOCKS, [D1, D2, D3], [])
+
+        assert m.expected.tolist() == [[True, True, True],
+                                       [False, True, True],
+                                       [True, False, False]]
+
+    def test_missing_views(self):
+        # Given: A 2/20, B 2/19 누락
+        m = MissingMatrix("ohlcv", STOCKS, [D1, D2, D3], [("A", D3), ("B", D2)])
+
+        # Then
+        assert m.missing_stocks() == [("A", "가"), ("B", "나")]
+        assert m.missing_on(D3) == [("A", "가")]
+        assert m.coverage() == {D1: (2, 0), D2: (2, 1), D3: (2, 1)}
+        assert m.bitmaps() == {"A": bytes([0b00100000]), "B": bytes([0b01000000])}
+
+    def test_missing_stocks_in_range(self):
+        """창(start~end) 별 누락 종목 — 재조회 시 다 받은 창은 건너뜀"""
+        m = MissingMatrix("ohlcv", STOCKS, [D1, D2, D3], [("A", D3), ("B", D2)])
+
+        assert m.missing_stocks(D1, D2) == [("B", "나")]
+        assert m.missing_stocks(D3, D3) == [("A", "가")]
+
+
+class TestMissingMatrixQuery:
+    def test_one_anti_join_query_per_table(self):
+        conn = FakeConn(STOCKS, [("A", D3)])
+
+        m = missing_matrix(conn, "investor", D1, D3, days=[D3, D1, D2])
+
+        # Then: 종목 목록 + anti-join 1번, 대상 시장 조건 / 기간 스캔
+        (_, universe_params), (sql, params) = conn.executed
+        assert "FROM investor_trading WHERE time BETWEEN %(start)s AND %(end)s" in sql
+        assert "s.market IN ('KOSPI', 'KOSDAQ')" in sql and "NOT IN" not in sql
+        assert params["days"] == [D1, D2, D3]
+        assert m.missing_stocks() == [("A", "가")]
+
+
+class TestPresentDays:
+    def test_distinct_days_with_any_data(self):
+        conn = FakeConn([(D1,), (D3,)])
+
+        assert present_days(conn, "ohlcv", D1, D3) == [D1, D3]
+        (sql, params), = conn.executed
+        assert "FROM ohlcv_daily WHERE time BETWEEN %(start)s AND %(end)s" in sql
+        assert params == {"start": D1, "end": D3}
+
+
+class TestRepollProbe:
+    def test_weekday_holiday_is_not_missing(self):
+        """평일 휴장일(2/19)은 기대 거래일에서 빠져 재조회 대상이 아님"""
+        # Given: 2/18, 2/20 만 데이터 존재 — 2/19 는 아무 종목도 없음(휴장)
+        conn = FakeConn([(D1,), (D3,)], STOCKS, [])
+        universe = {"ohlcv": {"A", "B", "C"}, "investor": set()}
+
+        # When
+        coverage, missing = repoll_probe(conn, universe, D1, D3, [(D1, D3)])
+
+        # Then: 휴장일 제외 거래일만 기대 → 누락 없음
+        assert conn.executed[-1][1]["days"] == [D1, D3]
+        assert coverage == 1.0
+        assert missing == {"ohlcv": ([], set())}
+
+    def test_late_stock_on_trading_day(self):
+        # Given: 2/20 에 A 만 늦음
+        conn = FakeConn([(D1,), (D3,)], STOCKS, [("A", D3)])
+        universe = {"ohlcv": {"A", "B"}, "investor": set()}
+
+        coverage, missing = repoll_probe(conn, universe, D1, D3, [(D1, D3)])
+
+        # Then: 기대 A 2일 + B 1일(2/20) 중 1건 누락
+        assert coverage == 1 - 1 / 3
+        assert missing["ohlcv"][0] == [("A", "가")]
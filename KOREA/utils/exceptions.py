@@ -38,6 +38,15 @@ class APIError(DataCollectionError):
         self.response = response
 
 
+class QuotaExceededError(DataCollectionError):
+    """API 일일 사용량 한도 초과 (예상 포함)"""
+
+    def __init__(self, message: str, required_bytes: int = None, remaining_bytes: int = None):
+        super().__init__(message)
+        self.required_bytes = required_bytes
+        self.remaining_bytes = remaining_bytes
+
+
 class DataValidationError(KoreaStockDataError):
     """데이터 검증 오류"""
 
@@ -0,0 +1,240 @@
+"""
+특이사항 탐지 엔진 (컬럼 연산 + 규칙 플러그인)
+
+decode_hist / decode_investor 컬럼 DataFrame 을 종목·날짜 순으로 정렬한 뒤 규칙마다 배열 마스크를 계산,
+걸린 행만 특이사항 dict 로 변환 (행 단위 루프 없음)
+
+    anomalies = detect_anomalies(ohlcv, investor, prev_close)   # prev_close: 기간 시작일 직전 종가
+
+- 등락률은 종목별 전 거래일 종가 기준 — 기간 안의 날은 같은 기간의 직전 행,
+  기간 첫날만 prev_close (latest_close 캐시) 사용 → 여러 날 기간도 날마다 올바른 등락률
+- 규칙 추가: 함수 하나에 @ohlcv_rule / @flow_rule 만 붙이면 됨
+
+    @ohlcv_rule(needs_prev=True)
+    def gap_up(f):                       # f: prepare_ohlcv 결과 (close, prev, ret … 배열 컬럼)
+        return [Flag(f.open > f.prev * 1.1, "갭상승", lambda i: f"...", f.ret)]
+"""
+
+from typing import Callable, NamedTuple, Union
+
+import numpy as np
+import pandas as pd
+
+# 특이사항 임계값
+THRESHOLD_PRICE_CHANGE  = 0.295   # 가격 변동 29.5% 이상 (상한/하한가 근접)
+THRESHOLD_LARGE_NET_BUY = 5e10    # 순매수 500억 이상 (거액 유입/이탈)
+
+# 보고서 정렬 순서 (규칙을 추가하면 여기에도 유형을 추가)
+TYPE_ORDER = ["거래정지", "OHLCV오류", "가격급등", "가격급락", "대규모순매수", "대규모순매도"]
+
+
+class Flag(NamedTuple):
+    """규칙 하나의 판정 결과 — mask 에 걸린 행만 특이사항이 됨"""
+    mask:   np.ndarray                          # bool (행 수)
+    type:   Union[str, np.ndarray]              # 유형 (문자열 또는 행별 배열)
+    detail: Callable[[int], str]                # 행 번호 → 상세 문자열 (걸린 행만 호출)
+    value:  np.ndarray                          # 행별 값
+
+
+class Frame:
+    """규칙에 넘기는 배열 묶음 — 컬럼을 속성으로 접근 (f.close, f.ret …)"""
+
+    def __init__(self, df: pd.DataFrame, **arrays: np.ndarray):
+        self.df = df
+        self.__dict__.update(arrays)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+
+OHLCV_RULES: list[Callable[[Frame], list[Flag]]] = []
+FLOW_RULES:  list[Callable[[Frame], list[Flag]]] = []
+
+
+def ohlcv_rule(fn=None, *, needs_prev: bool = False):
+    """
+    OHLCV 규칙 등록 — 전 거래일 종가(prev / ret)를 쓰는 규칙은 needs_prev=True
+    (스트리밍 분석에서 묶음 경계 행은 전 거래일 종가가 정해진 뒤 이 규칙만 다시 실행)
+    """
+    def register(f):
+        f.needs_prev = needs_prev
+        OHLCV_RULES.append(f)
+        return f
+    return register(fn) if fn else register
+
+
+def flow_rule(fn):
+    FLOW_RULES.append(fn)
+    return fn
+
+
+# ── 입력 준비 ──────────────────────────────────────────────────────────────
+def _ints(series: pd.Series) -> np.ndarray:
+    return series.fillna(0).to_numpy(np.int64)
+
+
+def _ohlcv_frame(df: pd.DataFrame, prev: np.ndarray, **arrays) -> Frame:
+    close = _ints(df["close_price"])
+    valid = (prev > 0) & (close > 0)
+    ret = np.where(valid, (close - prev) / np.where(valid, prev, 1), np.nan)
+    return Frame(df, close=close, prev=prev, ret=ret,
+                 open=_ints(df["open_price"]), high=_ints(df["high_price"]),
+                 low=_ints(df["low_price"]), volume=_ints(df["volume"]), **arrays)
+
+
+def prepare_ohlcv(ohlcv: pd.DataFrame, prev_close: dict) -> Frame:
+    """
+    종목·날짜 정렬 + 전 거래일 종가(prev) / 등락률(ret) 계산
+    prev:  같은 종목의 직전 행 종가, 종목의 첫 행은 prev_close[code] (없으면 0)
+    ret:   (close - prev) / prev, prev 나 close 가 0 이하면 NaN
+    first: 종목별 첫 행 여부 (bool 배열)
+    """
+    df = (ohlcv.drop_duplicates(["stock_code", "date"], keep="last")
+          .sort_values(["stock_code", "date"], kind="stable")
+          .reset_index(drop=True))
+    code  = df["stock_code"].to_numpy(object)
+    first = np.ones(len(df), bool)
+    first[1:] = code[1:] != code[:-1]
+
+    prev = np.empty(len(df), np.float64)
+    prev[1:] = _ints(df["close_price"])[:-1]
+    if len(df):
+        prev[first] = df.loc[first, "stock_code"].map(prev_close).astype("float64").fillna(0).to_numpy()
+    return _ohlcv_frame(df, prev, first=first)
+
+
+def prepare_flows(investor: pd.DataFrame) -> Frame:
+    """투자자 유형 합산 → 종목·날짜별 순매수 합계(net)"""
+    if "stock_name" not in investor:
+        investor = investor.assign(stock_name=investor["stock_code"])
+    df = (investor.groupby(["stock_code", "date"], sort=True)
+          .agg(net_total=("net_buy_value", "sum"), stock_name=("stock_name", "first"))
+          .reset_index())
+    return Frame(df, net=_ints(df["net_total"]))
+
+
+# ── 기본 규칙 ──────────────────────────────────────────────────────────────
+@ohlcv_rule
+def suspension(f: Frame) -> list[Flag]:
+    """거래량 0 → 거래정지/관리종목"""
+    return [Flag((f.volume == 0) & (f.close > 0), "거래정지",
+                 lambda i: f"거래량=0, 종가={f.close[i]:,}원", np.zeros(len(f), np.int64))]
+
+
+@ohlcv_rule
+def ohlc_violation(f: Frame) -> list[Flag]:
+    """OHLCV 논리 오류 (고가 < 저가)"""
+    return [Flag((f.high > 0) & (f.low > 0) & (f.high < f.low), "OHLCV오류",
+                 lambda i: f"고가({f.high[i]:,}) < 저가({f.low[i]:,})", f.high - f.low)]
+
+
+@ohlcv_rule(needs_prev=True)
+def limit_move(f: Frame) -> list[Flag]:
+    """전 거래일 대비 급등락 (상/하한가 근접)"""
+    change = np.abs(np.nan_to_num(f.ret))
+    return [Flag(change >= THRESHOLD_PRICE_CHANGE,
+                 np.where(f.close > f.prev, "가격급등", "가격급락"),
+                 lambda i: (f"전일종가={f.prev[i]:,.0f}원 → 당일종가={f.close[i]:,}원 "
+                            f"({f.ret[i]*100:+.1f}%)"),
+                 change)]
+
+
+@flow_rule
+def large_net_flow(f: Frame) -> list[Flag]:
+    """전체 투자자 순매수 합계가 임계값 이상 (거액 유입/이탈)"""
+    return [Flag(np.abs(f.net) >= THRESHOLD_LARGE_NET_BUY,
+                 np.where(f.net > 0, "대규모순매수", "대규모순매도"),
+                 lambda i: f"전체투자자 순매수합계={f.net[i]/1e8:+.1f}억원",
+                 np.abs(f.net))]
+
+
+# ── 실행 ──────────────────────────────────────────────────────────────────
+def _emit(frame: Frame, flag: Flag) -> list[dict]:
+    idx = np.flatnonzero(flag.mask)
+    if not len(idx):
+        return []
+    df = frame.df
+    codes = df["stock_code"].to_numpy(object)
+    names = (df["stock_name"].fillna(df["stock_code"]) if "stock_name" in df
+             else df["stock_code"]).to_numpy(object)
+    dates = df["date"].dt.date.to_numpy(object)
+    types = np.broadcast_to(np.asarray(flag.type, object), len(df))
+    return [{"type": str(types[i]), "stock_code": codes[i], "stock_name": names[i], "date": dates[i],
+             "detail": flag.detail(i), "value": flag.value[i].item()} for i in idx]
+
+
+def run_rules(frame: Frame, rules: list, prev_unknown: np.ndarray = None) -> list[dict]:
+    """prev_unknown: 전 거래일 종가가 아직 정해지지 않은 행 — needs_prev 규칙에서 제외"""
+    out = []
+    for rule in rules:
+        for flag in rule(frame):
+            if prev_unknown is not None and getattr(rule, "needs_prev", False):
+                flag = flag._replace(mask=flag.mask & ~prev_unknown)
+            out += _emit(frame, flag)
+    return out
+
+
+class AnomalyAccumulator:
+    """
+    수집 묶음을 받는 대로 분석하는 스트리밍 탐지기 (원본 행은 보관하지 않음)
+
+        acc = AnomalyAccumulator(prev_close)
+        acc.add_ohlcv(frame)            # 묶음마다 (종목 묶음 × 기간 창)
+        acc.add_investor(frame)
+        anomalies = acc.finish()
+
+    묶음 안의 행은 바로 모든 규칙으로 판정하고, 종목별 첫 행만 needs_prev 규칙을 미룸
+    (그 종목의 전 거래일은 아직 안 온 다른 창 묶음에 있을 수 있음)
+    → 보관 상태는 (종목, 창)마다 첫 행 하나 + 마지막 종가 하나
+    """
+
+    def __init__(self, prev_close: dict, ohlcv_rules: list = None, flow_rules: list = None):
+        self.prev_close = prev_close
+        self.ohlcv_rules = OHLCV_RULES if ohlcv_rules is None else ohlcv_rules
+        self.flow_rules = FLOW_RULES if flow_rules is None else flow_rules
+        self.anomalies: list[dict] = []
+        self._heads: list[pd.DataFrame] = []    # 종목별 첫 행 (전 거래일 종가 미정)
+        self._tails: list[pd.DataFrame] = []    # 종목별 마지막 (date, close_price)
+
+    def add_ohlcv(self, ohlcv: pd.DataFrame):
+        if not len(ohlcv):
+            return
+        f = prepare_ohlcv(ohlcv, {})
+        self.anomalies += run_rules(f, self.ohlcv_rules, prev_unknown=f.first)
+        last = np.append(f.first[1:], True)
+        self._heads.append(f.df[f.first])
+        self._tails.append(f.df.loc[last, ["stock_code", "date", "close_price"]])
+
+    def add_investor(self, investor: pd.DataFrame):
+        """종목·날짜의 투자자 행은 한 묶음(종목 × 창)에 모두 있음 → 묶음 단위로 완결"""
+        if len(investor):
+            self.anomalies += run_rules(prepare_flows(investor), self.flow_rules)
+
+    def finish(self) -> list[dict]:
+        """미룬 첫 행의 전 거래일 종가 확정 → needs_prev 규칙 판정, 날짜·종목 순 목록 반환"""
+        rules = [r for r in self.ohlcv_rules if getattr(r, "needs_prev", False)]
+        if self._heads and rules:
+            heads = pd.concat(self._heads, ignore_index=True).sort_values("date", kind="stable")
+            tails = (pd.concat(self._tails, ignore_index=True)
+                     .rename(columns={"close_price": "tail_close"}).sort_values("date", kind="stable"))
+            # 같은 종목에서 첫 행 날짜보다 앞선 가장 늦은 마지막 종가 = 전 거래일 종가 (없으면 prev_close)
+            df = pd.merge_asof(heads, tails, on="date", by="stock_code", allow_exact_matches=False)
+            prev = (df["tail_close"].astype("float64")
+                    .fillna(df["stock_code"].map(self.prev_close).astype("float64")).fillna(0))
+            df = df.drop(columns="tail_close").reset_index(drop=True)
+            self.anomalies += run_rules(_ohlcv_frame(df, prev.to_numpy()), rules)
+            self._heads, self._tails = [], []
+        self.anomalies.sort(key=lambda a: (a["date"], a["stock_code"]))
+        return self.anomalies
+
+
+def detect_anomalies(ohlcv: pd.DataFrame, investor: pd.DataFrame, prev_close: dict,
+                     ohlcv_rules: list = None, flow_rules: list = None) -> list[dict]:
+    """
+    특이사항 목록 반환 — 각 항목: {"type", "stock_code", "stock_name", "date", "detail", "value"}
+    규칙 목록을 넘기면 기본 규칙(OHLCV_RULES / FLOW_RULES) 대신 사용
+    """
+    acc = AnomalyAccumulator(prev_close, ohlcv_rules, flow_rules)
+    acc.add_ohlcv(ohlcv)
+    acc.add_investor(investor)
+    return acc.finish()
@@ -0,0 +1,139 @@
+"""
+수집 완전성 엔진 — (종목 × 거래일) 누락 행렬
+
+테이블마다 쿼리 하나(기간 안 (종목, 날짜) 집합과 anti-join)로 임의 기간의 누락을 한 번에 계산
+상장일 / 상장폐지일로 종목이 거래되던 날에만 데이터를 기대함 (상장 전·폐지 후는 누락 아님)
+
+    m = missing_matrix(conn, "ohlcv", date(2026, 2, 1), date(2026, 2, 20))
+    m.missing            # bool 배열 (종목 수 × 거래일 수)
+    m.missing_stocks()   # 하루라도 빠진 [(code, name), ...]  (--missing-only 재수집 대상)
+    m.coverage()         # {날짜: (기대 종목 수, 누락 종목 수)}
+    m.bitmaps()          # {code: 거래일 누락 비트맵(bytes, np.packbits)}
+
+거래일을 주지 않으면 평일 - 학습된 휴장일(ClosedDays)
+휴장일을 학습하지 않는 경로(daily_update)는 present_days() — 실제 데이터가 있는 날짜 — 를 days 로 넘김
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from collectors.backfill import ClosedDays
+
+# table → (DB 테이블, 대상 시장 조건)
+TABLES = {
+    "ohlcv":    ("ohlcv_daily",      "TRUE"),
+    "investor": ("investor_trading", "s.market IN ('KOSPI', 'KOSDAQ')"),
+}
+
+# 기간 안에 거래되던 종목 (활성 또는 기간 시작 이후 폐지)
+UNIVERSE_SQL = """
+SELECT s.stock_code, s.stock_name, s.listing_date, s.delisting_date
+FROM stocks s
+WHERE {market}
+  AND (s.is_active = TRUE OR s.delisting_date > %(start)s)
+ORDER BY s.stock_code
+"""
+
+# 기대 (종목, 날짜) - 실제 (종목, 날짜) — 기간 스캔 1번 + hash anti-join
+MISSING_SQL = """
+WITH days AS (
+    SELECT unnest(%(days)s::date[]) AS day
+), expected AS (
+    SELECT s.stock_code, d.day
+    FROM stocks s
+    JOIN days d ON (s.listing_date IS NULL OR s.listing_date <= d.day)
+               AND (s.delisting_date IS NULL OR d.day < s.delisting_date)
+    WHERE {market}
+      AND (s.is_active = TRUE OR s.delisting_date > %(start)s)
+), present AS (
+    SELECT DISTINCT stock_code, time::date AS day
+    FROM {table}
+    WHERE time BETWEEN %(start)s AND %(end)s
+)
+SELECT e.stock_code, e.day
+FROM expected e
+LEFT JOIN present p ON p.stock_code = e.stock_code AND p.day = e.day
+WHERE p.stock_code IS NULL
+"""
+
+# 기간 안에 어느 종목이든 데이터가 있는 날짜
+PRESENT_DAYS_SQL = """
+SELECT DISTINCT time::date FROM {table}
+WHERE time BETWEEN %(start)s AND %(end)s
+ORDER BY 1
+"""
+
+
+class MissingMatrix:
+    """
+    codes × days 누락 행렬
+    expected: 그날 거래되던 종목(상장일 ≤ 날짜 < 상장폐지일)
+    missing:  expected 중 데이터가 없는 칸
+    """
+
+    def __init__(self, table: str, stocks: list[tuple], days: list[date],
+                 missing_pairs: list[tuple[str, date]]):
+        self.table = table
+        self.codes = [s[0] for s in stocks]
+        self.names = [s[1] for s in stocks]
+        self.days = list(days)
+        day_arr = np.array(self.days, dtype="datetime64[D]")
+        listing = np.array([s[2] or date.min for s in stocks], dtype="datetime64[D]")
+        delisting = np.array([s[3] or date.max for s in stocks], dtype="datetime64[D]")
+        self.expected = (listing[:, None] <= day_arr[None, :]) & (day_arr[None, :] < delisting[:, None])
+
+        self.missing = np.zeros((len(self.codes), len(self.days)), bool)
+        row = {c: i for i, c in enumerate(self.codes)}
+        col = {d: j for j, d in enumerate(self.days)}
+        idx = [(row[c], col[d]) for c, d in missing_pairs if c in row and d in col]
+        if idx:
+            r, c = zip(*idx)
+            self.missing[list(r), list(c)] = True
+
+    def missing_stocks(self, start: date = None, end: date = None) -> list[tuple[str, str]]:
+        """하루라도 누락된 종목 [(code, name), ...] (start~end 를 주면 그 안의 거래일만)"""
+        cols = [j for j, d in enumerate(self.days)
+                if (start is None or d >= start) and (end is None or d <= end)]
+        hit = self.missing[:, cols].any(axis=1)
+        return [(self.codes[i], self.names[i]) for i in np.flatnonzero(hit)]
+
+    def missing_on(self, day: date) -> list[tuple[str, str]]:
+        j = self.days.index(day)
+        return [(self.codes[i], self.names[i]) for i in np.flatnonzero(self.missing[:, j])]
+
+    def coverage(self) -> dict[date, tuple[int, int]]:
+        """{날짜: (기대 종목 수, 누락 종목 수)}"""
+        exp, miss = self.expected.sum(axis=0), self.missing.sum(axis=0)
+        return {d: (int(exp[j]), int(miss[j])) for j, d in enumerate(self.days)}
+
+    def bitmaps(self) -> dict[str, bytes]:
+        """누락이 있는 종목만 {code: 날짜별 누락 비트(np.packbits, 첫 거래일 = 최상위 비트)}"""
+        return {self.codes[i]: np.packbits(self.missing[i]).tobytes()
+                for i in np.flatnonzero(self.missing.any(axis=1))}
+
+
+def missing_matrix(conn, table: str, start: date, end: date,
+                   days: list[date] = None) -> MissingMatrix:
+    """table: "ohlcv" / "investor", days 미지정 시 start~end 평일 - 학습된 휴장일"""
+    db_table, market = TABLES[table]
+    days = sorted(days) if days is not None else ClosedDays.from_settings().trading_days(start, end)
+    params = {"start": start, "end": end, "days": days}
+    with conn.cursor() as cur:
+        cur.execute(UNIVERSE_SQL.format(market=market), params)
+        stocks = cur.fetchall()
+        cur.execute(MISSING_SQL.format(market=market, table=db_table), params)
+        pairs = cur.fetchall()
+    return MissingMatrix(table, stocks, days, pairs)
+
+
+def present_days(conn, table: str, start: date, end: date) -> list[date]:
+    """start~end 중 table 에 데이터가 한 종목이라도 있는 날짜 (평일 휴장일은 빠짐)"""
+    with conn.cursor() as cur:
+        cur.execute(PRESENT_DAYS_SQL.format(table=TABLES[table][0]), {"start": start, "end": end})
+        return [row[0] for row in cur.fetchall()]
@@ -33,6 +33,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.settings import settings
+from validators.completeness import missing_matrix
 
 KST = ZoneInfo("Asia/Seoul")
 
@@ -294,19 +295,9 @@ def check_investor_type_completeness(conn, check_date: date) -> dict:
         """, (check_date,))
         incomplete = cur.fetchall()
 
-        # 수급 데이터 자체가 없는 KOSPI/KOSDAQ 종목 수
-        cur.execute("""
-            SELECT COUNT(*)
-            FROM stocks
-            WHERE is_active = TRUE
-              AND market IN ('KOSPI', 'KOSDAQ')
-              AND stock_code NOT IN (
-                  SELECT DISTINCT stock_code
-                  FROM investor_trading
-                  WHERE time = %s
-              )
-        """, (check_date,))
-        missing_count = cur.fetchone()[0]
+    # 수급 데이터 자체가 없는 KOSPI/KOSDAQ 종목 수 (그날 상장돼 있던 종목 기준, 누락 행렬)
+    missing_count = len(missing_matrix(conn, "investor", check_date, check_date,
+                                       days=[check_date]).missing_stocks())
 
     issue_count = len(incomplete) + missing_count
     details = {